@@ -9,6 +9,7 @@ from typing import Any
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     File,
     HTTPException,
@@ -33,7 +34,6 @@ from app.models.document import (
     DocumentProvenance,
     DocumentSourceFile,
     ProductionCase,
-    SourceFilePage,
 )
 from app.schemas.document import (
     DocumentCreate,
@@ -47,7 +47,7 @@ from app.schemas.document import (
     ExportResponse,
     ProvenanceEventResponse,
 )
-from app.services import uploaded_sources
+from app.services import source_ingestion
 from app.services.custom_requirements_service import CustomRequirementsService
 from app.services.document_service import DocumentService
 from app.services.production_case_service import (
@@ -56,6 +56,7 @@ from app.services.production_case_service import (
 )
 from app.services.storage_service import StorageService
 from app.services.task_contract import build_task_contract
+from app.services.uploaded_pack_cache import invalidate_uploaded_pack
 
 logger = logging.getLogger(__name__)
 
@@ -873,7 +874,8 @@ async def _lock_document_for_source_change(
     db: AsyncSession, document_id: int, user_id: int
 ) -> tuple[Document, ProductionCase | None]:
     """User -> Document -> ProductionCase locks + the active-generation guard
-    shared by every uploaded-source mutation."""
+    shared by every uploaded-source mutation, which also drops the
+    document's memoized uploaded pack."""
     user_result = await db.execute(
         select(User)
         .where(User.id == user_id)
@@ -915,141 +917,95 @@ async def _lock_document_for_source_change(
             status_code=status.HTTP_409_CONFLICT,
             detail="Sources cannot change while generation is running",
         )
+    await invalidate_uploaded_pack(document_id)
     return document, production_case
 
 
-@router.post("/{document_id}/sources/upload")
-@rate_limit("30/hour")
+@router.post("/{document_id}/sources/upload", status_code=status.HTTP_202_ACCEPTED)
+@rate_limit("120/hour")
 async def upload_source_file(
     request: Request,
     document_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     """Upload one scientific PDF that must ground this document.
 
-    The file is parsed page by page (no OCR: scans are stored but flagged
-    and excluded from retrieval) and becomes part of the generation
-    contract — swapping sources later invalidates the run and the release.
+    The request only stores the file and registers it as ``pending``;
+    parsing (no OCR: scans are flagged and excluded from retrieval),
+    metadata and passages are built by a background ingestion
+    (source_ingestion.py) reported through the status endpoint and
+    ``source_ingestion`` WebSocket events. The file is part of the
+    generation contract — swapping sources later invalidates the run and
+    the release.
     """
     try:
         filename = (file.filename or "source.pdf").strip() or "source.pdf"
         if not filename.lower().endswith(".pdf"):
             raise ValidationError("Only PDF sources are supported")
-        data = await file.read()
-        if not data:
-            raise ValidationError("Empty file")
-        pages = uploaded_sources.extract_pdf_pages(data)
-        digest = uploaded_sources.sha256_hex(data)
-
-        document, production_case = await _lock_document_for_source_change(
-            db, document_id, int(current_user.id)
-        )
-
-        duplicate = (
-            await db.execute(
-                select(DocumentSourceFile.id).where(
-                    DocumentSourceFile.document_id == document_id,
-                    DocumentSourceFile.sha256 == digest,
-                )
-            )
-        ).scalar_one_or_none()
-        if duplicate is not None:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="This PDF is already uploaded for this document",
+        # Streamed to a temp file in chunks: hashed and header-checked on
+        # the way, never held whole in memory.
+        staged = await source_ingestion.stage_upload(file)
+        try:
+            digest = staged.sha256
+            document, production_case = await _lock_document_for_source_change(
+                db, document_id, int(current_user.id)
             )
 
-        meta = uploaded_sources.derive_source_metadata(filename, data, pages)
-        existing_keys = set(
-            (
+            duplicate = (
                 await db.execute(
-                    select(DocumentSourceFile.citation_key).where(
-                        DocumentSourceFile.document_id == document_id
+                    select(DocumentSourceFile.id).where(
+                        DocumentSourceFile.document_id == document_id,
+                        DocumentSourceFile.sha256 == digest,
                     )
                 )
-            ).scalars()
-        )
-        citation_key = str(meta["citation_key"])
-        if citation_key in existing_keys:
-            for suffix in "bcdefghijklmnopqrstuvwxyz":
-                candidate = f"{citation_key}{suffix}"
-                if candidate not in existing_keys:
-                    citation_key = candidate
-                    break
-            else:
-                raise ValidationError("Too many sources with the same citation key")
-
-        text_chars = sum(len(p) for p in pages)
-        has_text_layer = pages and (
-            text_chars / max(1, len(pages)) >= uploaded_sources.MIN_TEXT_CHARS_PER_PAGE
-        )
+            ).scalar_one_or_none()
+            if duplicate is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="This PDF is already uploaded for this document",
+                )
 
-        storage = StorageService()
-        object_name = (
-            f"documents/{int(current_user.id)}/{document_id}/sources/"
-            f"{digest[:16]}.pdf"
-        )
-        storage_path = await storage.upload_file(
-            object_name, data, content_type="application/pdf"
-        )
+            storage = StorageService()
+            object_name = (
+                f"documents/{int(current_user.id)}/{document_id}/sources/"
+                f"{digest[:16]}.pdf"
+            )
+            storage_path = await storage.upload_path(
+                object_name, staged.path, content_type="application/pdf"
+            )
 
-        source_file = DocumentSourceFile(
-            document_id=document_id,
-            filename=filename[:255],
-            citation_key=citation_key,
-            title=str(meta["title"]) if meta["title"] else None,
-            authors=str(meta["authors"]) if meta["authors"] else None,
-            year=int(meta["year"]) if meta["year"] else None,
-            storage_path=storage_path,
-            sha256=digest,
-            page_count=len(pages),
-            text_chars=text_chars,
-            status="parsed" if has_text_layer else "no_text_layer",
-            metadata_incomplete=bool(meta["metadata_incomplete"]),
+            source_file = DocumentSourceFile(
+                document_id=document_id,
+                filename=filename[:255],
+                citation_key=source_ingestion.provisional_citation_key(digest),
+                storage_path=storage_path,
+                sha256=digest,
+                page_count=0,
+                text_chars=0,
+                status="pending",
+                metadata_incomplete=True,
+            )
+            db.add(source_file)
+            _reset_document_after_input_change(document, production_case)
+            await db.commit()
+        except BaseException:
+            source_ingestion.discard_staged(staged.path)
+            raise
+
+        # The ingestion owns the staged copy from here and deletes it.
+        background_tasks.add_task(
+            source_ingestion.ingest_source_file, int(source_file.id), staged.path
         )
-        db.add(source_file)
-        await db.flush()
-        if has_text_layer:
-            for page_number, text in enumerate(pages, start=1):
-                if text.strip():
-                    db.add(
-                        SourceFilePage(
-                            source_file_id=int(source_file.id),
-                            page_number=page_number,
-                            text=text,
-                        )
-                    )
-
-        _reset_document_after_input_change(document, production_case)
-        await db.commit()
-
         logger.info(
-            "Uploaded source %s for document %s: %s pages, %s chars, status=%s",
-            citation_key,
+            "Accepted source %s for document %s (%s bytes), ingestion queued",
+            source_file.id,
             document_id,
-            len(pages),
-            text_chars,
-            source_file.status,
+            staged.size,
         )
-        return {
-            "id": int(source_file.id),
-            "citation_key": citation_key,
-            "filename": filename,
-            "title": source_file.title,
-            "authors": source_file.authors,
-            "year": source_file.year,
-            "page_count": len(pages),
-            "status": source_file.status,
-            "metadata_incomplete": bool(source_file.metadata_incomplete),
-            "warning": (
-                None
-                if has_text_layer
-                else "No text layer detected (scanned PDF?) — this source "
-                "will not be used for grounding"
-            ),
-        }
+        return source_ingestion.source_file_status(source_file)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
     except (ValidationError, ValueError) as e:
@@ -1066,6 +1022,36 @@ async def upload_source_file(
         ) from e
 
 
+@router.get("/{document_id}/sources/files/{file_id}/status")
+async def get_source_file_status(
+    document_id: int,
+    file_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    """Ingestion status of one uploaded source (poll until not ingesting)."""
+    try:
+        document_service = DocumentService(db)
+        await document_service.check_document_ownership(
+            document_id, int(current_user.id)
+        )
+        source_file = (
+            await db.execute(
+                select(DocumentSourceFile)
+                .where(
+                    DocumentSourceFile.id == file_id,
+                    DocumentSourceFile.document_id == document_id,
+                )
+                .execution_options(populate_existing=True)
+            )
+        ).scalar_one_or_none()
+        if source_file is None:
+            raise NotFoundError("Source file not found")
+        return source_ingestion.source_file_status(source_file)
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+
 @router.get("/{document_id}/sources/files")
 async def list_source_files(
     document_id: int,
@@ -1100,6 +1086,7 @@ async def list_source_files(
                     "year": row.year,
                     "page_count": int(row.page_count or 0),
                     "status": row.status,
+                    "ingestion_error": row.ingestion_error,
                     "metadata_incomplete": bool(row.metadata_incomplete),
                 }
                 for row in rows
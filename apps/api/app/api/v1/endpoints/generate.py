@@ -541,6 +541,8 @@ async def _invalidate_previous_generation_evidence(
             pdf_path=None,
             docx_sha256=None,
             pdf_sha256=None,
+            docx_export_key=None,
+            pdf_export_key=None,
             completed_at=None,
         )
     )
@@ -165,6 +165,27 @@ class Settings(BaseSettings):
     PERPLEXITY_API_KEY: str | None = None
     TAVILY_API_KEY: str | None = None
     SERPER_API_KEY: str | None = None
+    # RAGRetriever.retrieve_sources queries every enabled provider
+    # concurrently: each gets its own deadline, and once the overall budget
+    # expires the answers collected so far are used and the rest cancelled.
+    RAG_PROVIDER_TIMEOUT_SECONDS: float = 30.0
+    RAG_RETRIEVAL_BUDGET_SECONDS: float = 40.0
+    # Scholarly search results cache (RAGRetriever): an in-process LRU of
+    # RAG_CACHE_MEMORY_ENTRIES in front of a "disk" (RAG_CACHE_DIR) or "redis"
+    # backing store capped at RAG_CACHE_MAX_ENTRIES; "memory" keeps only the
+    # front, "off" disables caching.
+    RAG_CACHE_BACKEND: str = "disk"
+    RAG_CACHE_DIR: str = "/tmp/rag_cache"
+    RAG_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    RAG_CACHE_MEMORY_ENTRIES: int = 512
+    RAG_CACHE_MAX_ENTRIES: int = 20_000
+    # Identical concurrent Crossref/OpenAlex searches share one request per
+    # process. With the lock enabled (useful with RAG_CACHE_BACKEND=redis) the
+    # first process to start a search holds a Redis lock for up to
+    # RAG_SINGLE_FLIGHT_LOCK_SECONDS and other processes wait for its cache
+    # entry instead of repeating the request.
+    RAG_SINGLE_FLIGHT_LOCK_ENABLED: bool = False
+    RAG_SINGLE_FLIGHT_LOCK_SECONDS: float = 30.0
 
     # Academic Quality Engine - Provenance ledger (append-only audit trail of
     # pipeline stages in document_provenance; powers the provenance endpoint
@@ -226,12 +247,34 @@ class Settings(BaseSettings):
     OPENALEX_RATE_LIMIT_RPS: float = 5.0  # public cap ~10 rps
     SEMANTIC_SCHOLAR_RATE_LIMIT_RPS: float = 1.0  # authenticated key -> guaranteed ~1 rps (unkeyed pool is throttled to HTTP 429)
     ARXIV_RATE_LIMIT_RPS: float = 0.33  # arXiv asks for 1 request per 3 seconds
+    # The rates above are deployment-wide budgets: CitationVerifier and
+    # RAGRetriever schedule calls through one Redis-backed GCRA per provider,
+    # so N concurrent jobs share them instead of multiplying them. Off (or
+    # Redis down) = the same schedule, shared only within this process.
+    PROVIDER_RATE_LIMIT_DISTRIBUTED: bool = True
+    # Upper bound honoured for a provider's 429 Retry-After (seconds); longer
+    # answers are clamped so one bad header cannot park the cluster.
+    PROVIDER_RATE_LIMIT_MAX_RETRY_AFTER_SECONDS: float = 60.0
 
     # Verification worker tuning
     CITATION_VERIFICATION_MAX_CONCURRENCY: int = (
         5  # concurrent source lookups per document
     )
     CITATION_VERIFICATION_MAX_RETRIES: int = 2  # retries per provider call
+    # Local bibliographic index (bibliographic_works table): canonical records
+    # of verified works answer later verifications with the same matching
+    # rules before any external API call. Topics repeat heavily, so most
+    # lookups become one indexed query instead of a provider cascade.
+    BIBLIOGRAPHIC_INDEX_ENABLED: bool = True
+    BIBLIOGRAPHIC_INDEX_MAX_CANDIDATES: int = 25  # title-prefilter rows scored
+    # Negative-result Bloom filter (Redis bitmaps) over titles a fully clean
+    # cascade proved absent: repeat hallucinated titles short-circuit to
+    # NOT_FOUND. A false positive rejects a real citation, so keep the FP rate
+    # low; the filter is rebuilt (rotated) every REBUILD_DAYS.
+    CITATION_NEGATIVE_FILTER_ENABLED: bool = True
+    CITATION_NEGATIVE_FILTER_CAPACITY: int = 100_000  # titles per generation
+    CITATION_NEGATIVE_FILTER_FP_RATE: float = 0.0001
+    CITATION_NEGATIVE_FILTER_REBUILD_DAYS: int = 30
 
     # Academic Quality Engine - Source grounding (upfront topic-locked pack;
     # OFF by default so the default pipeline stays byte-identical). When on,
@@ -254,6 +297,30 @@ class Settings(BaseSettings):
     # Italian thesis is the norm, and Italian-only queries filled the pack
     # with off-topic papers. Kill switch in case translations misbehave.
     SOURCE_PACK_BILINGUAL_ENABLED: bool = True
+    # SourcePackBuilder.build fetches its query x provider grid concurrently:
+    # at most SOURCE_PACK_RETRIEVAL_CONCURRENCY requests in flight overall and
+    # SOURCE_PACK_PROVIDER_CONCURRENCY per provider (request rates are still
+    # paced by the shared ProviderRateLimiter).
+    SOURCE_PACK_RETRIEVAL_CONCURRENCY: int = 8
+    SOURCE_PACK_PROVIDER_CONCURRENCY: int = 4
+    # Documents whose query plan normalizes to the same ordered query list
+    # (same language, domain, limit and page) reuse each other's deduplicated
+    # candidates and preflight-verified results while younger than this.
+    # Pack selection and citation keys stay per document. Stored in the
+    # RAG_CACHE_BACKEND; 0 disables.
+    SOURCE_PACK_CANDIDATE_CACHE_TTL_SECONDS: int = 24 * 3600
+    # Abstracts and venues of retrieved records are shared through a bounded
+    # value-keyed store (text_utils.SharedText) owned by each retrieval
+    # session and citation verifier, so re-parsed copies of a paper hold one
+    # string each. Entries per store; 0 disables.
+    SOURCE_TEXT_STORE_MAX_ENTRIES: int = 4096
+    # Built uploaded-source packs (uploaded_pack_cache.py) are memoized per
+    # document under their source digest, in-process for up to
+    # UPLOADED_PACK_CACHE_MEMORY_ENTRIES documents and in Redis when
+    # available. Resumes and retries reuse them while younger than this;
+    # 0 disables.
+    UPLOADED_PACK_CACHE_TTL_SECONDS: int = 6 * 3600
+    UPLOADED_PACK_CACHE_MEMORY_ENTRIES: int = 32
 
     # Academic Quality Engine - In-loop grounding gate (OFF by default; needs
     # SOURCE_GROUNDING_ENABLED). After a section is generated and before it is
@@ -313,6 +380,36 @@ class Settings(BaseSettings):
     MINIO_BUCKET: str = "ai-thesis-documents"
     MINIO_SECURE: bool = False
 
+    # Blocking SDK calls (MinIO, Tavily, pypdf, python-docx, ReportLab) run
+    # on a dedicated thread pool of this many workers instead of the event
+    # loop; extra calls queue there rather than starving the default
+    # executor used by asyncio.to_thread.
+    BLOCKING_EXECUTOR_MAX_WORKERS: int = 8
+
+    # PDF/DOCX text extraction runs in worker processes (parsing_service.py)
+    # so pure-Python parsing never holds this process's GIL. Each file gets
+    # a wall-clock budget and an address-space budget on top of the worker
+    # baseline; PDFs are extracted PARSING_BATCH_PAGES pages per pool task.
+    # A call waits at most PARSING_QUEUE_TIMEOUT_SECONDS for a free worker.
+    # PARSING_MAX_WORKERS=0 falls back to the blocking thread pool.
+    PARSING_MAX_WORKERS: int = 2
+    PARSING_TIMEOUT_SECONDS: int = 120
+    PARSING_QUEUE_TIMEOUT_SECONDS: int = 600
+
+    # An uploaded source PDF being ingested is leased to one process for
+    # this long (download, queue wait and parse); only an expired lease is
+    # reclaimed by another process's startup resume.
+    SOURCE_INGESTION_LEASE_SECONDS: int = 1800
+    PARSING_MEMORY_LIMIT_MB: int = 1024
+    PARSING_BATCH_PAGES: int = 50
+
+    # DOCX/PDF export rendering runs in its own worker processes
+    # (export_renderer.py), separate from parsing, with a wall-clock budget
+    # per export. EXPORT_RENDER_MAX_WORKERS=0 renders on the blocking thread
+    # pool instead.
+    EXPORT_RENDER_MAX_WORKERS: int = 1
+    EXPORT_RENDER_TIMEOUT_SECONDS: int = 300
+
     # Email
     SMTP_TLS: bool = True
     SMTP_PORT: int | None = None
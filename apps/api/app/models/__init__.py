@@ -12,6 +12,7 @@ from app.models.admin import (
 )
 from app.models.auth import User, UserSession
 from app.models.document import (
+    BibliographicWork,
     Document,
     DocumentOutline,
     DocumentProvenance,
@@ -33,6 +34,7 @@ __all__ = [
     "DocumentOutline",
     "DocumentProvenance",
     "DocumentSource",
+    "BibliographicWork",
     "ProductionCase",
     "ReleaseGateResult",
     "EditorTask",
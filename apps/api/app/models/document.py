@@ -11,6 +11,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -69,6 +70,9 @@ class Document(Base):
     pdf_path = Column(String(500))
     docx_sha256 = Column(String(64), nullable=True)
     pdf_sha256 = Column(String(64), nullable=True)
+    # Hash of the export model that rendered the file (export_renderer.py)
+    docx_export_key = Column(String(64), nullable=True)
+    pdf_export_key = Column(String(64), nullable=True)
     custom_requirements_file_path = Column(String(500), nullable=True)
 
     # Usage tracking
@@ -439,6 +443,59 @@ class DocumentSource(Base):
         )
 
 
+class BibliographicWork(Base):
+    """A known-real work in the local bibliographic index.
+
+    Canonical records from VERIFIED citation lookups and API-sourced
+    DocumentSource rows; CitationVerifier consults it before the external
+    cascade (bibliographic_index.py). Not document-scoped: topics repeat
+    across orders, so one record serves every later verification.
+    """
+
+    __tablename__ = "bibliographic_works"
+    __table_args__ = (
+        Index(
+            "uq_bibliographic_works_doi",
+            "doi",
+            unique=True,
+            postgresql_where=text("doi IS NOT NULL"),
+            sqlite_where=text("doi IS NOT NULL"),
+        ),
+        Index("ix_bibliographic_works_arxiv_id", "arxiv_id"),
+        Index("ix_bibliographic_works_normalized_title", "normalized_title"),
+        Index("ix_bibliographic_works_title_prefix", "title_prefix"),
+        Index("ix_bibliographic_works_title_suffix", "title_suffix"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # normalize_title() output plus its head/tail: a fuzzy match (>= 0.90
+    # similarity) almost always keeps one end intact, so the two short keys
+    # are an index-friendly candidate prefilter on every dialect.
+    normalized_title = Column(String(1000), nullable=False)
+    title_prefix = Column(String(16), nullable=False)
+    title_suffix = Column(String(16), nullable=False)
+
+    title = Column(String(1000), nullable=False)
+    authors = Column(JSON)  # list[str] of author names
+    year = Column(Integer, nullable=True)
+    venue = Column(String(500), nullable=True)
+    abstract = Column(Text, nullable=True)
+    doi = Column(String(255), nullable=True)  # normalized lowercase
+    arxiv_id = Column(String(50), nullable=True)  # version suffix stripped
+    provider = Column(String(50), nullable=True)  # provider that returned it
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<BibliographicWork(id={self.id}, doi={self.doi!r}, "
+            f"provider={self.provider})>"
+        )
+
+
 class ProductionCase(Base):
     """Internal production case wrapping a document for Phase 2 operations."""
 
@@ -669,7 +726,15 @@ class DocumentSourceFile(Base):
     sha256 = Column(String(64), nullable=False)
     page_count = Column(Integer, nullable=False, default=0)
     text_chars = Column(Integer, nullable=False, default=0)
+    # pending | processing (ingestion running, source_ingestion.py) ->
+    # parsed | no_text_layer | failed
     status = Column(String(30), nullable=False, default="parsed")
+    # Why ingestion failed (status "failed"), shown to the manager.
+    ingestion_error = Column(Text, nullable=True)
+    # Claim of the ingestion holding a "processing" row; reclaimable once
+    # expired (a crashed process).
+    ingestion_lease_token = Column(String(64), nullable=True)
+    ingestion_lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     metadata_incomplete = Column(Boolean, nullable=False, default=False)
     # Supplementary by default; mandatory only by explicit manager decision
     # (course correction 2026-07-11) — mandatory files gate generation,
@@ -683,6 +748,11 @@ class DocumentSourceFile(Base):
         cascade="all, delete-orphan",
         order_by="SourceFilePage.page_number",
     )
+    passage_sets = relationship(
+        "SourceFilePassageSet",
+        back_populates="source_file",
+        cascade="all, delete-orphan",
+    )
 
     def __repr__(self) -> str:
         return (
@@ -712,3 +782,38 @@ class SourceFilePage(Base):
     text = Column(Text, nullable=False)
 
     source_file = relationship("DocumentSourceFile", back_populates="pages")
+
+
+class SourceFilePassageSet(Base):
+    """Retrieval passages of one uploaded PDF, split once at upload time.
+
+    ``payload`` is the zlib-compressed passage list with per-passage term
+    counts (uploaded_sources.encode_passage_set). A set is used only while
+    its sha256 matches the file and its passage_version matches
+    uploaded_sources.PASSAGE_PARAMS_VERSION; otherwise the passages are
+    re-split from SourceFilePage.
+    """
+
+    __tablename__ = "source_file_passage_sets"
+    __table_args__ = (
+        UniqueConstraint(
+            "source_file_id",
+            "passage_version",
+            name="uq_source_file_passage_sets_file_version",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_file_id = Column(
+        Integer,
+        ForeignKey("document_source_files.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    sha256 = Column(String(64), nullable=False)
+    passage_version = Column(Integer, nullable=False)
+    passage_count = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    source_file = relationship("DocumentSourceFile", back_populates="passage_sets")
@@ -0,0 +1,217 @@
+"""
+Cross-document cache of source-pack candidates.
+
+Managers generate many theses on near-identical topics (same course, same
+methodology), and every document re-ran the whole SourcePackBuilder query
+plan - 2 providers x up to 18 queries, then dedup over hundreds of records -
+and re-verified the same sources in preverify_source_pack.
+
+SourcePackBuilder.build now looks up its candidate list (retrieved,
+deduplicated, citable, not student work) under ``pack_candidate_key``: the
+normalized query list plus language, domain, per-query limit and page. The
+list keeps plan order because candidates are stored in grid/dedup order
+(the first-seen record of a duplicate absorbs the others), so the same
+queries in another order are a different entry. A hit
+skips retrieval and dedup; topic scoring, selection and citation keys still
+run per document, so two documents sharing candidates get their own pack.
+Only clean strict builds (raise_on_provider_error, no provider errors) are
+stored: lenient provider calls swallow HTTP failures, so an empty or short
+lenient result cannot be told apart from a degraded one.
+
+Preflight verification is shared the same way: preverify_source_pack records
+the verification result of every candidate it verified under the keys the
+pack was built from, and a later document's preflight reuses a recorded
+VERIFIED result for an identical candidate instead of querying the
+verifier again. Only positive results are reused; rejections are
+re-verified.
+
+Entries live in the RAG search cache (RAG_CACHE_BACKEND, so "off" disables
+this too) and are served only while younger than
+SOURCE_PACK_CANDIDATE_CACHE_TTL_SECONDS: candidate freshness is a product
+rule, independent of how long the backend keeps the bytes. Bump
+PACK_CANDIDATE_CACHE_VERSION whenever the candidate filters or the key change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import fields
+from typing import Any
+
+from app.core.config import settings
+from app.services.ai_pipeline.rag_retriever import SourceDoc
+from app.services.ai_pipeline.retrieval_cache import (
+    RetrievalCache,
+    get_retrieval_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+PACK_CANDIDATE_CACHE_VERSION = 2
+KEY_PREFIX = "pack_candidates"
+
+_SOURCE_FIELDS = tuple(f.name for f in fields(SourceDoc))
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").casefold().split())
+
+
+def pack_candidate_key(
+    queries: list[str],
+    *,
+    language: str,
+    domain: str | None,
+    per_query: int,
+    retrieval_page: int,
+) -> str:
+    """Cache key of one build's query plan, in query order."""
+    plan = {
+        "queries": list(dict.fromkeys(normalize_query(q) for q in queries if q)),
+        "language": (language or "").lower(),
+        "domain": domain,
+        "per_query": per_query,
+        "page": retrieval_page,
+    }
+    digest = hashlib.sha256(
+        json.dumps(plan, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+    return f"{KEY_PREFIX}:v{PACK_CANDIDATE_CACHE_VERSION}:{digest}"
+
+
+def _encode_sources(sources: list[SourceDoc]) -> list[list[Any]]:
+    return [[getattr(src, name) for name in _SOURCE_FIELDS] for src in sources]
+
+
+def _decode_sources(names: list[str], rows: list[list[Any]]) -> list[SourceDoc]:
+    return [SourceDoc(**dict(zip(names, row, strict=True))) for row in rows]
+
+
+class PackCandidateCache:
+    """Versioned, freshness-bounded candidate lists and verification proofs."""
+
+    def __init__(self, cache: RetrievalCache, *, ttl_seconds: int | None = None):
+        self.cache = cache
+        self.ttl_seconds = (
+            settings.SOURCE_PACK_CANDIDATE_CACHE_TTL_SECONDS
+            if ttl_seconds is None
+            else ttl_seconds
+        )
+        self._counters = {
+            "candidate_hits": 0,
+            "candidate_misses": 0,
+            "candidate_writes": 0,
+            "verified_reused": 0,
+        }
+
+    async def get_candidates(self, key: str) -> list[SourceDoc] | None:
+        """Fresh candidate list for a query plan, or None."""
+        entry = await self._load(key)
+        if entry is None:
+            self._counters["candidate_misses"] += 1
+            return None
+        try:
+            sources = _decode_sources(entry["fields"], entry["rows"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Discarding unreadable pack candidate entry: {e}")
+            self._counters["candidate_misses"] += 1
+            return None
+        self._counters["candidate_hits"] += 1
+        return sources
+
+    async def put_candidates(self, key: str, sources: list[SourceDoc]) -> None:
+        self._counters["candidate_writes"] += 1
+        await self._store(
+            key, {"fields": list(_SOURCE_FIELDS), "rows": _encode_sources(sources)}
+        )
+
+    async def get_verified(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Recorded VERIFIED results by candidate identity digest."""
+        verified: dict[str, dict[str, Any]] = {}
+        for key in dict.fromkeys(keys):
+            entry = await self._load(self._verified_key(key))
+            if entry is not None and isinstance(entry.get("results"), dict):
+                verified.update(entry["results"])
+        return verified
+
+    async def record_verified(
+        self, keys: list[str], results: dict[str, dict[str, Any]]
+    ) -> None:
+        """Merge newly verified candidates into each key's proof map."""
+        if not results:
+            return
+        for key in dict.fromkeys(keys):
+            verified_key = self._verified_key(key)
+            entry = await self._load(verified_key)
+            merged = dict(entry["results"]) if entry is not None else {}
+            merged.update(results)
+            # Proofs expire with the candidates they were recorded for.
+            created_at = entry["created_at"] if entry is not None else None
+            await self._store(verified_key, {"results": merged}, created_at)
+
+    def note_verified_reused(self, count: int) -> None:
+        self._counters["verified_reused"] += count
+
+    def stats(self) -> dict[str, int]:
+        return dict(self._counters)
+
+    async def _load(self, key: str) -> dict[str, Any] | None:
+        if self.ttl_seconds <= 0:
+            return None
+        payload = await self.cache.get(key)
+        if payload is None:
+            return None
+        try:
+            entry = json.loads(payload)
+        except ValueError:
+            return None
+        if not isinstance(entry, dict):
+            return None
+        created_at = entry.get("created_at")
+        if not isinstance(created_at, int | float):
+            return None
+        if time.time() - created_at > self.ttl_seconds:
+            return None
+        return entry
+
+    async def _store(
+        self, key: str, body: dict[str, Any], created_at: float | None = None
+    ) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry = {"created_at": created_at or time.time(), **body}
+        await self.cache.set(
+            key, json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        )
+
+    @staticmethod
+    def _verified_key(key: str) -> str:
+        return f"{key}:verified"
+
+
+_pack_candidate_cache: PackCandidateCache | None = None
+
+
+def get_pack_candidate_cache() -> PackCandidateCache | None:
+    """Shared cache over the RAG search cache; None when either is off."""
+    if settings.SOURCE_PACK_CANDIDATE_CACHE_TTL_SECONDS <= 0:
+        return None
+    cache = get_retrieval_cache()
+    if cache is None:
+        return None
+    global _pack_candidate_cache
+    if _pack_candidate_cache is None or _pack_candidate_cache.cache is not cache:
+        _pack_candidate_cache = PackCandidateCache(cache)
+    return _pack_candidate_cache
+
+
+__all__ = [
+    "PACK_CANDIDATE_CACHE_VERSION",
+    "PackCandidateCache",
+    "get_pack_candidate_cache",
+    "normalize_query",
+    "pack_candidate_key",
+]
@@ -4,29 +4,71 @@ Retrieves relevant academic papers and sources for context in generation
 Supports: Semantic Scholar, Perplexity, Tavily
 """
 
+import asyncio
+import copy
 import json
 import logging
 import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
-from typing import Any
+from typing import Any, overload
 
 import httpx
 from tavily import TavilyClient
 
 from app.core.config import settings
 from app.services.ai_pipeline.citation_formatter import SourceDocument
+from app.services.ai_pipeline.retrieval_cache import (
+    FetchLock,
+    RetrievalCache,
+    SingleFlight,
+    build_retrieval_cache,
+    get_retrieval_cache,
+    get_single_flight,
+    retrieval_cache_key,
+)
 from app.services.ai_pipeline.source_identity import (
+    YEAR_TOLERANCE,
     normalize_doi,
     normalize_title,
+    source_identity,
     sources_equivalent,
 )
+from app.services.ai_pipeline.text_utils import SharedText
+from app.services.blocking_executor import run_blocking
+from app.services.provider_rate_limiter import (
+    ProviderRateLimiter,
+    get_provider_rate_limiter,
+    retry_after_seconds,
+)
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@overload
+def _shared(value: str) -> str: ...
+
+
+@overload
+def _shared(value: None) -> None: ...
+
+
+def _shared(value: str | None) -> str | None:
+    """Intern a repeated short string so equal values share one object.
+
+    Pack builds re-parse the same provider records many times (every query,
+    page, language and cache hit decodes fresh JSON), and each record used
+    to hold its own copy of the same identifiers, provider and author names.
+    Only such short, recurring values go through here: free text (titles,
+    abstracts) is never interned.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class SourceDoc:
     """Source document retrieved from Semantic Scholar"""
 
@@ -59,6 +101,19 @@ class SourceDoc:
             self.provider = "uploaded"
         if self.source_type is None and self.provider == "uploaded":
             self.source_type = "uploaded_pdf"
+        if isinstance(self.authors, list):
+            # A new list: the caller's list is never modified.
+            self.authors = [_shared(author) for author in self.authors]
+        self.paper_id = _shared(self.paper_id)
+        self.doi = _shared(self.doi)
+        self.provider = _shared(self.provider)
+        self.source_type = _shared(self.source_type)
+        self.verification_status = _shared(self.verification_status)
+
+    def share_text(self, store: SharedText) -> None:
+        """Swap abstract and venue for the store's copies of equal text."""
+        self.abstract = store.share(self.abstract)
+        self.venue = store.share(self.venue)
 
     def to_source_document(self) -> SourceDocument:
         """Convert to SourceDocument for citation formatting"""
@@ -72,6 +127,35 @@ class SourceDoc:
         )
 
 
+@dataclass
+class ProviderTiming:
+    """Per-provider retrieve_sources counters (cumulative per retriever)."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    timeouts: int = 0
+    errors: int = 0
+
+    def record(self, seconds: float, status: str) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if status == "timeout":
+            self.timeouts += 1
+        elif status == "error":
+            self.errors += 1
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 3),
+            "max_seconds": round(self.max_seconds, 3),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
 class RAGRetriever:
     """Retrieve relevant academic papers from multiple search APIs"""
 
@@ -81,16 +165,31 @@ class RAGRetriever:
         max_results: int = 10,
         semantic_scholar_api_key: str | None = None,
         tavily_api_key: str | None = None,
+        rate_limiter: ProviderRateLimiter | None = None,
+        cache: RetrievalCache | None = None,
+        single_flight: SingleFlight | None = None,
+        fetch_lock: FetchLock | None = None,
     ):
         """
         Initialize RAG retriever
 
         Args:
-            cache_dir: Directory for local vector cache (optional)
+            cache_dir: Directory for a private on-disk search cache (optional;
+                default: the shared cache selected by RAG_CACHE_BACKEND)
             max_results: Maximum number of results to retrieve
             semantic_scholar_api_key: Semantic Scholar API key (optional but recommended)
             tavily_api_key: Tavily API key for web search (optional)
+            rate_limiter: Per-provider call scheduler (default: the
+                deployment-wide one shared with CitationVerifier)
+            cache: Search results cache (overrides cache_dir)
+            single_flight: In-flight request table (default: process-wide)
+            fetch_lock: Cross-process fetch lock (default: a Redis lock when
+                RAG_SINGLE_FLIGHT_LOCK_ENABLED, otherwise none)
         """
+        # Crossref/OpenAlex/Semantic Scholar budgets are deployment-wide
+        self.rate_limiter = rate_limiter or get_provider_rate_limiter()
+        self._provider_timings: dict[str, ProviderTiming] = {}
+
         # Semantic Scholar setup
         self.api_key = (
             semantic_scholar_api_key
@@ -99,8 +198,16 @@ class RAGRetriever:
         )
         self.base_url = "https://api.semanticscholar.org/graph/v1"
         self.max_results = max_results
-        self.cache_dir = Path(cache_dir) if cache_dir else Path("/tmp/rag_cache")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if cache is not None:
+            self.cache: RetrievalCache | None = cache
+        elif cache_dir:
+            self.cache = build_retrieval_cache("disk", cache_dir)
+        else:
+            self.cache = get_retrieval_cache()
+        self.single_flight = single_flight or get_single_flight()
+        if fetch_lock is None and settings.RAG_SINGLE_FLIGHT_LOCK_ENABLED:
+            fetch_lock = FetchLock()
+        self.fetch_lock = fetch_lock
 
         # Tavily setup
         self.tavily_key = (
@@ -139,8 +246,15 @@ class RAGRetriever:
         """
         try:
             # Check cache first
-            cached_results = await self._load_from_cache(query)
-            if cached_results:
+            cache_params: dict[str, Any] = {
+                "limit": limit or self.max_results,
+                "fields": fields,
+                "year_min": year_min,
+                "year_max": year_max,
+                "min_citation_count": min_citation_count,
+            }
+            cached_results = await self._load_from_cache(query, **cache_params)
+            if cached_results is not None:
                 logger.info(
                     f"Retrieved {len(cached_results)} sources from cache for query: {query}"
                 )
@@ -178,10 +292,12 @@ class RAGRetriever:
             if self.api_key:
                 headers["x-api-key"] = self.api_key
 
+            await self.rate_limiter.acquire("semantic_scholar")
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.get(
                     f"{self.base_url}/paper/search", params=params, headers=headers
                 )
+                await self._note_throttle("semantic_scholar", response)
                 response.raise_for_status()
                 data = response.json()
 
@@ -228,7 +344,7 @@ class RAGRetriever:
                 source_docs.append(source_doc)
 
             # Cache results
-            await self._save_to_cache(query, source_docs)
+            await self._save_to_cache(query, source_docs, **cache_params)
 
             logger.info(
                 f"Retrieved {len(source_docs)} sources from Semantic Scholar for query: {query}"
@@ -242,81 +358,165 @@ class RAGRetriever:
             logger.error(f"Error retrieving sources: {e}")
             return []
 
-    async def _save_to_cache(self, query: str, source_docs: list[SourceDoc]) -> None:
-        """Save retrieved sources to local cache"""
+    # SourceDoc fields persisted in the search cache (positional rows).
+    _CACHE_FIELDS = (
+        "title",
+        "authors",
+        "year",
+        "abstract",
+        "paper_id",
+        "venue",
+        "citation_count",
+        "url",
+        "doi",
+        "provider",
+        "source_type",
+    )
+
+    async def _save_to_cache(
+        self,
+        query: str,
+        source_docs: list[SourceDoc],
+        *,
+        provider: str = "semantic_scholar",
+        limit: int | None = None,
+        page: int = 1,
+        **params: Any,
+    ) -> None:
+        """Save retrieved sources to the search cache"""
+        if self.cache is None:
+            return
         try:
-            # Create cache key from query
-            cache_key = self._query_to_cache_key(query)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            # Serialize SourceDocs
-            cache_data = {
-                "query": query,
-                "timestamp": datetime.utcnow().isoformat(),
-                "sources": [
-                    {
-                        "title": doc.title,
-                        "authors": doc.authors,
-                        "year": doc.year,
-                        "abstract": doc.abstract,
-                        "paper_id": doc.paper_id,
-                        "venue": doc.venue,
-                        "citation_count": doc.citation_count,
-                        "url": doc.url,
-                        "doi": doc.doi,
-                        "provider": doc.provider,
-                        "source_type": doc.source_type,
-                    }
-                    for doc in source_docs
-                ],
-            }
-
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2)
-
+            key = retrieval_cache_key(
+                provider, query, limit=limit or self.max_results, page=page, **params
+            )
+            payload = json.dumps(
+                {
+                    "fields": self._CACHE_FIELDS,
+                    "rows": [
+                        [getattr(doc, name) for name in self._CACHE_FIELDS]
+                        for doc in source_docs
+                    ],
+                },
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+            await self.cache.set(key, payload)
         except Exception as e:
             logger.warning(f"Failed to save cache: {e}")
 
-    async def _load_from_cache(self, query: str) -> list[SourceDoc] | None:
-        """Load sources from local cache if available"""
+    async def _load_from_cache(
+        self,
+        query: str,
+        *,
+        provider: str = "semantic_scholar",
+        limit: int | None = None,
+        page: int = 1,
+        **params: Any,
+    ) -> list[SourceDoc] | None:
+        """Load sources from the search cache if available"""
+        if self.cache is None:
+            return None
         try:
-            cache_key = self._query_to_cache_key(query)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            if not cache_file.exists():
+            key = retrieval_cache_key(
+                provider, query, limit=limit or self.max_results, page=page, **params
+            )
+            payload = await self.cache.get(key)
+            if payload is None:
                 return None
+            data = json.loads(payload)
+            fields = data["fields"]
+            return [
+                SourceDoc(**dict(zip(fields, row, strict=True))) for row in data["rows"]
+            ]
+        except Exception as e:
+            logger.warning(f"Failed to load cache: {e}")
+            return None
 
-            # Check cache age (expire after 7 days)
-            cache_age = datetime.utcnow().timestamp() - cache_file.stat().st_mtime
-            if cache_age > 7 * 24 * 60 * 60:  # 7 days
-                return None
+    def cache_stats(self) -> dict[str, float]:
+        """Search cache hit/miss counters (empty when caching is off)."""
+        return self.cache.stats() if self.cache is not None else {}
 
-            with open(cache_file, encoding="utf-8") as f:
-                cache_data = json.load(f)
+    async def _cached_search(
+        self,
+        provider: str,
+        query: str,
+        limit: int,
+        page: int,
+        fetch: Callable[[str, int, int], Awaitable[list[SourceDoc]]],
+    ) -> list[SourceDoc]:
+        """Cache lookup, then one coalesced provider request per key.
 
-            # Deserialize SourceDocs
-            source_docs = [
-                SourceDoc(
-                    title=s["title"],
-                    authors=s["authors"],
-                    year=s["year"],
-                    abstract=s.get("abstract"),
-                    paper_id=s.get("paper_id"),
-                    venue=s.get("venue"),
-                    citation_count=s.get("citation_count"),
-                    url=s.get("url"),
-                    doi=s.get("doi"),
-                    provider=s.get("provider"),
-                    source_type=s.get("source_type"),
-                )
-                for s in cache_data.get("sources", [])
-            ]
+        Concurrent callers with the same (provider, query, limit, page) await
+        a single in-flight request; followers get their own copies of the
+        SourceDocs so callers never share mutable results.
+        """
+        cached = await self._load_from_cache(
+            query, provider=provider, limit=limit, page=page
+        )
+        if cached is not None:
+            return cached
 
-            return source_docs
+        async def leader() -> list[SourceDoc]:
+            return await self._locked_fetch(provider, query, limit, page, fetch)
 
-        except Exception as e:
-            logger.warning(f"Failed to load cache: {e}")
-            return None
+        key = retrieval_cache_key(provider, query, limit=limit, page=page)
+        docs, shared = await self.single_flight.do(key, leader)
+        return copy.deepcopy(docs) if shared else docs
+
+    async def _locked_fetch(
+        self,
+        provider: str,
+        query: str,
+        limit: int,
+        page: int,
+        fetch: Callable[[str, int, int], Awaitable[list[SourceDoc]]],
+    ) -> list[SourceDoc]:
+        """Fetch and cache, deferring to another process already fetching."""
+        key = retrieval_cache_key(provider, query, limit=limit, page=page)
+        lock = self.fetch_lock
+        token = None
+        if lock is not None:
+            token = await lock.acquire(key)
+            if token is None:
+                waited = await self._await_remote_fetch(
+                    lock, provider, query, limit, page, key
+                )
+                if waited is not None:
+                    return waited
+                # Holder gave up or its lock expired: fetch ourselves.
+                token = await lock.acquire(key)
+        try:
+            docs = await fetch(query, limit, page)
+            await self._save_to_cache(
+                query, docs, provider=provider, limit=limit, page=page
+            )
+            return docs
+        finally:
+            if lock is not None and token is not None:
+                await lock.release(key, token)
+
+    async def _await_remote_fetch(
+        self,
+        lock: FetchLock,
+        provider: str,
+        query: str,
+        limit: int,
+        page: int,
+        key: str,
+    ) -> list[SourceDoc] | None:
+        """Poll the shared cache while another process holds the fetch lock."""
+        deadline = time.monotonic() + lock.lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.2)
+            cached = await self._load_from_cache(
+                query, provider=provider, limit=limit, page=page
+            )
+            if cached is not None:
+                return cached
+            if not await lock.held(key):
+                return None
+        return None
 
     async def search_perplexity(self, query: str) -> list[SourceDoc]:
         """
@@ -421,8 +621,10 @@ class RAGRetriever:
             return []
 
         try:
-            # Use Tavily Python SDK
-            response = self.tavily_client.search(
+            # The Tavily SDK is synchronous: run it off the event loop
+            response = await run_blocking(
+                "tavily.search",
+                self.tavily_client.search,
                 query=query,
                 search_depth="advanced",  # More thorough search
                 max_results=max_results,
@@ -565,6 +767,13 @@ class RAGRetriever:
             logger.warning(f"Error retrieving from Serper: {e}")
             return []
 
+    async def _note_throttle(self, provider: str, response: httpx.Response) -> None:
+        """Feed a 429 back into the shared limiter so every caller backs off."""
+        if response.status_code == 429:
+            await self.rate_limiter.penalize(
+                provider, retry_after_seconds(response.headers)
+            )
+
     # ------------------------------------------------------------------
     # Free academic providers (no API key required): Crossref & OpenAlex.
     # These give real, verifiable scholarly sources (title/authors/year/DOI/
@@ -605,6 +814,25 @@ class RAGRetriever:
         raise_on_error: bool = False,
     ) -> list[SourceDoc]:
         """Search Crossref for academic works (free, no API key)."""
+        try:
+            return await self._cached_search(
+                "crossref", query, limit, page, self._fetch_crossref
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"HTTP error retrieving from Crossref: {e}")
+            if raise_on_error:
+                raise
+            return []
+        except Exception as e:
+            logger.warning(f"Error retrieving from Crossref: {e}")
+            if raise_on_error:
+                raise
+            return []
+
+    async def _fetch_crossref(
+        self, query: str, limit: int, page: int
+    ) -> list[SourceDoc]:
+        """One uncached Crossref search request; raises on failure."""
         base = getattr(settings, "CROSSREF_API_URL", "https://api.crossref.org").rstrip(
             "/"
         )
@@ -616,64 +844,53 @@ class RAGRetriever:
             "is-referenced-by-count",
             "mailto": self._POLITE_MAILTO,
         }
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{base}/works", params=params)
-                response.raise_for_status()
-                items = response.json().get("message", {}).get("items", [])
+        await self.rate_limiter.acquire("crossref")
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(f"{base}/works", params=params)
+            await self._note_throttle("crossref", response)
+            response.raise_for_status()
+            items = response.json().get("message", {}).get("items", [])
+
+        source_docs: list[SourceDoc] = []
+        for item in items:
+            title_list = item.get("title") or []
+            title = title_list[0] if title_list else ""
+            if not title:
+                continue
 
-            source_docs: list[SourceDoc] = []
-            for item in items:
-                title_list = item.get("title") or []
-                title = title_list[0] if title_list else ""
-                if not title:
-                    continue
+            authors = []
+            for a in item.get("author", []) or []:
+                name = f"{a.get('given', '')} {a.get('family', '')}".strip()
+                if name:
+                    authors.append(name)
 
-                authors = []
-                for a in item.get("author", []) or []:
-                    name = f"{a.get('given', '')} {a.get('family', '')}".strip()
-                    if name:
-                        authors.append(name)
-
-                year = 0
-                date_parts = (item.get("issued") or {}).get("date-parts") or []
-                if date_parts and date_parts[0]:
-                    year = date_parts[0][0] or 0
-
-                venue_list = item.get("container-title") or []
-                doi = item.get("DOI")
-                source_docs.append(
-                    SourceDoc(
-                        title=title,
-                        authors=authors,
-                        year=year,
-                        abstract=self._clean_abstract(item.get("abstract")),
-                        paper_id=doi,
-                        venue=venue_list[0] if venue_list else None,
-                        citation_count=item.get("is-referenced-by-count"),
-                        url=item.get("URL")
-                        or (f"https://doi.org/{doi}" if doi else None),
-                        doi=doi,
-                        provider="crossref",
-                        source_type=item.get("type"),
-                    )
-                )
+            year = 0
+            date_parts = (item.get("issued") or {}).get("date-parts") or []
+            if date_parts and date_parts[0]:
+                year = date_parts[0][0] or 0
 
-            logger.info(
-                f"Retrieved {len(source_docs)} sources from Crossref for query: {query}"
+            venue_list = item.get("container-title") or []
+            doi = item.get("DOI")
+            source_docs.append(
+                SourceDoc(
+                    title=title,
+                    authors=authors,
+                    year=year,
+                    abstract=self._clean_abstract(item.get("abstract")),
+                    paper_id=doi,
+                    venue=venue_list[0] if venue_list else None,
+                    citation_count=item.get("is-referenced-by-count"),
+                    url=item.get("URL") or (f"https://doi.org/{doi}" if doi else None),
+                    doi=doi,
+                    provider="crossref",
+                    source_type=item.get("type"),
+                )
             )
-            return source_docs
 
-        except httpx.HTTPError as e:
-            logger.warning(f"HTTP error retrieving from Crossref: {e}")
-            if raise_on_error:
-                raise
-            return []
-        except Exception as e:
-            logger.warning(f"Error retrieving from Crossref: {e}")
-            if raise_on_error:
-                raise
-            return []
+        logger.info(
+            f"Retrieved {len(source_docs)} sources from Crossref for query: {query}"
+        )
+        return source_docs
 
     async def search_openalex(
         self,
@@ -684,6 +901,25 @@ class RAGRetriever:
         raise_on_error: bool = False,
     ) -> list[SourceDoc]:
         """Search OpenAlex for academic works (free, no API key)."""
+        try:
+            return await self._cached_search(
+                "openalex", query, limit, page, self._fetch_openalex
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"HTTP error retrieving from OpenAlex: {e}")
+            if raise_on_error:
+                raise
+            return []
+        except Exception as e:
+            logger.warning(f"Error retrieving from OpenAlex: {e}")
+            if raise_on_error:
+                raise
+            return []
+
+    async def _fetch_openalex(
+        self, query: str, limit: int, page: int
+    ) -> list[SourceDoc]:
+        """One uncached OpenAlex search request; raises on failure."""
         base = getattr(settings, "OPENALEX_API_URL", "https://api.openalex.org").rstrip(
             "/"
         )
@@ -693,70 +929,66 @@ class RAGRetriever:
             "page": max(1, page),
             "mailto": self._POLITE_MAILTO,
         }
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{base}/works", params=params)
-                response.raise_for_status()
-                works = response.json().get("results", [])
-
-            source_docs: list[SourceDoc] = []
-            for w in works:
-                title = w.get("title") or w.get("display_name") or ""
-                if not title:
-                    continue
+        await self.rate_limiter.acquire("openalex")
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(f"{base}/works", params=params)
+            await self._note_throttle("openalex", response)
+            response.raise_for_status()
+            works = response.json().get("results", [])
+
+        source_docs: list[SourceDoc] = []
+        for w in works:
+            title = w.get("title") or w.get("display_name") or ""
+            if not title:
+                continue
 
-                authors = []
-                for a in w.get("authorships", []) or []:
-                    name = (a.get("author") or {}).get("display_name")
-                    if name:
-                        authors.append(name)
+            authors = []
+            for a in w.get("authorships", []) or []:
+                name = (a.get("author") or {}).get("display_name")
+                if name:
+                    authors.append(name)
 
-                doi = w.get("doi")
-                if doi and doi.startswith("https://doi.org/"):
-                    doi = doi[len("https://doi.org/") :]
+            doi = w.get("doi")
+            if doi and doi.startswith("https://doi.org/"):
+                doi = doi[len("https://doi.org/") :]
 
-                venue = ((w.get("primary_location") or {}).get("source") or {}).get(
-                    "display_name"
-                )
+            venue = ((w.get("primary_location") or {}).get("source") or {}).get(
+                "display_name"
+            )
 
-                source_docs.append(
-                    SourceDoc(
-                        title=title,
-                        authors=authors,
-                        year=w.get("publication_year") or 0,
-                        abstract=self._reconstruct_openalex_abstract(
-                            w.get("abstract_inverted_index")
-                        ),
-                        paper_id=w.get("id"),
-                        venue=venue,
-                        citation_count=w.get("cited_by_count"),
-                        url=w.get("doi") or w.get("id"),
-                        doi=doi,
-                        provider="openalex",
-                        source_type=w.get("type"),
-                    )
+            source_docs.append(
+                SourceDoc(
+                    title=title,
+                    authors=authors,
+                    year=w.get("publication_year") or 0,
+                    abstract=self._reconstruct_openalex_abstract(
+                        w.get("abstract_inverted_index")
+                    ),
+                    paper_id=w.get("id"),
+                    venue=venue,
+                    citation_count=w.get("cited_by_count"),
+                    url=w.get("doi") or w.get("id"),
+                    doi=doi,
+                    provider="openalex",
+                    source_type=w.get("type"),
                 )
-
-            logger.info(
-                f"Retrieved {len(source_docs)} sources from OpenAlex for query: {query}"
             )
-            return source_docs
 
-        except httpx.HTTPError as e:
-            logger.warning(f"HTTP error retrieving from OpenAlex: {e}")
-            if raise_on_error:
-                raise
-            return []
-        except Exception as e:
-            logger.warning(f"Error retrieving from OpenAlex: {e}")
-            if raise_on_error:
-                raise
-            return []
+        logger.info(
+            f"Retrieved {len(source_docs)} sources from OpenAlex for query: {query}"
+        )
+        return source_docs
 
     async def retrieve_sources(self, query: str, limit: int = 20) -> list[SourceDoc]:
         """
         Retrieve sources from all enabled search APIs and combine results
 
+        Providers run concurrently, each bounded by RAG_PROVIDER_TIMEOUT_SECONDS;
+        when RAG_RETRIEVAL_BUDGET_SECONDS expires, providers still running are
+        cancelled and the answers collected so far are used. Results are merged
+        in the fixed provider order below (not completion order), so identical
+        provider answers always deduplicate to identical output.
+
         Args:
             query: Search query
             limit: Maximum number of results to return (default: 20)
@@ -764,52 +996,28 @@ class RAGRetriever:
         Returns:
             List of SourceDoc instances (deduplicated, top results)
         """
-        results: list[SourceDoc] = []
-
-        # Free academic providers first (no API key, reliable scholarly sources).
-        # These ground generation in real, verifiable works instead of leaving
-        # the model to hallucinate citations.
-        if getattr(settings, "ACADEMIC_FREE_RAG_ENABLED", True):
-            for provider_name, search_fn in (
-                ("Crossref", self.search_crossref),
-                ("OpenAlex", self.search_openalex),
-            ):
-                try:
-                    results.extend(await search_fn(query))
-                except Exception as e:
-                    logger.warning(f"Failed to retrieve from {provider_name}: {e}")
-
-        # Search Semantic Scholar
-        if settings.SEMANTIC_SCHOLAR_ENABLED:
-            try:
-                semantic_results = await self.search_semantic_scholar(query)
-                results.extend(semantic_results)
-            except Exception as e:
-                logger.warning(f"Failed to retrieve from Semantic Scholar: {e}")
-
-        # Search Perplexity
-        if settings.PERPLEXITY_API_KEY:
-            try:
-                perplexity_results = await self.search_perplexity(query)
-                results.extend(perplexity_results)
-            except Exception as e:
-                logger.warning(f"Failed to retrieve from Perplexity: {e}")
-
-        # Search Tavily
-        if settings.TAVILY_API_KEY:
-            try:
-                tavily_results = await self.search_tavily(query)
-                results.extend(tavily_results)
-            except Exception as e:
-                logger.warning(f"Failed to retrieve from Tavily: {e}")
+        providers = self._enabled_providers()
+        tasks = [
+            asyncio.create_task(self._timed_search(name, search_fn, query))
+            for name, search_fn in providers
+        ]
+        if tasks:
+            _, pending = await asyncio.wait(
+                tasks, timeout=settings.RAG_RETRIEVAL_BUDGET_SECONDS
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.warning(
+                    f"Retrieval budget expired; using partial results "
+                    f"({len(providers) - len(pending)}/{len(providers)} providers)"
+                )
 
-        # Search Serper
-        if settings.SERPER_API_KEY:
-            try:
-                serper_results = await self.search_serper(query)
-                results.extend(serper_results)
-            except Exception as e:
-                logger.warning(f"Failed to retrieve from Serper: {e}")
+        results: list[SourceDoc] = []
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                results.extend(task.result())
 
         # Deduplicate sources
         deduplicated = self._deduplicate_sources(results)
@@ -824,6 +1032,69 @@ class RAGRetriever:
 
         return top_results
 
+    def provider_timings(self) -> dict[str, dict[str, float]]:
+        """Cumulative per-provider latency/timeout/error counters."""
+        return {
+            name: timing.to_dict()
+            for name, timing in sorted(self._provider_timings.items())
+        }
+
+    def _enabled_providers(
+        self,
+    ) -> list[tuple[str, Callable[[str], Awaitable[list[SourceDoc]]]]]:
+        """Enabled providers in merge order."""
+        providers: list[tuple[str, Callable[[str], Awaitable[list[SourceDoc]]]]] = []
+        # Free academic providers first (no API key, reliable scholarly sources).
+        # These ground generation in real, verifiable works instead of leaving
+        # the model to hallucinate citations.
+        if getattr(settings, "ACADEMIC_FREE_RAG_ENABLED", True):
+            providers.append(("Crossref", self.search_crossref))
+            providers.append(("OpenAlex", self.search_openalex))
+        if settings.SEMANTIC_SCHOLAR_ENABLED:
+            providers.append(("Semantic Scholar", self.search_semantic_scholar))
+        if settings.PERPLEXITY_API_KEY:
+            providers.append(("Perplexity", self.search_perplexity))
+        if settings.TAVILY_API_KEY:
+            providers.append(("Tavily", self.search_tavily))
+        if settings.SERPER_API_KEY:
+            providers.append(("Serper", self.search_serper))
+        return providers
+
+    async def _timed_search(
+        self,
+        name: str,
+        search_fn: Callable[[str], Awaitable[list[SourceDoc]]],
+        query: str,
+    ) -> list[SourceDoc]:
+        """Run one provider under its deadline; never raises (bar cancellation)."""
+        started = time.monotonic()
+        status = "ok"
+        found: list[SourceDoc] = []
+        try:
+            found = list(
+                await asyncio.wait_for(
+                    search_fn(query), timeout=settings.RAG_PROVIDER_TIMEOUT_SECONDS
+                )
+            )
+        except TimeoutError:
+            status = "timeout"
+            logger.warning(f"Failed to retrieve from {name}: deadline exceeded")
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            status = "error"
+            logger.warning(f"Failed to retrieve from {name}: {e}")
+        finally:
+            elapsed = time.monotonic() - started
+            self._provider_timings.setdefault(name, ProviderTiming()).record(
+                elapsed, status
+            )
+            logger.debug(
+                f"Retrieval {name}: {status} in {elapsed:.2f}s ({len(found)} results)"
+            )
+        return found
+
     def _deduplicate_sources(self, sources: list[SourceDoc]) -> list[SourceDoc]:
         """
         Remove duplicate sources based on title, URL, or DOI
@@ -833,27 +1104,80 @@ class RAGRetriever:
 
         Returns:
             Deduplicated list of SourceDoc instances
+
+        Each record is merged into the FIRST kept record equivalent to it.
+        Kept records are indexed by the identity keys every equivalence path
+        needs (uploaded id, DOI, URL, title+year, authorless title+year), so
+        only records sharing a key are compared; the full equivalence check
+        still decides, which keeps the output identical to a pairwise scan.
         """
         deduplicated: list[SourceDoc] = []
+        index: dict[tuple, list[int]] = {}
 
         for source in sources:
+            candidates = sorted(
+                {
+                    position
+                    for key in self._dedup_keys(source, lookup=True)
+                    for position in index.get(key, ())
+                }
+            )
             duplicate_index = next(
                 (
-                    index
-                    for index, existing in enumerate(deduplicated)
-                    if self._retrieval_records_equivalent(existing, source)
+                    position
+                    for position in candidates
+                    if self._retrieval_records_equivalent(
+                        deduplicated[position], source
+                    )
                 ),
                 None,
             )
             if duplicate_index is None:
+                duplicate_index = len(deduplicated)
                 deduplicated.append(source)
-                continue
-            deduplicated[duplicate_index] = self._merge_source_docs(
-                deduplicated[duplicate_index], source
-            )
+            else:
+                deduplicated[duplicate_index] = self._merge_source_docs(
+                    deduplicated[duplicate_index], source
+                )
+            # A merge can add keys (DOI, authors, earlier year); stale keys
+            # only add candidates that the full check rejects.
+            for key in self._dedup_keys(deduplicated[duplicate_index]):
+                positions = index.setdefault(key, [])
+                if duplicate_index not in positions:
+                    positions.append(duplicate_index)
 
         return deduplicated
 
+    @staticmethod
+    def _dedup_keys(source: SourceDoc, *, lookup: bool = False) -> set[tuple]:
+        """Hash keys shared by any two records _retrieval_records_equivalent
+        can match; ``lookup`` widens the title key to the year tolerance."""
+        identity = source_identity(source)
+        keys: set[tuple] = set()
+        if identity.uploaded_paper_id:
+            keys.add(("uploaded", identity.uploaded_paper_id))
+        if identity.doi:
+            keys.add(("doi", identity.doi))
+        url = RAGRetriever._retrieval_url(source.url)
+        if url:
+            keys.add(("url", url))
+        if identity.title and identity.year is not None and identity.author_surnames:
+            years = (
+                range(
+                    identity.year - YEAR_TOLERANCE, identity.year + YEAR_TOLERANCE + 1
+                )
+                if lookup
+                else (identity.year,)
+            )
+            keys.update(("title", identity.title, year) for year in years)
+        if not source.authors:
+            keys.add(("authorless", source.year, identity.title))
+        return keys
+
+    @staticmethod
+    def _retrieval_url(url: str | None) -> str:
+        return str(url or "").strip().casefold().rstrip("/")
+
     @staticmethod
     def _retrieval_records_equivalent(left: SourceDoc, right: SourceDoc) -> bool:
         if sources_equivalent(left, right):
@@ -862,8 +1186,8 @@ class RAGRetriever:
         right_doi = normalize_doi(right.doi)
         if left_doi and right_doi and left_doi != right_doi:
             return False
-        left_url = str(left.url or "").strip().casefold().rstrip("/")
-        right_url = str(right.url or "").strip().casefold().rstrip("/")
+        left_url = RAGRetriever._retrieval_url(left.url)
+        right_url = RAGRetriever._retrieval_url(right.url)
         if left_url and left_url == right_url:
             return True
         # Exact sparse provider records can lack authors entirely. Preserve the
@@ -928,10 +1252,3 @@ class RAGRetriever:
 
         # Default to current year
         return datetime.now().year
-
-    @staticmethod
-    def _query_to_cache_key(query: str) -> str:
-        """Convert query to cache key (filename-safe)"""
-        import hashlib
-
-        return hashlib.sha256(query.encode()).hexdigest()
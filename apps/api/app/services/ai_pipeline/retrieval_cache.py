@@ -0,0 +1,474 @@
+"""
+Bounded cache for scholarly search results (RAGRetriever).
+
+Replaces the old one-pretty-printed-JSON-file-per-query cache under
+/tmp/rag_cache, which keyed on the query string alone (so a limit=5 answer
+was served for limit=20 and page 2 top-ups got page 1), never evicted
+anything, read files synchronously on the event loop and was invisible to
+other hosts.
+
+Layout: a small in-process LRU front in front of one backing store:
+
+- ``DiskCacheBackend``  one compact ``<key>.json`` per entry, file I/O off the
+  event loop, mtime-based TTL, oldest files pruned past ``max_entries``;
+- ``RedisCacheBackend`` ``SET ... EX`` per entry plus a sorted-set index that
+  trims the oldest keys past ``max_entries`` (shared across hosts).
+
+Keys hash (provider, query, limit, page, extra filters), see
+``retrieval_cache_key``. Payloads are opaque strings: the retriever owns the
+SourceDoc encoding. Cache failures never raise into callers - they read as
+a miss. ``stats()`` exposes hit/miss counters and the hit rate.
+
+Selected by RAG_CACHE_BACKEND ("disk" | "redis" | "memory" | "off").
+
+The cache is only written once a request completes, so concurrent identical
+requests (jobs on similar topics enqueued together, overlapping pack builds)
+would all miss and all hit the provider. ``SingleFlight`` coalesces them
+within the process; ``FetchLock`` optionally extends that across processes
+with a short Redis lock (RAG_SINGLE_FLIGHT_LOCK_ENABLED) - followers poll the
+shared cache until the holder has written it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, Protocol, TypeVar
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CACHE_SCHEMA_VERSION = 1
+REDIS_KEY_PREFIX = "rag_cache"
+
+# Disk/Redis eviction runs once every N writes (a directory scan / ZCARD per
+# write would cost more than the lookup it saves).
+_PRUNE_EVERY = 32
+
+
+def retrieval_cache_key(
+    provider: str, query: str, *, limit: int, page: int = 1, **params: Any
+) -> str:
+    """Stable hex key for one provider request; ``None`` params are ignored."""
+    extra = {name: value for name, value in params.items() if value is not None}
+    raw = json.dumps(
+        [CACHE_SCHEMA_VERSION, provider, query, limit, page, extra],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Backing store behind the in-memory LRU front."""
+
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, payload: str) -> int:
+        """Store a payload; returns the number of entries evicted."""
+        ...
+
+
+class DiskCacheBackend:
+    """One compact JSON file per key; I/O runs in a worker thread."""
+
+    def __init__(self, directory: str | Path, *, ttl_seconds: int, max_entries: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._writes = 0
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._read, self._path(key))
+
+    async def set(self, key: str, payload: str) -> int:
+        await asyncio.to_thread(self._write, self._path(key), payload)
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 1:
+            return await asyncio.to_thread(self._prune)
+        return 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, path: Path) -> str | None:
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: Path, payload: str) -> None:
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _prune(self) -> int:
+        entries: list[tuple[float, Path]] = []
+        now = time.time()
+        evicted = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                evicted += 1
+            else:
+                entries.append((mtime, path))
+        overflow = len(entries) - self.max_entries
+        if overflow > 0:
+            entries.sort()
+            for _, path in entries[:overflow]:
+                path.unlink(missing_ok=True)
+                evicted += 1
+        return evicted
+
+
+class RedisCacheBackend:
+    """Entries with EX expiry plus a sorted-set index for the size cap."""
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis | None = None,
+        *,
+        ttl_seconds: int,
+        max_entries: int,
+    ):
+        self._redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._index_key = f"{REDIS_KEY_PREFIX}:v{CACHE_SCHEMA_VERSION}:index"
+        self._writes = 0
+
+    async def get(self, key: str) -> str | None:
+        redis = self._client()
+        if redis is None:
+            return None
+        payload = await redis.get(self._key(key))
+        if isinstance(payload, bytes):
+            return payload.decode("utf-8")
+        return payload if isinstance(payload, str) else None
+
+    async def set(self, key: str, payload: str) -> int:
+        redis = self._client()
+        if redis is None:
+            return 0
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(self._key(key), payload, ex=self.ttl_seconds)
+        pipe.zadd(self._index_key, {key: time.time()})
+        await pipe.execute()
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY != 1:
+            return 0
+        return await self._prune(redis)
+
+    async def _prune(self, redis: aioredis.Redis) -> int:
+        # Drop index entries whose values already expired, then the oldest
+        # keys past the cap.
+        await redis.zremrangebyscore(
+            self._index_key, "-inf", time.time() - self.ttl_seconds
+        )
+        overflow = await redis.zcard(self._index_key) - self.max_entries
+        if overflow <= 0:
+            return 0
+        oldest = await redis.zpopmin(self._index_key, overflow)
+        keys = [
+            member.decode("utf-8") if isinstance(member, bytes) else member
+            for member, _ in oldest
+        ]
+        if keys:
+            await redis.delete(*(self._key(key) for key in keys))
+        return len(keys)
+
+    def _client(self) -> aioredis.Redis | None:
+        if self._redis is not None:
+            return self._redis
+        # Lazy: the shared app pool is created at startup, after this object.
+        from app.middleware.rate_limit import get_redis_client
+
+        return get_redis_client()
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:v{CACHE_SCHEMA_VERSION}:{key}"
+
+
+class RetrievalCache:
+    """In-memory LRU front over an optional backing store."""
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        *,
+        memory_entries: int | None = None,
+        ttl_seconds: int | None = None,
+    ):
+        self.backend = backend
+        self.memory_entries = max(
+            0,
+            (
+                settings.RAG_CACHE_MEMORY_ENTRIES
+                if memory_entries is None
+                else memory_entries
+            ),
+        )
+        self.ttl_seconds = (
+            settings.RAG_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._front: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._counters = {
+            "memory_hits": 0,
+            "backend_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+        self._warned = False
+
+    async def get(self, key: str) -> str | None:
+        entry = self._front.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > time.monotonic():
+                self._front.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return payload
+            del self._front[key]
+
+        backend_payload: str | None = None
+        if self.backend is not None:
+            try:
+                backend_payload = await self.backend.get(key)
+            except Exception as e:
+                self._error(f"Retrieval cache read failed: {e}")
+        if backend_payload is None:
+            self._counters["misses"] += 1
+            return None
+        self._counters["backend_hits"] += 1
+        self._remember(key, backend_payload)
+        return backend_payload
+
+    async def set(self, key: str, payload: str) -> None:
+        self._counters["writes"] += 1
+        self._remember(key, payload)
+        if self.backend is None:
+            return
+        try:
+            self._counters["evictions"] += await self.backend.set(key, payload)
+        except Exception as e:
+            self._error(f"Retrieval cache write failed: {e}")
+
+    def stats(self) -> dict[str, float]:
+        hits = self._counters["memory_hits"] + self._counters["backend_hits"]
+        lookups = hits + self._counters["misses"]
+        return {
+            **self._counters,
+            "memory_entries": len(self._front),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, payload: str) -> None:
+        if not self.memory_entries:
+            return
+        self._front[key] = (time.monotonic() + self.ttl_seconds, payload)
+        self._front.move_to_end(key)
+        while len(self._front) > self.memory_entries:
+            self._front.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _error(self, message: str) -> None:
+        self._counters["errors"] += 1
+        if self._warned:
+            logger.debug(message)
+        else:
+            logger.warning(message)
+            self._warned = True
+
+
+def build_retrieval_cache(
+    backend: str | None = None, cache_dir: str | Path | None = None
+) -> RetrievalCache | None:
+    """Cache for RAG_CACHE_BACKEND (or ``backend``); None when turned off."""
+    kind = (backend or settings.RAG_CACHE_BACKEND or "off").lower()
+    ttl = settings.RAG_CACHE_TTL_SECONDS
+    max_entries = settings.RAG_CACHE_MAX_ENTRIES
+    if kind == "off":
+        return None
+    if kind == "memory":
+        return RetrievalCache()
+    if kind == "redis":
+        return RetrievalCache(
+            RedisCacheBackend(ttl_seconds=ttl, max_entries=max_entries)
+        )
+    if kind != "disk":
+        logger.warning(f"Unknown RAG_CACHE_BACKEND {kind!r}; using disk")
+    return RetrievalCache(
+        DiskCacheBackend(
+            cache_dir or settings.RAG_CACHE_DIR,
+            ttl_seconds=ttl,
+            max_entries=max_entries,
+        )
+    )
+
+
+class SingleFlight:
+    """Process-local coalescing of identical in-flight requests."""
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Task] = {}
+        self._counters = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run ``fn`` once per in-flight ``key``; returns (result, shared).
+
+        The call runs in its own task, so a caller that is cancelled (e.g. by
+        a retrieval deadline) does not cancel it for the other waiters.
+        Exceptions propagate to every waiter.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self._counters["leaders"] += 1
+        else:
+            self._counters["coalesced"] += 1
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> dict[str, int]:
+        return {**self._counters, "in_flight": len(self._calls)}
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+
+class FetchLock:
+    """Short Redis lock naming the one process fetching a given key."""
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis | None = None,
+        *,
+        lock_seconds: float | None = None,
+    ):
+        self._redis = redis_client
+        self.lock_seconds = (
+            settings.RAG_SINGLE_FLIGHT_LOCK_SECONDS
+            if lock_seconds is None
+            else lock_seconds
+        )
+
+    async def acquire(self, key: str) -> str | None:
+        """Token if this process now holds the lock; None if another does.
+
+        Without Redis (or on Redis errors) every caller "holds" the lock:
+        coalescing degrades to process-local, never to a stall.
+        """
+        token = secrets.token_hex(8)
+        redis = self._client()
+        if redis is None:
+            return token
+        try:
+            acquired = await redis.set(
+                self._key(key),
+                token,
+                nx=True,
+                px=max(1, int(self.lock_seconds * 1000)),
+            )
+        except Exception as e:
+            logger.debug(f"Retrieval fetch lock unavailable: {e}")
+            return token
+        return token if acquired else None
+
+    async def release(self, key: str, token: str) -> None:
+        redis = self._client()
+        if redis is None:
+            return
+        try:
+            holder = await redis.get(self._key(key))
+            if isinstance(holder, bytes):
+                holder = holder.decode("utf-8")
+            if holder == token:
+                await redis.delete(self._key(key))
+        except Exception as e:
+            logger.debug(f"Retrieval fetch lock release failed: {e}")
+
+    async def held(self, key: str) -> bool:
+        redis = self._client()
+        if redis is None:
+            return False
+        try:
+            return bool(await redis.exists(self._key(key)))
+        except Exception:
+            return False
+
+    def _client(self) -> aioredis.Redis | None:
+        if self._redis is not None:
+            return self._redis
+        from app.middleware.rate_limit import get_redis_client
+
+        return get_redis_client()
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:v{CACHE_SCHEMA_VERSION}:lock:{key}"
+
+
+_retrieval_cache: RetrievalCache | None = None
+_retrieval_cache_built = False
+
+
+def get_retrieval_cache() -> RetrievalCache | None:
+    """Process-wide cache shared by every RAGRetriever."""
+    global _retrieval_cache, _retrieval_cache_built
+    if not _retrieval_cache_built:
+        _retrieval_cache = build_retrieval_cache()
+        _retrieval_cache_built = True
+    return _retrieval_cache
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide in-flight request table shared by every RAGRetriever."""
+    return _single_flight
+
+
+__all__ = [
+    "CacheBackend",
+    "DiskCacheBackend",
+    "FetchLock",
+    "RedisCacheBackend",
+    "RetrievalCache",
+    "SingleFlight",
+    "build_retrieval_cache",
+    "get_retrieval_cache",
+    "get_single_flight",
+    "retrieval_cache_key",
+]
@@ -8,23 +8,39 @@ parametric memory. This is the fix for the failure where a thesis on "AI in
 education" cited real-but-off-topic corporate-training articles.
 
 Retrieval reuses the free, key-less providers on RAGRetriever (Crossref +
-OpenAlex) and its deduper; topic-relevance scoring is fully local (no LLM, no
-extra API calls). Persistence lives in source_verification_stage.py
-(persist_source_pack / load_source_pack).
+OpenAlex) and its deduper; the query x provider grid is fetched concurrently
+under a global and a per-provider concurrency cap, then re-sequenced into grid
+order so the pack (and its sha256) is identical to a serial build.
+Topic-relevance scoring is fully local (no LLM, no extra API calls).
+Persistence lives in source_verification_stage.py (persist_source_pack /
+load_source_pack).
 """
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import hashlib
 import json
 import logging
 import re
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
+from app.core.config import settings
+from app.services.ai_pipeline.pack_candidate_cache import (
+    PackCandidateCache,
+    get_pack_candidate_cache,
+    pack_candidate_key,
+)
 from app.services.ai_pipeline.rag_retriever import RAGRetriever, SourceDoc
 from app.services.ai_pipeline.source_identity import normalize_doi
-from app.services.ai_pipeline.text_utils import ascii_fold, content_tokens
+from app.services.ai_pipeline.text_utils import (
+    SharedText,
+    ascii_fold,
+    content_tokens,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -100,8 +116,9 @@ _DOMAIN_ANCHORS: dict[str, dict[str, set[str]]] = {
             "universita",
             "higher education",
         },
-        # Matched with fold+prefix semantics (_term_hit): stems cover the
-        # inflected Italian forms (educativ- -> educativo/educativa/educative).
+        # Matched on folded terms by _MarkerIndex: a term hits when it equals
+        # or starts with a marker, so stems cover the inflected Italian forms
+        # (educativ- -> educativo/educativa/educative).
         "anchor": {
             "education",
             "educational",
@@ -167,7 +184,84 @@ _DOMAIN_ANCHORS: dict[str, dict[str, set[str]]] = {
 }
 
 
-@dataclass
+class _MarkerIndex:
+    """Prefix index over a marker set: ``hit`` is True if any term equals or
+    starts with a marker. One set lookup per distinct marker length instead
+    of a term x marker scan."""
+
+    __slots__ = ("markers", "lengths")
+
+    def __init__(self, markers: set[str]) -> None:
+        self.markers = frozenset(markers)
+        self.lengths = tuple(sorted({len(marker) for marker in self.markers}))
+
+    def hit(self, terms: frozenset[str] | set[str]) -> bool:
+        markers = self.markers
+        for term in terms:
+            size = len(term)
+            for length in self.lengths:
+                if length > size:
+                    break
+                if term[:length] in markers:
+                    return True
+        return False
+
+
+_ANCHOR_INDEX = {
+    domain: _MarkerIndex(cfg["anchor"]) for domain, cfg in _DOMAIN_ANCHORS.items()
+}
+_OFF_TOPIC_INDEX = {
+    domain: _MarkerIndex(cfg["off_topic"]) for domain, cfg in _DOMAIN_ANCHORS.items()
+}
+# _detect_domain matches detect markers as substrings of topic terms: one
+# alternation searched over the NUL-joined terms (NUL never occurs in a
+# token, so no match can straddle two terms).
+_DETECT_PATTERNS = {
+    domain: re.compile("|".join(re.escape(d) for d in sorted(cfg["detect"])))
+    for domain, cfg in _DOMAIN_ANCHORS.items()
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SourceFeatures:
+    """Tokenized, accent-folded view of one candidate, computed once."""
+
+    terms: frozenset[str]  # content tokens of title + abstract (coverage)
+    folded_terms: frozenset[str]  # the same, accent-folded (off-topic markers)
+    folded_gate_terms: frozenset[str]  # folded terms + venue tokens (anchor gate)
+
+
+_FeatureKey = tuple[str | None, str | None, str | None]
+
+
+def _features_for(
+    title: str | None, abstract: str | None, venue: str | None
+) -> SourceFeatures:
+    terms = frozenset(content_tokens(title) | content_tokens(abstract))
+    folded = frozenset(ascii_fold(term) for term in terms)
+    venue_folded = frozenset(ascii_fold(term) for term in content_tokens(venue))
+    return SourceFeatures(
+        terms=terms, folded_terms=folded, folded_gate_terms=folded | venue_folded
+    )
+
+
+def source_features(
+    src: SourceDoc, memo: dict[_FeatureKey, SourceFeatures] | None = None
+) -> SourceFeatures:
+    """Scoring features of a candidate. ``memo`` (one build's, or the
+    retrieval session's across a document's builds) keeps them per record
+    text, so the provisional, post-outline and top-up builds tokenize each
+    record once and nothing outlives the document."""
+    key = (src.title, src.abstract, src.venue)
+    if memo is None:
+        return _features_for(*key)
+    features = memo.get(key)
+    if features is None:
+        features = memo[key] = _features_for(*key)
+    return features
+
+
+@dataclass(slots=True)
 class PackedSource:
     """A retrieved source plus its pack-scoped key and topic-relevance score."""
 
@@ -195,6 +289,11 @@ class SourcePack:
     # underfilled pack with provider errors is retryable, not proof that too
     # few valid sources exist.
     provider_errors: list[str] = field(default_factory=list)
+    # Cross-document candidate-cache keys this pack's candidates came from
+    # (pack_candidate_cache.py); preflight records its verifications there.
+    candidate_cache_keys: list[str] = field(default_factory=list)
+    # (passages list, its length, PassageIndex) built by passage_index().
+    _passage_index: Any = field(default=None, init=False, repr=False, compare=False)
 
     def keys(self) -> list[str]:
         return [ps.citation_key for ps in self.sources]
@@ -243,6 +342,23 @@ class SourcePack:
         """Return deterministic PDF passages used by both digest and prompt."""
         return sorted(self.passages or [], key=self._canonical_passage_sort_key)
 
+    def passage_index(self) -> Any:
+        """PassageIndex over canonical_passages(), built on first use.
+
+        Every section prompt queries the same passages, so they are
+        tokenized once per pack. Reassigning ``passages`` (the uploaded
+        pack is attached after the build) rebuilds the index.
+        """
+        passages = self.passages or []
+        cached = self._passage_index
+        if cached is None or cached[0] is not passages or cached[1] != len(passages):
+            # Local import: uploaded_sources imports this module.
+            from app.services.uploaded_sources import PassageIndex
+
+            cached = (passages, len(passages), PassageIndex(self.canonical_passages()))
+            self._passage_index = cached
+        return cached[2]
+
     def sha256(self) -> str:
         """Digest of every prompt-significant source-pack field.
 
@@ -332,13 +448,7 @@ class SourcePack:
         block = "\n".join(lines)
 
         if query and self.passages:
-            # Local import: uploaded_sources imports this module for the pack
-            # types, so the excerpt selector must be imported lazily here.
-            from app.services.uploaded_sources import select_passages
-
-            excerpts = select_passages(
-                self.canonical_passages(), query, limit=excerpt_limit
-            )
+            excerpts = self.passage_index().select(query, limit=excerpt_limit)
             if excerpts:
                 excerpt_lines = [
                     "",
@@ -389,11 +499,105 @@ def is_blocked_automatic_source(source: SourceDoc) -> bool:
     return bool(_STUDENT_WORK_TEXT_RE.search(text))
 
 
+@dataclass
+class _QueryPool:
+    """Contiguous provider results for one (provider, query), from offset 0."""
+
+    docs: list[SourceDoc] = field(default_factory=list)
+    exhausted: bool = False  # the provider returned a short page: no more
+
+
+class RetrievalSession:
+    """Raw candidate pool shared by every pack build of one document.
+
+    generate_full_document builds a provisional pack, rebuilds it with the
+    outline's section titles and may top it up with page 2; each build used
+    to re-run every query. The session keeps what each (provider, query) has
+    returned so far as a contiguous prefix of the provider's ranking and
+    serves any page/limit window inside it, so later builds only fetch new
+    queries (section titles) and pages beyond the prefix. Dedup, scoring,
+    selection and key assignment still run per build over the same ordered
+    grid, so a build's output does not depend on what was reused.
+
+    ``prefetch_limit`` widens page-1 requests (e.g. to the preflight reserve
+    size) so the larger post-outline build can reuse the provisional one.
+    Only clean answers are pooled: errors, and empty answers from lenient
+    builds (where a provider swallows its errors), are fetched again.
+
+    ``features`` memoizes each pooled record's scoring features for the
+    session's lifetime, so later builds score reused records without
+    tokenizing them again. ``shared_text`` holds one copy of each abstract
+    and venue for every record the session's builds retrieve
+    (SOURCE_TEXT_STORE_MAX_ENTRIES at most).
+    """
+
+    def __init__(
+        self, prefetch_limit: int = 0, *, text_store_entries: int | None = None
+    ) -> None:
+        self.prefetch_limit = prefetch_limit
+        self.shared_text = SharedText(
+            settings.SOURCE_TEXT_STORE_MAX_ENTRIES
+            if text_store_entries is None
+            else text_store_entries
+        )
+        self.features: dict[_FeatureKey, SourceFeatures] = {}
+        self._pools: dict[tuple[str, str], _QueryPool] = {}
+        self._counters = {"fetched": 0, "reused": 0}
+
+    def lookup(
+        self, provider: str, query: str, limit: int, page: int
+    ) -> list[SourceDoc] | None:
+        pool = self._pools.get((provider, query))
+        if pool is None:
+            return None
+        start, stop = (page - 1) * limit, page * limit
+        if stop > len(pool.docs) and not pool.exhausted:
+            return None
+        self._counters["reused"] += 1
+        # Callers own their candidates (verification annotates them).
+        return copy.deepcopy(pool.docs[start:stop])
+
+    def fetch_limit(self, limit: int, page: int) -> int:
+        return max(limit, self.prefetch_limit) if page == 1 else limit
+
+    def store(
+        self,
+        provider: str,
+        query: str,
+        limit: int,
+        page: int,
+        docs: list[SourceDoc],
+    ) -> None:
+        self._counters["fetched"] += 1
+        pool = self._pools.setdefault((provider, query), _QueryPool())
+        start = (page - 1) * limit
+        if start > len(pool.docs):
+            return  # a gap: the pool only holds a contiguous prefix
+        pool.docs = pool.docs[:start] + copy.deepcopy(docs)
+        pool.exhausted = len(docs) < limit
+
+    def stats(self) -> dict[str, int]:
+        return dict(self._counters)
+
+
 class SourcePackBuilder:
     """Builds a topic-locked SourcePack from the free scholarly providers."""
 
-    def __init__(self, rag_retriever: RAGRetriever | None = None) -> None:
+    def __init__(
+        self,
+        rag_retriever: RAGRetriever | None = None,
+        max_concurrency: int | None = None,
+        provider_concurrency: int | None = None,
+        candidate_cache: PackCandidateCache | None = None,
+    ) -> None:
         self.rag = rag_retriever or RAGRetriever()
+        self.candidate_cache = candidate_cache or get_pack_candidate_cache()
+        self.max_concurrency = max(
+            1, max_concurrency or settings.SOURCE_PACK_RETRIEVAL_CONCURRENCY
+        )
+        self.provider_concurrency = max(
+            1, provider_concurrency or settings.SOURCE_PACK_PROVIDER_CONCURRENCY
+        )
 
     async def build(
         self,
@@ -409,6 +613,7 @@ class SourcePackBuilder:
         allow_threshold_relaxation: bool = True,
         retrieval_page: int = 1,
         raise_on_provider_error: bool = False,
+        session: RetrievalSession | None = None,
     ) -> SourcePack:
         """
         Retrieve, topic-score, filter, rank and key a source pack.
@@ -423,6 +628,16 @@ class SourcePackBuilder:
         against BOTH language versions). The builder never translates by
         itself — it stays pure (no LLM, no db) — callers pass the translation
         in; when alt_topic is None behavior is byte-identical to before.
+
+        session, when given, pools raw provider results across the builds of
+        one document so only queries/pages not seen before are fetched.
+
+        Candidates (after dedup and the citable / student-work filters) are
+        shared across documents through the pack candidate cache, keyed by
+        the normalized, ordered query list; scoring, selection and keys stay
+        per build.
+        Any build reads the cache, only error-free strict builds
+        (``raise_on_provider_error``) write it.
         """
         topic = (topic or "").strip()
         alt_topic = (alt_topic or "").strip()
@@ -457,56 +672,49 @@ class SourcePackBuilder:
                     merged.append(q)
             queries = merged
         per_query = max(10, target_size)
+        shared_text = (
+            session.shared_text
+            if session is not None
+            else SharedText(settings.SOURCE_TEXT_STORE_MAX_ENTRIES)
+        )
 
-        raw: list[SourceDoc] = []
+        cache_key: str | None = None
+        cached: list[SourceDoc] | None = None
         provider_errors: list[str] = []
-        for query in queries:
-            for provider in (self.rag.search_crossref, self.rag.search_openalex):
-                try:
-                    if retrieval_page == 1 and not raise_on_provider_error:
-                        raw.extend(await provider(query, limit=per_query))
-                    else:
-                        raw.extend(
-                            await provider(
-                                query,
-                                limit=per_query,
-                                page=retrieval_page,
-                                raise_on_error=raise_on_provider_error,
-                            )
-                        )
-                except Exception as e:  # provider hiccup must not kill the build
-                    provider_errors.append(
-                        f"{getattr(provider, '__name__', 'provider')}: {e}"
-                    )
-                    logger.warning(f"Source pack provider failed for '{query}': {e}")
-
-        deduped = self.rag._deduplicate_sources(raw)
-
-        # The pack is the citation universe for the whole document, and the
-        # citation formatter hard-requires author(s) + year (SourceDocument
-        # validates both in __post_init__): an uncitable source in the pack
-        # crashes section generation mid-run (doc-9 failure: an authorless
-        # Crossref row). Drop them here, before scoring.
-        citable = [src for src in deduped if src.authors and src.year]
-        if len(citable) < len(deduped):
-            logger.info(
-                f"Source pack dropped {len(deduped) - len(citable)} uncitable "
-                f"candidate(s) (missing author/year) for document {document_id}"
+        if self.candidate_cache is not None:
+            cache_key = pack_candidate_key(
+                queries,
+                language=language,
+                domain=domain,
+                per_query=per_query,
+                retrieval_page=retrieval_page,
             )
-        deduped = citable
-
-        # Apply suitability before the candidate-reserve cut. Otherwise a page
-        # full of high-ranked dissertations can consume every reserve slot and
-        # hide valid records retrieved on that same page.
-        eligible = [src for src in deduped if not is_blocked_automatic_source(src)]
-        if len(eligible) < len(deduped):
-            logger.info(
-                "Source pack dropped %s automatic student-work candidate(s) "
-                "before reserve selection for document %s",
-                len(deduped) - len(eligible),
-                document_id,
+            cached = await self.candidate_cache.get_candidates(cache_key)
+
+        if cached is not None:
+            for src in cached:
+                src.share_text(shared_text)
+            deduped = cached
+        else:
+            raw, provider_errors = await self._retrieve(
+                queries,
+                per_query=per_query,
+                retrieval_page=retrieval_page,
+                raise_on_provider_error=raise_on_provider_error,
+                session=session,
+                shared_text=shared_text,
             )
-        deduped = eligible
+            deduped = self._candidates(raw, document_id)
+            # Only strict builds are stored: lenient provider calls swallow
+            # HTTP failures and return [], so their candidates may be
+            # silently degraded (same rule as the retrieval session).
+            if (
+                self.candidate_cache is not None
+                and cache_key is not None
+                and raise_on_provider_error
+                and not provider_errors
+            ):
+                await self.candidate_cache.put_candidates(cache_key, deduped)
 
         # Bilingual scoring: max() of the two passes, so a good EN source is
         # not killed by comparison against Italian tokens (and max only ever
@@ -515,20 +723,16 @@ class SourcePackBuilder:
         # alt topic would inflate coverage via a small denominator — mitigated
         # by folding the alt section titles into alt_terms (mirrors
         # topic_terms).
-        scored: list[tuple[float, SourceDoc]] = [
-            (
-                max(
-                    self._on_topic_score(src, topic_terms, domain),
-                    (
-                        self._on_topic_score(src, alt_terms, domain)
-                        if alt_terms
-                        else 0.0
-                    ),
-                ),
-                src,
-            )
-            for src in deduped
-        ]
+        scored: list[tuple[float, SourceDoc]] = []
+        features_memo = session.features if session is not None else {}
+        for src in deduped:
+            features = source_features(src, features_memo)
+            score = self._on_topic_score(src, topic_terms, domain, features)
+            if alt_terms:
+                score = max(
+                    score, self._on_topic_score(src, alt_terms, domain, features)
+                )
+            scored.append((score, src))
 
         underfilled = False
         kept = [(s, src) for s, src in scored if s >= min_on_topic_score]
@@ -562,6 +766,7 @@ class SourcePackBuilder:
             underfilled=underfilled or len(packed) < target_size,
             bilingual=bool(alt_terms),
             provider_errors=provider_errors,
+            candidate_cache_keys=[cache_key] if cache_key is not None else [],
         )
         logger.info(
             f"Built source pack for document {document_id}: {len(packed)} sources "
@@ -572,6 +777,116 @@ class SourcePackBuilder:
 
     # ------------------------------------------------------------------ helpers
 
+    def _candidates(self, raw: list[SourceDoc], document_id: int) -> list[SourceDoc]:
+        """Deduplicated, citable, non-student-work candidates in grid order."""
+        deduped = self.rag._deduplicate_sources(raw)
+
+        # The pack is the citation universe for the whole document, and the
+        # citation formatter hard-requires author(s) + year (SourceDocument
+        # validates both in __post_init__): an uncitable source in the pack
+        # crashes section generation mid-run (doc-9 failure: an authorless
+        # Crossref row). Drop them here, before scoring.
+        citable = [src for src in deduped if src.authors and src.year]
+        if len(citable) < len(deduped):
+            logger.info(
+                f"Source pack dropped {len(deduped) - len(citable)} uncitable "
+                f"candidate(s) (missing author/year) for document {document_id}"
+            )
+        deduped = citable
+
+        # Apply suitability before the candidate-reserve cut. Otherwise a page
+        # full of high-ranked dissertations can consume every reserve slot and
+        # hide valid records retrieved on that same page.
+        eligible = [src for src in deduped if not is_blocked_automatic_source(src)]
+        if len(eligible) < len(deduped):
+            logger.info(
+                "Source pack dropped %s automatic student-work candidate(s) "
+                "before reserve selection for document %s",
+                len(deduped) - len(eligible),
+                document_id,
+            )
+        deduped = eligible
+
+        return deduped
+
+    async def _retrieve(
+        self,
+        queries: list[str],
+        *,
+        per_query: int,
+        retrieval_page: int,
+        raise_on_provider_error: bool,
+        session: RetrievalSession | None = None,
+        shared_text: SharedText | None = None,
+    ) -> tuple[list[SourceDoc], list[str]]:
+        """Fetch every (query, provider) cell concurrently, merged in grid order.
+
+        Results and provider errors come back in the same query-major order a
+        serial ``for query: for provider:`` loop produced, whatever order the
+        requests complete in, so dedup/ranking/keying stay deterministic.
+        Fresh records share their abstract and venue through ``shared_text``
+        before the session pools them.
+        """
+        providers = (
+            ("crossref", self.rag.search_crossref),
+            ("openalex", self.rag.search_openalex),
+        )
+        overall = asyncio.Semaphore(self.max_concurrency)
+        per_provider = {
+            name: asyncio.Semaphore(self.provider_concurrency) for name, _ in providers
+        }
+
+        async def fetch(
+            query: str, name: str, provider: Callable[..., Awaitable[list[SourceDoc]]]
+        ) -> tuple[list[SourceDoc], str | None]:
+            if session is not None:
+                pooled = session.lookup(name, query, per_query, retrieval_page)
+                if pooled is not None:
+                    return pooled, None
+            limit = (
+                session.fetch_limit(per_query, retrieval_page)
+                if session is not None
+                else per_query
+            )
+            async with per_provider[name], overall:
+                try:
+                    if retrieval_page == 1 and not raise_on_provider_error:
+                        docs = list(await provider(query, limit=limit))
+                    else:
+                        docs = list(
+                            await provider(
+                                query,
+                                limit=limit,
+                                page=retrieval_page,
+                                raise_on_error=raise_on_provider_error,
+                            )
+                        )
+                except Exception as e:  # provider hiccup must not kill the build
+                    logger.warning(f"Source pack provider failed for '{query}': {e}")
+                    return [], f"{getattr(provider, '__name__', 'provider')}: {e}"
+            if shared_text is not None:
+                for doc in docs:
+                    doc.share_text(shared_text)
+            if session is not None and (docs or raise_on_provider_error):
+                session.store(name, query, limit, retrieval_page, docs)
+            # A widened (prefetch) request is cut back to this build's window.
+            return (docs[:per_query] if limit > per_query else docs), None
+
+        cells = await asyncio.gather(
+            *(
+                fetch(query, name, provider)
+                for query in queries
+                for name, provider in providers
+            )
+        )
+        raw: list[SourceDoc] = []
+        provider_errors: list[str] = []
+        for docs, error in cells:
+            raw.extend(docs)
+            if error is not None:
+                provider_errors.append(error)
+        return raw, provider_errors
+
     # Language-appropriate anchor terms appended to the topic as extra queries
     # when a domain is detected — they pull domain-specific candidates that the
     # bare topic query misses (the doc-3 pack was an "Italian AI" grab-bag
@@ -618,32 +933,19 @@ class SourcePackBuilder:
 
     @staticmethod
     def _detect_domain(topic_terms: set[str]) -> str | None:
-        for domain, cfg in _DOMAIN_ANCHORS.items():
-            if any(
-                term == d or term.startswith(d) or d in term
-                for term in topic_terms
-                for d in cfg["detect"]
-            ):
+        """First domain with a detect marker inside any topic term."""
+        joined = "\x00".join(sorted(topic_terms))
+        for domain, pattern in _DETECT_PATTERNS.items():
+            if pattern.search(joined):
                 return domain
         return None
 
-    @staticmethod
-    def _term_hit(source_terms: set[str], markers: set[str]) -> bool:
-        """True if any (accent-folded) source term equals or starts with a marker.
-
-        Prefix-only (no substring) so stems like 'educativ' match 'educative'
-        without 'voto' matching inside unrelated words.
-        """
-        for term in source_terms:
-            folded = ascii_fold(term)
-            for marker in markers:
-                if folded == marker or folded.startswith(marker):
-                    return True
-        return False
-
     @staticmethod
     def _on_topic_score(
-        src: SourceDoc, topic_terms: set[str], domain: str | None
+        src: SourceDoc,
+        topic_terms: set[str],
+        domain: str | None,
+        features: SourceFeatures | None = None,
     ) -> float:
         """Local topic-relevance score in [0,1] (no LLM / external call).
 
@@ -652,32 +954,34 @@ class SourcePackBuilder:
         raw token overlap. This is what stops "any Italian AI paper" (e-voting,
         healthcare, psychotherapy) from riding in on the shared
         intelligenza/artificiale/impatto tokens — the doc-3 failure mode.
+
+        Markers match accent-folded source terms by prefix only (no
+        substring), so stems like 'educativ' match 'educative' without 'voto'
+        matching inside unrelated words.
         """
         if not topic_terms:
             return 0.0
 
-        source_terms = content_tokens(src.title) | content_tokens(src.abstract)
-        if not source_terms:
+        features = features or source_features(src)
+        if not features.terms:
             return 0.0
 
-        if domain is not None:
-            cfg = _DOMAIN_ANCHORS[domain]
-            # Venue counts toward the gate (an education/formazione journal is
-            # legitimate domain signal even when the abstract is missing) but
-            # NOT toward coverage, so it can't inflate the score.
-            gate_terms = source_terms | content_tokens(src.venue)
-            if not SourcePackBuilder._term_hit(gate_terms, cfg["anchor"]):
-                # Hard gate: a domain topic requires domain vocabulary.
-                return 0.0
+        # Venue counts toward the gate (an education/formazione journal is
+        # legitimate domain signal even when the abstract is missing) but NOT
+        # toward coverage, so it can't inflate the score.
+        if domain is not None and not _ANCHOR_INDEX[domain].hit(
+            features.folded_gate_terms
+        ):
+            # Hard gate: a domain topic requires domain vocabulary.
+            return 0.0
 
         # Topic coverage: fraction of topic terms present in the source.
-        coverage = len(topic_terms & source_terms) / len(topic_terms)
+        coverage = len(topic_terms & features.terms) / len(topic_terms)
         score = coverage
 
         if domain is not None:
-            cfg = _DOMAIN_ANCHORS[domain]
             score += 0.15  # anchored (passed the gate above)
-            if SourcePackBuilder._term_hit(source_terms, cfg["off_topic"]):
+            if _OFF_TOPIC_INDEX[domain].hit(features.folded_terms):
                 # Anchored but tainted (e.g. "formazione aziendale").
                 score -= 0.4
 
@@ -5,8 +5,15 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
+from app.services.ai_pipeline.pack_candidate_cache import (
+    PackCandidateCache,
+    get_pack_candidate_cache,
+)
 from app.services.ai_pipeline.rag_retriever import SourceDoc
-from app.services.ai_pipeline.source_identity import sources_equivalent
+from app.services.ai_pipeline.source_identity import (
+    canonical_identity_digest,
+    sources_equivalent,
+)
 from app.services.ai_pipeline.source_pack import (
     PackedSource,
     SourcePack,
@@ -17,6 +24,7 @@ from app.services.citation_verifier import (
     FUZZY_MATCH_THRESHOLD,
     CitationVerifier,
     SourceInput,
+    VerificationResult,
     VerificationStatus,
 )
 
@@ -214,8 +222,14 @@ async def preverify_source_pack(
     *,
     target_size: int,
     minimum_verified: int,
+    candidate_cache: PackCandidateCache | None = None,
 ) -> SourcePreflightOutcome:
-    """Return the final verified pack; never let an unsuitable source through."""
+    """Return the final verified pack; never let an unsuitable source through.
+
+    Candidates that came from the cross-document candidate cache reuse a
+    VERIFIED result another document's preflight recorded for the identical
+    record; everything else goes through ``verifier`` as before.
+    """
     accepted: list[tuple[float, SourceDoc, str, bool]] = []
     external: list[PackedSource] = []
     rejected: list[SourceRejection] = []
@@ -243,24 +257,48 @@ async def preverify_source_pack(
             continue
         external.append(packed)
 
-    results = await verifier.verify_sources(
+    cache_keys = list(pack.candidate_cache_keys)
+    if cache_keys and candidate_cache is None:
+        candidate_cache = get_pack_candidate_cache()
+    recorded = (
+        await candidate_cache.get_verified(cache_keys)
+        if candidate_cache is not None and cache_keys
+        else {}
+    )
+    identities = [canonical_identity_digest(packed.source) for packed in external]
+    results: list[VerificationResult | None] = [
+        (
+            VerificationResult.from_dict(recorded[identity])
+            if identity in recorded
+            else None
+        )
+        for identity in identities
+    ]
+    pending = [i for i, result in enumerate(results) if result is None]
+    verified = await verifier.verify_sources(
         [
             SourceInput(
-                title=packed.source.title,
-                authors=list(packed.source.authors or []),
-                year=packed.source.year,
-                doi=packed.source.doi,
+                title=external[i].source.title,
+                authors=list(external[i].source.authors or []),
+                year=external[i].source.year,
+                doi=external[i].source.doi,
             )
-            for packed in external
+            for i in pending
         ]
     )
+    for i, fresh in zip(pending, verified, strict=True):
+        results[i] = fresh
+    resolved = [result for result in results if result is not None]
 
     transient_count = 0
-    for packed, result in zip(external, results, strict=True):
+    newly_verified: dict[str, dict[str, Any]] = {}
+    for index, (packed, result) in enumerate(zip(external, resolved, strict=True)):
         source = packed.source
         if result.status == VerificationStatus.VERIFIED and (
             result.match_score is None or result.match_score >= FUZZY_MATCH_THRESHOLD
         ):
+            if identities[index] not in recorded:
+                newly_verified[identities[index]] = result.to_dict()
             accepted.append(
                 (
                     packed.on_topic_score,
@@ -279,6 +317,10 @@ async def preverify_source_pack(
             reason = "not_found"
         rejected.append(SourceRejection(source.title, reason))
 
+    if candidate_cache is not None and cache_keys:
+        candidate_cache.note_verified_reused(len(external) - len(pending))
+        await candidate_cache.record_verified(cache_keys, newly_verified)
+
     deduped = _deduplicate_verified(accepted)
     final_pack = _assign_final_keys(
         pack.document_id,
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from collections import OrderedDict
 
 # Multilingual stop words (EN + IT — the two languages that dominate current
 # generation). Kept deliberately small: only high-frequency function words that
@@ -118,6 +119,39 @@ STOP_WORDS: frozenset[str] = frozenset(
 )
 
 
+class SharedText:
+    """Bounded, value-keyed store of free text (abstracts, venues).
+
+    Provider responses, cache hits and pooled copies re-materialize the same
+    abstract for every query, page and provider that returns the paper.
+    ``share`` returns the first object stored for an equal value, so those
+    copies collapse to one. Unlike sys.intern the store is owned (by a
+    retrieval session or a verifier) and keeps at most ``max_entries``
+    values, evicting the least recently shared; 0 disables sharing.
+    """
+
+    __slots__ = ("max_entries", "_values")
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._values: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def share(self, value: str | None) -> str | None:
+        if not value or self.max_entries <= 0:
+            return value
+        stored = self._values.get(value)
+        if stored is not None:
+            self._values.move_to_end(value)
+            return stored
+        self._values[value] = value
+        if len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+        return value
+
+
 def ascii_fold(text: str) -> str:
     """Fold accented characters to ASCII (e.g. 'Pérez' -> 'Perez')."""
     if not text:
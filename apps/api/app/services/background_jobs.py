@@ -11,6 +11,7 @@ import uuid
 from collections.abc import Callable
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any, TypeVar
 
 import redis.asyncio as aioredis
@@ -44,12 +45,13 @@ from app.services.ai_pipeline.generator import SectionGenerator
 from app.services.ai_pipeline.humanizer import Humanizer
 from app.services.ai_pipeline.rag_retriever import SourceDoc
 from app.services.ai_pipeline.source_identity import sources_equivalent
-from app.services.ai_pipeline.source_pack import SourcePackBuilder
+from app.services.ai_pipeline.source_pack import RetrievalSession, SourcePackBuilder
 from app.services.ai_pipeline.source_pack_preflight import (
     invalid_preverified_source_keys,
     preverify_source_pack,
 )
 from app.services.ai_service import AIService
+from app.services.blocking_executor import run_blocking
 from app.services.citation_verifier import (
     CitationVerifier,
 )
@@ -89,6 +91,7 @@ from app.services.generation_worker import (
 )
 from app.services.grammar_checker import GrammarChecker
 from app.services.grounding_gate import GroundingResult, evaluate_grounding
+from app.services.parsing_service import get_parsing_service
 from app.services.plagiarism_checker import PlagiarismChecker
 from app.services.provenance_service import record_event as _raw_record_provenance
 from app.services.quality_validator import QualityValidator
@@ -212,8 +215,12 @@ async def _export_document_with_fence(
             artifact_format="docx",
             storage_path=uploaded_path,
             artifact_sha256=str(export_result["artifact_sha256"]),
+            export_key=export_result.get("export_key"),
         )
     except BaseException:
+        if export_result.get("reused"):
+            # Nothing was uploaded: the object is the one already bound.
+            raise
         try:
             if not await storage.delete_file(uploaded_path):
                 raise RuntimeError("storage did not confirm deletion")
@@ -916,6 +923,10 @@ def _merge_source_packs(uploaded_pack, api_pack, *, limit: int | None = None):
             *list(getattr(uploaded_pack, "provider_errors", []) or []),
             *list(getattr(api_pack, "provider_errors", []) or []),
         ],
+        candidate_cache_keys=[
+            *list(getattr(uploaded_pack, "candidate_cache_keys", []) or []),
+            *list(getattr(api_pack, "candidate_cache_keys", []) or []),
+        ],
     )
     pack.passages = uploaded_pack.passages
     return pack
@@ -931,6 +942,7 @@ async def _build_source_pack(
     allow_threshold_relaxation: bool = True,
     retrieval_page: int = 1,
     raise_on_provider_error: bool = False,
+    retrieval_session: RetrievalSession | None = None,
 ) -> Any:
     """
     Thin wrapper around SourcePackBuilder.build for the upfront source pack.
@@ -946,6 +958,9 @@ async def _build_source_pack(
     is queried and scored in both languages (translation failure degrades to
     the monolingual build). Translation lives HERE, not in the builder, so the
     builder stays pure/deterministic and the LLM spend lands in job usage.
+
+    retrieval_session pools raw provider results across the builds of one
+    generation run (provisional, post-outline, top-up).
     """
     alt_topic: str | None = None
     alt_titles: list[str] | None = None
@@ -970,6 +985,7 @@ async def _build_source_pack(
         allow_threshold_relaxation=allow_threshold_relaxation,
         retrieval_page=retrieval_page,
         raise_on_provider_error=raise_on_provider_error,
+        session=retrieval_session,
     )
 
 
@@ -1323,6 +1339,15 @@ class BackgroundJobService:
                 source_pack = None
                 source_pack_reused = False
                 uploaded_pack = None
+                # One raw candidate pool for every pack build of this run; the
+                # provisional build fetches page 1 wide enough for the reserve.
+                retrieval_session = RetrievalSession(
+                    prefetch_limit=(
+                        max(10, settings.SOURCE_PACK_CANDIDATE_RESERVE_SIZE)
+                        if settings.SOURCE_PACK_PREFLIGHT_ENABLED
+                        else 0
+                    )
+                )
                 if settings.SOURCE_GROUNDING_ENABLED:
                     source_blockers, source_warnings = await uploaded_sources_blockers(
                         db, document_id
@@ -1406,6 +1431,7 @@ class BackgroundJobService:
                                     db,
                                     document,
                                     ai_service=AIService(db, usage_tracker=usage),
+                                    retrieval_session=retrieval_session,
                                 )
                                 source_pack = _merge_source_packs(
                                     uploaded_pack, api_pack
@@ -1419,6 +1445,7 @@ class BackgroundJobService:
                                 db,
                                 document,
                                 ai_service=AIService(db, usage_tracker=usage),
+                                retrieval_session=retrieval_session,
                             )
                         if source_pack is not None:
                             await fence_next_mutation(db)
@@ -1586,6 +1613,7 @@ class BackgroundJobService:
                             document,
                             section_titles=titles,
                             ai_service=AIService(db, usage_tracker=usage),
+                            retrieval_session=retrieval_session,
                             target_size=settings.SOURCE_PACK_CANDIDATE_RESERVE_SIZE,
                             allow_threshold_relaxation=False,
                             retrieval_page=1,
@@ -1615,6 +1643,7 @@ class BackgroundJobService:
                                 document,
                                 section_titles=titles,
                                 ai_service=AIService(db, usage_tracker=usage),
+                                retrieval_session=retrieval_session,
                                 target_size=(
                                     settings.SOURCE_PACK_CANDIDATE_RESERVE_SIZE
                                 ),
@@ -1707,6 +1736,7 @@ class BackgroundJobService:
                         document,
                         section_titles=titles,
                         ai_service=AIService(db, usage_tracker=usage),
+                        retrieval_session=retrieval_session,
                     )
                     await fence_next_mutation(db)
                     await _persist_source_pack(db, document_id, source_pack)
@@ -3681,21 +3711,9 @@ class BackgroundJobService:
     async def _extract_pdf_text(file_path: str) -> str:
         """Extract text from PDF file"""
         try:
-            import PyPDF2
-
-            text = ""
-            with open(file_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-
-            return text.strip()
-
-        except ImportError as e:
-            logger.error("PyPDF2 not installed. Install it with: pip install PyPDF2")
-            raise ValueError(
-                "PDF extraction not available: PyPDF2 not installed"
-            ) from e
+            # Workers open the file themselves: no bytes cross the pool.
+            pages = await get_parsing_service().pdf_pages(file_path)
+            return "\n".join(pages).strip()
         except Exception as e:
             logger.error(f"Error extracting PDF text: {e}")
             raise ValueError(f"Failed to extract text from PDF: {str(e)}") from e
@@ -3704,20 +3722,9 @@ class BackgroundJobService:
     async def _extract_docx_text(file_path: str) -> str:
         """Extract text from DOCX file"""
         try:
-            from docx import Document as DocxDocument
-
-            doc = DocxDocument(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-
-            return text.strip()
-
-        except ImportError as e:
-            logger.error(
-                "python-docx not installed. Install it with: pip install python-docx"
-            )
-            raise ValueError(
-                "DOCX extraction not available: python-docx not installed"
-            ) from e
+            data = await run_blocking("file.read", Path(file_path).read_bytes)
+            paragraphs = await get_parsing_service().docx_paragraphs(data)
+            return "\n".join(paragraphs).strip()
         except Exception as e:
             logger.error(f"Error extracting DOCX text: {e}")
             raise ValueError(f"Failed to extract text from DOCX: {str(e)}") from e
@@ -0,0 +1,358 @@
+"""
+Local bibliographic index: known-real works answered before external APIs.
+
+The Redis verification cache is keyed by the exact query tuple, so a
+slightly different title or author list re-ran the whole Crossref ->
+OpenAlex -> Semantic Scholar -> arXiv cascade for a work the platform had
+already verified. This index keeps the canonical record of every VERIFIED
+lookup and of every API-sourced DocumentSource in the bibliographic_works
+table; CitationVerifier asks it first and applies its own matching rules
+(_identifier_score / _match_candidate) to what comes back, so a local answer
+is exactly as strict as a provider answer.
+
+Only provider-returned metadata is indexed: unverified LLM citations, web
+search hits and uploaded files never become evidence that a work exists.
+
+Lookups use the DOI / arXiv id indexes and, for titles, the exact normalized
+title plus its 16-character head and tail (a >= 0.90 fuzzy match almost
+always preserves one end). A title that differs at both ends simply misses
+here and goes to the providers as before. Common heads ("the impact of
+artificial intelligence on ...") match many rows, so candidates are ranked
+before the limit: exact title, then both ends matching, then closest
+length (a >= 0.90 match has a near-equal length), newest first.
+
+Never raises into callers: a database problem degrades to "not indexed".
+"""
+
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import database
+from app.core.config import settings
+from app.models.document import BibliographicWork
+from app.services.citation_verifier import (
+    PROVIDERS,
+    VerificationResult,
+    VerificationStatus,
+    normalize_arxiv_id,
+    normalize_doi,
+    normalize_title,
+)
+
+logger = logging.getLogger(__name__)
+
+TITLE_KEY_LENGTH = 16
+
+
+@dataclass
+class IndexLookup:
+    """Indexed candidates for one source, as candidate dicts (see _to_candidate)."""
+
+    by_doi: dict | None = None
+    by_arxiv: dict | None = None
+    by_title: list[dict] = field(default_factory=list)
+
+
+def _title_keys(norm_title: str) -> tuple[str, str]:
+    return norm_title[:TITLE_KEY_LENGTH], norm_title[-TITLE_KEY_LENGTH:]
+
+
+def _strip_arxiv_version(arxiv_id: str | None) -> str | None:
+    normalized = normalize_arxiv_id(arxiv_id)
+    if not normalized:
+        return None
+    head, _, version = normalized.rpartition("v")
+    return head if head and version.isdigit() else normalized
+
+
+def _field(source: Mapping[str, Any] | object, name: str) -> Any:
+    if isinstance(source, Mapping):
+        return source.get(name)
+    return getattr(source, name, None)
+
+
+def work_from_result(
+    result: VerificationResult, arxiv_id: str | None = None
+) -> dict | None:
+    """Index entry for a VERIFIED result (its canonical record); None otherwise.
+
+    ``arxiv_id`` is only passed for arXiv identifier hits — a title-search hit
+    does not prove the asserted id belongs to the work.
+    """
+    if result.status != VerificationStatus.VERIFIED or not result.title:
+        return None
+    if result.provider not in PROVIDERS:
+        return None
+    return {
+        "title": result.title,
+        "authors": list(result.authors),
+        "year": result.year,
+        "venue": result.venue,
+        "abstract": result.abstract,
+        "doi": result.doi,
+        "arxiv_id": arxiv_id,
+        "provider": result.provider,
+    }
+
+
+def work_from_source(source: Mapping[str, Any] | object) -> dict | None:
+    """Index entry for a DocumentSource / SourceDoc / cited-source dict.
+
+    Verified rows contribute their canonical_metadata; unverified rows only
+    when a bibliographic provider returned them (retrieval metadata is a real
+    record). Anything else — LLM-cited, web-search or uploaded — is skipped.
+    """
+    canonical = _field(source, "canonical_metadata")
+    if (
+        _field(source, "verification_status") == "verified"
+        and isinstance(canonical, Mapping)
+        and canonical.get("status") == VerificationStatus.VERIFIED.value
+        and canonical.get("provider") in PROVIDERS
+        and canonical.get("title")
+    ):
+        return {
+            "title": canonical.get("title"),
+            "authors": list(canonical.get("authors") or []),
+            "year": canonical.get("year"),
+            "venue": canonical.get("venue"),
+            "abstract": canonical.get("abstract"),
+            "doi": canonical.get("doi"),
+            "arxiv_id": None,
+            "provider": canonical.get("provider"),
+        }
+    provider = _field(source, "retrieval_provider") or _field(source, "provider")
+    title = (_field(source, "title") or "").strip()
+    if provider not in PROVIDERS or not title:
+        return None
+    return {
+        "title": title,
+        "authors": list(_field(source, "authors") or []),
+        "year": _field(source, "year"),
+        "venue": _field(source, "venue"),
+        "abstract": _field(source, "abstract"),
+        "doi": _field(source, "doi"),
+        "arxiv_id": None,
+        "provider": provider,
+    }
+
+
+class BibliographicIndex:
+    """Read/write access to bibliographic_works (own short sessions)."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        max_candidates: int | None = None,
+    ):
+        self._session_factory = session_factory
+        self.max_candidates = (
+            max_candidates
+            if max_candidates is not None
+            else settings.BIBLIOGRAPHIC_INDEX_MAX_CANDIDATES
+        )
+        self._warned = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def lookup(
+        self,
+        norm_doi: str | None,
+        norm_arxiv: str | None,
+        norm_title: str,
+    ) -> IndexLookup:
+        """Identifier hits plus title candidates; empty lookup on any error."""
+        found = IndexLookup()
+        arxiv_id = _strip_arxiv_version(norm_arxiv)
+        try:
+            async with self._session() as db:
+                identifiers = []
+                if norm_doi:
+                    identifiers.append(BibliographicWork.doi == norm_doi)
+                if arxiv_id:
+                    identifiers.append(BibliographicWork.arxiv_id == arxiv_id)
+                if identifiers:
+                    rows = (
+                        await db.execute(
+                            select(BibliographicWork).where(or_(*identifiers))
+                        )
+                    ).scalars()
+                    for row in rows:
+                        if norm_doi and row.doi == norm_doi:
+                            found.by_doi = self._to_candidate(row)
+                        if arxiv_id and row.arxiv_id == arxiv_id:
+                            found.by_arxiv = self._to_candidate(row)
+                if norm_title:
+                    prefix, suffix = _title_keys(norm_title)
+                    rows = (
+                        await db.execute(
+                            select(BibliographicWork)
+                            .where(
+                                or_(
+                                    BibliographicWork.normalized_title == norm_title,
+                                    BibliographicWork.title_prefix == prefix,
+                                    BibliographicWork.title_suffix == suffix,
+                                )
+                            )
+                            .order_by(
+                                # Exact title first: the limit never drops it
+                                case(
+                                    (
+                                        BibliographicWork.normalized_title
+                                        == norm_title,
+                                        0,
+                                    ),
+                                    (
+                                        and_(
+                                            BibliographicWork.title_prefix == prefix,
+                                            BibliographicWork.title_suffix == suffix,
+                                        ),
+                                        1,
+                                    ),
+                                    else_=2,
+                                ),
+                                func.abs(
+                                    func.length(BibliographicWork.normalized_title)
+                                    - len(norm_title)
+                                ),
+                                BibliographicWork.id.desc(),
+                            )
+                            .limit(self.max_candidates)
+                        )
+                    ).scalars()
+                    found.by_title = [self._to_candidate(row) for row in rows]
+        except Exception as e:
+            self._warn(f"Bibliographic index lookup failed: {e}")
+            return IndexLookup()
+        return found
+
+    async def record(self, works: Iterable[dict | None]) -> int:
+        """Upsert index entries (see work_from_*); returns rows written."""
+        entries = [w for w in works if w and normalize_title(w.get("title"))]
+        if not entries:
+            return 0
+        written = 0
+        try:
+            async with self._session() as db:
+                for work in entries:
+                    try:
+                        async with db.begin_nested():
+                            await self._upsert(db, work)
+                        written += 1
+                    except IntegrityError:
+                        # A concurrent job indexed the same DOI first: its
+                        # row wins, the rest of the batch still lands.
+                        logger.debug(
+                            "Bibliographic index upsert raced; keeping existing row"
+                        )
+                await db.commit()
+        except Exception as e:
+            self._warn(f"Bibliographic index write failed: {e}")
+            return 0
+        return written
+
+    async def record_result(
+        self, result: VerificationResult, arxiv_id: str | None = None
+    ) -> int:
+        """Index the canonical record of a VERIFIED result (no-op otherwise)."""
+        return await self.record([work_from_result(result, arxiv_id)])
+
+    async def record_sources(
+        self, sources: Iterable[Mapping[str, Any] | object]
+    ) -> int:
+        """Index the provider-backed members of persisted/retrieved sources."""
+        return await self.record(work_from_source(s) for s in sources)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _session(self) -> AsyncSession:
+        factory = self._session_factory or database.AsyncSessionLocal
+        return factory()
+
+    async def _upsert(self, db: AsyncSession, work: dict) -> None:
+        norm_title = normalize_title(work.get("title"))
+        doi = normalize_doi(work.get("doi"))
+        arxiv_id = _strip_arxiv_version(work.get("arxiv_id"))
+        year = work.get("year")
+
+        if doi:
+            match = BibliographicWork.doi == doi
+        elif arxiv_id:
+            match = BibliographicWork.arxiv_id == arxiv_id
+        else:
+            match = (BibliographicWork.normalized_title == norm_title) & (
+                BibliographicWork.year.is_(None)
+                if year is None
+                else BibliographicWork.year == year
+            )
+        row = (
+            await db.execute(select(BibliographicWork).where(match).limit(1))
+        ).scalar_one_or_none()
+        if row is None:
+            row = BibliographicWork()
+            db.add(row)
+
+        prefix, suffix = _title_keys(norm_title)
+        row.normalized_title = norm_title[:1000]  # type: ignore[assignment]
+        row.title_prefix = prefix  # type: ignore[assignment]
+        row.title_suffix = suffix  # type: ignore[assignment]
+        row.title = str(work["title"])[:1000]  # type: ignore[assignment]
+        row.authors = list(work.get("authors") or [])  # type: ignore[assignment]
+        row.year = year  # type: ignore[assignment]
+        row.venue = (work.get("venue") or "")[:500] or None  # type: ignore[assignment]
+        row.abstract = work.get("abstract") or row.abstract
+        row.doi = doi or row.doi  # type: ignore[assignment]
+        row.arxiv_id = arxiv_id or row.arxiv_id  # type: ignore[assignment]
+        row.provider = work.get("provider") or row.provider
+        await db.flush()
+
+    @staticmethod
+    def _to_candidate(row: BibliographicWork) -> dict:
+        """Same shape as the provider parsers' candidate dicts."""
+        return {
+            "title": row.title,
+            "year": row.year,
+            "authors": list(row.authors or []),
+            "venue": row.venue,
+            "doi": row.doi,
+            "abstract": row.abstract,
+            "provider": row.provider,
+        }
+
+    def _warn(self, message: str) -> None:
+        if self._warned:
+            logger.debug(message)
+        else:
+            logger.warning(message)
+            self._warned = True
+
+
+_shared_index: BibliographicIndex | None = None
+
+
+def get_bibliographic_index() -> BibliographicIndex | None:
+    """Process-wide index, or None when BIBLIOGRAPHIC_INDEX_ENABLED is off."""
+    global _shared_index
+    if not settings.BIBLIOGRAPHIC_INDEX_ENABLED:
+        return None
+    if _shared_index is None:
+        _shared_index = BibliographicIndex()
+    return _shared_index
+
+
+__all__ = [
+    "BibliographicIndex",
+    "IndexLookup",
+    "get_bibliographic_index",
+    "work_from_result",
+    "work_from_source",
+]
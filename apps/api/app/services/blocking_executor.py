@@ -0,0 +1,192 @@
+"""
+Dedicated, bounded thread pool for blocking SDK calls.
+
+Several hot paths called synchronous libraries straight from coroutines:
+the Tavily SDK (an HTTP round trip of several seconds), the MinIO client
+(every upload, download, stat and delete), pypdf / python-docx parsing and
+ReportLab / python-docx rendering on export. Each call froze the event
+loop for its full duration, stalling every other request, WebSocket
+heartbeat and generation job in the process.
+
+``run_blocking(label, fn, *args)`` runs ``fn`` on a process-wide
+ThreadPoolExecutor of BLOCKING_EXECUTOR_MAX_WORKERS threads and awaits the
+result. The pool is separate from the loop's default executor so a burst of
+slow uploads queues here instead of starving ``asyncio.to_thread`` users
+(the retrieval disk cache). Per-label counters - calls, errors, total and
+max run time, time spent queued for a worker - plus the current queue
+depth are exposed through ``stats()``.
+
+The executor is not tied to an event loop, so it is safe to share across
+loops (tests, worker threads). Exceptions from ``fn`` propagate unchanged;
+cancelling the awaiting coroutine does not interrupt a call that already
+started.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Calls that hold a worker longer than this are logged: they are the ones
+# worth moving to a process pool or an async client.
+SLOW_CALL_SECONDS = 5.0
+
+
+@dataclass
+class OffloadTiming:
+    """Counters for one call label."""
+
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 4),
+            "max_seconds": round(self.max_seconds, 4),
+            "wait_seconds": round(self.wait_seconds, 4),
+            "max_wait_seconds": round(self.max_wait_seconds, 4),
+        }
+
+
+class BlockingExecutor:
+    """Bounded thread pool with per-label timing."""
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max(1, max_workers or settings.BLOCKING_EXECUTOR_MAX_WORKERS)
+        self._executor: ThreadPoolExecutor | None = None
+        # Counters are updated from worker threads and read from the loop.
+        self._lock = threading.Lock()
+        self._timings: dict[str, OffloadTiming] = {}
+        self._queued = 0
+        self._running = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="blocking-io",
+                )
+            return self._executor
+
+    async def run(
+        self, label: str, fn: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        submitted = time.monotonic()
+        with self._lock:
+            self._queued += 1
+
+        def call() -> T:
+            started = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            failed = False
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                self._record(label, submitted, started, time.monotonic(), failed)
+
+        future = self._pool().submit(call)
+        # A caller cancelled before a worker picked the call up cancels it
+        # outright; it must still leave the queue count.
+        future.add_done_callback(self._forget_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _forget_if_cancelled(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _record(
+        self,
+        label: str,
+        submitted: float,
+        started: float,
+        finished: float,
+        failed: bool,
+    ) -> None:
+        elapsed = finished - started
+        waited = started - submitted
+        with self._lock:
+            self._running -= 1
+            timing = self._timings.setdefault(label, OffloadTiming())
+            timing.calls += 1
+            timing.errors += int(failed)
+            timing.seconds += elapsed
+            timing.max_seconds = max(timing.max_seconds, elapsed)
+            timing.wait_seconds += waited
+            timing.max_wait_seconds = max(timing.max_wait_seconds, waited)
+        if elapsed >= SLOW_CALL_SECONDS:
+            logger.info(f"Blocking call {label} held a worker for {elapsed:.1f}s")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "calls": {
+                    label: timing.to_dict()
+                    for label, timing in sorted(self._timings.items())
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_blocking_executor: BlockingExecutor | None = None
+
+
+def get_blocking_executor() -> BlockingExecutor:
+    """Process-wide executor shared by every blocking SDK call."""
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = BlockingExecutor()
+    return _blocking_executor
+
+
+async def run_blocking(
+    label: str, fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Shorthand for ``get_blocking_executor().run(...)``."""
+    return await get_blocking_executor().run(label, fn, *args, **kwargs)
+
+
+def shutdown_blocking_executor() -> None:
+    """Join the pool's threads (application shutdown)."""
+    if _blocking_executor is not None:
+        _blocking_executor.shutdown()
+
+
+__all__ = [
+    "BlockingExecutor",
+    "OffloadTiming",
+    "get_blocking_executor",
+    "run_blocking",
+    "shutdown_blocking_executor",
+]
@@ -22,6 +22,23 @@ be retried) and raises after exhaustion, while this service must never
 raise. CircuitBreaker holds its lock across the awaited call, serializing
 requests beyond what the per-provider rate limits require.
 
+verify_sources first resolves every DOI of the batch with a few multi-ID
+requests (Crossref filter=doi:a,doi:b; OpenAlex filter=doi:a|b for the rest)
+and feeds the hits through the per-source DOI rule, so only DOIs neither
+provider knows reach the per-source cascade.
+
+Identifier-less titles that a fully clean cascade proved absent are kept in
+a Redis Bloom filter (negative_title_filter.py); repeats of such invented
+titles return NOT_FOUND (reason "negative_filter") without any API call.
+
+Before the cascade, verify_source consults the local bibliographic index
+(bibliographic_index.py) with the same matching rules; verified canonical
+records are written back so repeat topics resolve without the network.
+
+Per-provider rate limits are deployment-wide: calls are scheduled through
+the shared ProviderRateLimiter (provider_rate_limiter.py), which RAGRetriever
+uses too, and a 429 backs off every caller of that provider.
+
 Concurrency contract: create one CitationVerifier instance per event loop
 (asyncio primitives and the lazily created Redis client bind to the loop
 they are first used on).
@@ -37,18 +54,31 @@ import html
 import json
 import logging
 import re
-import time
+import sys
 import unicodedata
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass, field
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from difflib import SequenceMatcher
 from enum import Enum
+from typing import TYPE_CHECKING
 
 import httpx
 import redis.asyncio as aioredis
 
 from app.core.config import settings
+from app.middleware.rate_limit import get_redis_client
+from app.services.ai_pipeline.text_utils import SharedText
+from app.services.negative_title_filter import NegativeTitleFilter
+from app.services.provider_rate_limiter import (
+    ProviderRateLimiter,
+    get_provider_rate_limiter,
+    retry_after_seconds,
+)
+
+if TYPE_CHECKING:
+    from app.services.bibliographic_index import BibliographicIndex
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +91,10 @@ MAX_ABSTRACT_LENGTH = 2000  # cap stored in cache + canonical_metadata
 RETRYABLE_STATUS = {429, 500, 502, 503, 504}
 DEFAULT_RETRY_DELAYS = [1.0, 2.0, 4.0]
 USER_AGENT = "Thesica-CitationVerifier/1.0"
+# Batch DOI pre-phase: DOIs per multi-ID request (OpenAlex ORs at most 50
+# filter values) and the smallest batch worth a shared request.
+DOI_BATCH_SIZE = 40
+DOI_BATCH_MIN = 2
 
 PROVIDER_CROSSREF = "crossref"
 PROVIDER_OPENALEX = "openalex"
@@ -104,7 +138,7 @@ class SourceInput:
     arxiv_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """Outcome of verifying one source. Canonical metadata set when VERIFIED."""
 
@@ -118,8 +152,18 @@ class VerificationResult:
     provider: str | None = None  # crossref, openalex, semantic_scholar, arxiv
     match_score: float | None = None  # 1.0 exact/identifier; ratio for fuzzy
     from_cache: bool = False
+    from_index: bool = False  # answered by the local bibliographic index
     reason: str | None = None  # insufficient_metadata, provider_errors, ...
 
+    def __post_init__(self) -> None:
+        # Cache hits and every pack build materialize the same identifiers
+        # and labels again; share one object per distinct value. Abstracts
+        # and venues go through the verifier's SharedText store instead.
+        for name in ("doi", "provider", "reason"):
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+
     def to_dict(self) -> dict:
         return {
             "status": self.status.value,
@@ -243,27 +287,6 @@ def _reconstruct_inverted_index(inverted) -> str | None:
     return " ".join(word for _, word in positions)
 
 
-class _MinIntervalLimiter:
-    """Spaces call starts at least 1/rps apart (FIFO via the lock).
-
-    Sleeping while holding the lock is intentional: waiters queue up and
-    each call start is spaced; the HTTP request itself runs outside.
-    """
-
-    def __init__(self, rps: float):
-        self._interval = 1.0 / rps if rps > 0 else 0.0
-        self._lock = asyncio.Lock()
-        self._next_allowed = 0.0
-
-    async def acquire(self) -> None:
-        async with self._lock:
-            now = time.monotonic()
-            if self._next_allowed > now:
-                await asyncio.sleep(self._next_allowed - now)
-                now = time.monotonic()
-            self._next_allowed = max(now, self._next_allowed) + self._interval
-
-
 @dataclass
 class _ProviderOutcome:
     """matched: candidate passed matching rules; errored: transport/5xx
@@ -271,6 +294,9 @@ class _ProviderOutcome:
 
     matched: VerificationResult | None = None
     errored: bool = False
+    # Some candidate had a similar title (then vetoed by year/authors): the
+    # title exists, so a no-match must not feed the negative filter.
+    title_seen: bool = False
 
 
 class CitationVerifier:
@@ -286,6 +312,9 @@ class CitationVerifier:
         rate_limits_rps: dict[str, float] | None = None,
         cache_enabled: bool = True,
         cache_ttl_seconds: int = CACHE_TTL_SECONDS,
+        rate_limiter: ProviderRateLimiter | None = None,
+        bibliographic_index: "BibliographicIndex | None" = None,
+        negative_filter_enabled: bool | None = None,
     ):
         self.timeout_seconds = (
             timeout_seconds
@@ -305,23 +334,36 @@ class CitationVerifier:
             if max_concurrency is not None
             else settings.CITATION_VERIFICATION_MAX_CONCURRENCY
         )
-        rps = {
-            PROVIDER_CROSSREF: settings.CROSSREF_RATE_LIMIT_RPS,
-            PROVIDER_OPENALEX: settings.OPENALEX_RATE_LIMIT_RPS,
-            PROVIDER_SEMANTIC_SCHOLAR: settings.SEMANTIC_SCHOLAR_RATE_LIMIT_RPS,
-            PROVIDER_ARXIV: settings.ARXIV_RATE_LIMIT_RPS,
-        }
-        if rate_limits_rps:
-            rps.update(rate_limits_rps)
-        # Instance-level (not module-level): test isolation + loop safety
-        self._limiters = {p: _MinIntervalLimiter(r) for p, r in rps.items()}
+        # Shared by default so concurrent jobs split one budget per provider;
+        # explicit rate overrides get a private, in-process schedule (tests,
+        # evals) that never touches the cluster-wide Redis keys.
+        if rate_limiter is None:
+            rate_limiter = (
+                ProviderRateLimiter(rate_limits_rps, distributed=False)
+                if rate_limits_rps
+                else get_provider_rate_limiter()
+            )
+        self._rate_limiter = rate_limiter
         self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if bibliographic_index is None and settings.BIBLIOGRAPHIC_INDEX_ENABLED:
+            # Imported here: the index module builds on this one.
+            from app.services.bibliographic_index import get_bibliographic_index
+
+            bibliographic_index = get_bibliographic_index()
+        self._index = bibliographic_index
+        if negative_filter_enabled is None:
+            negative_filter_enabled = settings.CITATION_NEGATIVE_FILTER_ENABLED
+        self._negative_filter = (
+            NegativeTitleFilter() if negative_filter_enabled else None
+        )
 
         self.cache_enabled = cache_enabled
         self.cache_ttl_seconds = cache_ttl_seconds
         self._redis = redis_client
         self._redis_init_failed = False
         self._cache_warned = False
+        self._cache_counters = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+        self._shared_text = SharedText(settings.SOURCE_TEXT_STORE_MAX_ENTRIES)
 
         self.crossref_url = settings.CROSSREF_API_URL.rstrip("/")
         self.openalex_url = settings.OPENALEX_API_URL.rstrip("/")
@@ -337,45 +379,119 @@ class CitationVerifier:
     async def verify_sources(
         self, sources: list[SourceInput]
     ) -> list[VerificationResult]:
-        """Verify a batch of sources; results align index-wise with inputs."""
-        return list(await asyncio.gather(*(self._bounded_verify(s) for s in sources)))
+        """Verify a batch of sources; results align index-wise with inputs.
 
-    async def verify_source(self, source: SourceInput) -> VerificationResult:
-        norm_doi = normalize_doi(source.doi)
-        norm_arxiv = normalize_arxiv_id(source.arxiv_id)
-        norm_title = normalize_title(source.title)
+        Cache traffic is batched: one MGET for every key up front, one
+        pipelined write for the cacheable results. Sources sharing a cache
+        key are verified once.
+        """
+        keys = [self._source_cache_key(s) for s in sources]
+        cached = await self._cache_get_many(sorted({k for k in keys if k}))
+
+        results: list[VerificationResult | None] = [None] * len(sources)
+        pending: dict[str, list[int]] = {}
+        for i, key in enumerate(keys):
+            if key is None:
+                results[i] = VerificationResult(
+                    status=VerificationStatus.UNRESOLVABLE,
+                    reason="insufficient_metadata",
+                )
+            elif key in cached:
+                results[i] = replace(cached[key])
+            else:
+                pending.setdefault(key, []).append(i)
+
+        misses = [sources[indexes[0]] for indexes in pending.values()]
+        resolved_dois = await self._resolve_dois(misses)
+        fresh = await asyncio.gather(
+            *(self._bounded_verify(s, resolved_dois) for s in misses)
+        )
+        writes: dict[str, VerificationResult] = {}
+        for (key, indexes), result in zip(pending.items(), fresh, strict=True):
+            for i in indexes:
+                results[i] = replace(result)
+            if self._cacheable(result):
+                writes[key] = result
+        await self._cache_set_many(writes)
+
+        logger.info(f"Citation verification cache: {self.cache_stats()}")
+        waits = {
+            provider: stats["waited_seconds"]
+            for provider, stats in self._rate_limiter.stats().items()
+            if stats["waited_seconds"]
+        }
+        if waits:
+            logger.info(f"Citation API rate-limit wait (cumulative, s): {waits}")
+        return [r for r in results if r is not None]
 
-        if not (norm_doi or norm_arxiv or norm_title):
+    async def verify_source(self, source: SourceInput) -> VerificationResult:
+        cache_key = self._source_cache_key(source)
+        if cache_key is None:
             return VerificationResult(
                 status=VerificationStatus.UNRESOLVABLE,
                 reason="insufficient_metadata",
             )
-
-        cache_key = self._cache_key(
-            norm_doi,
-            norm_arxiv,
-            norm_title,
-            source.year,
-            source.authors,
-        )
         cached = await self._cache_get(cache_key)
         if cached is not None:
             return cached
+        result = await self._verify_uncached(source)
+        if self._cacheable(result):
+            await self._cache_set(cache_key, result)
+        return result
+
+    def cache_stats(self) -> dict[str, int]:
+        """Redis cache hit/miss/write/error counters of this verifier."""
+        return dict(self._cache_counters)
+
+    async def _verify_uncached(
+        self,
+        source: SourceInput,
+        resolved_dois: dict[str, tuple[str, dict] | None] | None = None,
+    ) -> VerificationResult:
+        """Local index, then the provider cascade (caller handles the cache).
+
+        ``resolved_dois`` carries the batch DOI pre-phase (see
+        _resolve_dois): a DOI present there is not queried again - its
+        candidate (or proven absence) is used directly.
+        """
+        norm_doi = normalize_doi(source.doi)
+        norm_arxiv = normalize_arxiv_id(source.arxiv_id)
+        norm_title = normalize_title(source.title)
+
+        indexed = await self._verify_from_index(
+            source, norm_doi, norm_arxiv, norm_title
+        )
+        if indexed is not None:
+            return indexed
+
+        # Identifier-bearing sources still get their DOI/arXiv lookup.
+        if not (norm_doi or norm_arxiv) and await self._known_absent(norm_title):
+            return VerificationResult(
+                status=VerificationStatus.NOT_FOUND, reason="negative_filter"
+            )
 
         any_error = False
+        title_seen = False
         # An authoritative title search (Crossref/OpenAlex) that completes
         # without a transport error is a trustworthy "does not exist" signal:
         # a clean no-match from either is enough to return NOT_FOUND even if a
         # lower-priority provider (Semantic Scholar/arXiv) throttled or errored.
         authoritative_clean = False
         result: VerificationResult | None = None
+        identified_arxiv: str | None = None
 
         # Phase 1: identifier lookups (authoritative when they hit).
         # A 404 on the DOI does not prove the work doesn't exist (typo or
         # hallucinated DOI) - fall through to title search, which returns
         # the canonical DOI. A clean DOI 404 is deliberately NOT treated as
         # an authoritative no-match for the same reason.
-        if norm_doi:
+        if norm_doi and resolved_dois is not None and norm_doi in resolved_dois:
+            resolved = resolved_dois[norm_doi]
+            if resolved is not None:
+                provider, candidate = resolved
+                score = self._identifier_score(source, norm_title, candidate)
+                result = self._result_from_candidate(candidate, provider, score)
+        elif norm_doi:
             outcome = await self._query_crossref_by_doi(norm_doi, source, norm_title)
             if outcome.matched:
                 result = outcome.matched
@@ -385,6 +501,7 @@ class CitationVerifier:
             outcome = await self._query_arxiv_by_id(norm_arxiv, source, norm_title)
             if outcome.matched:
                 result = outcome.matched
+                identified_arxiv = norm_arxiv
             any_error = any_error or outcome.errored
 
         # Phase 2: title search cascade; first verified hit stops
@@ -400,18 +517,19 @@ class CitationVerifier:
                 if outcome.matched:
                     result = outcome.matched
                     break
+                title_seen = title_seen or outcome.title_seen
                 if search in authoritative_searches and not outcome.errored:
                     authoritative_clean = True
                 any_error = any_error or outcome.errored
 
         if result is not None:
-            await self._cache_set(cache_key, result)
+            await self._index_record(result, identified_arxiv)
             return result
         if not any_error:
             # Fully clean cascade: a trustworthy NOT_FOUND, safe to cache.
-            result = VerificationResult(status=VerificationStatus.NOT_FOUND)
-            await self._cache_set(cache_key, result)
-            return result
+            if norm_title and not title_seen:
+                await self._remember_absent(norm_title)
+            return VerificationResult(status=VerificationStatus.NOT_FOUND)
         if authoritative_clean:
             # Crossref/OpenAlex ran cleanly and found nothing; a lower-priority
             # provider's error does not make this unresolvable. Return NOT_FOUND
@@ -428,16 +546,184 @@ class CitationVerifier:
             status=VerificationStatus.UNRESOLVABLE, reason="provider_errors"
         )
 
-    async def _bounded_verify(self, source: SourceInput) -> VerificationResult:
+    async def _bounded_verify(
+        self,
+        source: SourceInput,
+        resolved_dois: dict[str, tuple[str, dict] | None] | None = None,
+    ) -> VerificationResult:
         async with self._semaphore:
             try:
-                return await self.verify_source(source)
+                return await self._verify_uncached(source, resolved_dois)
             except Exception as e:
                 logger.error(f"Citation verification internal error: {e}")
                 return VerificationResult(
                     status=VerificationStatus.UNRESOLVABLE, reason="internal_error"
                 )
 
+    # ------------------------------------------------------------------
+    # Batch DOI pre-phase
+    # ------------------------------------------------------------------
+
+    async def _resolve_dois(
+        self, sources: list[SourceInput]
+    ) -> dict[str, tuple[str, dict] | None]:
+        """Resolve the batch's DOIs with multi-ID requests.
+
+        Returns {doi: (provider, candidate)} for hits and {doi: None} for DOIs
+        both providers cleanly answered without (the per-source 404 case:
+        title search follows). DOIs left out - batch errors, or too few DOIs
+        to share a request - take the per-source Crossref lookup as before.
+        Never raises.
+        """
+        dois = sorted(
+            {
+                doi
+                for doi in (normalize_doi(s.doi) for s in sources)
+                # "," and "|" are the filter separators of the two APIs
+                if doi and "," not in doi and "|" not in doi
+            }
+        )
+        if len(dois) < DOI_BATCH_MIN:
+            return {}
+
+        resolved: dict[str, tuple[str, dict] | None] = {}
+        uncertain: set[str] = set()
+        pending = dois
+        requests = 0
+        try:
+            for provider, fetch in (
+                (PROVIDER_CROSSREF, self._batch_crossref_dois),
+                (PROVIDER_OPENALEX, self._batch_openalex_dois),
+            ):
+                missing: list[str] = []
+                for start in range(0, len(pending), DOI_BATCH_SIZE):
+                    chunk = pending[start : start + DOI_BATCH_SIZE]
+                    requests += 1
+                    found = await fetch(chunk)
+                    if found is None:
+                        uncertain.update(chunk)
+                        missing.extend(chunk)
+                        continue
+                    for doi in chunk:
+                        if doi in found:
+                            resolved[doi] = (provider, found[doi])
+                        else:
+                            missing.append(doi)
+                pending = missing
+        except Exception as e:
+            logger.warning(f"Batch DOI resolution failed, using per-source: {e}")
+            return {}
+        for doi in pending:
+            if doi not in uncertain:
+                resolved[doi] = None
+        hits = sum(1 for value in resolved.values() if value is not None)
+        logger.info(
+            f"Batch DOI resolution: {hits}/{len(dois)} resolved in "
+            f"{requests} request(s)"
+        )
+        return resolved
+
+    async def _batch_crossref_dois(self, dois: list[str]) -> dict[str, dict] | None:
+        """{doi: candidate} for one Crossref multi-DOI filter; None on error."""
+        status, response = await self._fetch(
+            PROVIDER_CROSSREF,
+            f"{self.crossref_url}/works",
+            params={
+                "filter": ",".join(f"doi:{doi}" for doi in dois),
+                "rows": len(dois),
+            },
+        )
+        if status != "ok" or response is None:
+            return None
+        try:
+            items = response.json().get("message", {}).get("items") or []
+        except ValueError:
+            return None
+        return self._candidates_by_doi(self._parse_crossref_item(i) for i in items)
+
+    async def _batch_openalex_dois(self, dois: list[str]) -> dict[str, dict] | None:
+        """{doi: candidate} for one OpenAlex doi:a|b|c filter; None on error."""
+        params = {"filter": "doi:" + "|".join(dois), "per-page": len(dois)}
+        if self.openalex_api_key:
+            params["api_key"] = self.openalex_api_key
+        status, response = await self._fetch(
+            PROVIDER_OPENALEX, f"{self.openalex_url}/works", params=params
+        )
+        if status != "ok" or response is None:
+            return None
+        try:
+            works = response.json().get("results") or []
+        except ValueError:
+            return None
+        return self._candidates_by_doi(self._parse_openalex_work(w) for w in works)
+
+    @staticmethod
+    def _candidates_by_doi(candidates: Iterable[dict]) -> dict[str, dict]:
+        # Title-less records are skipped, as in _query_crossref_by_doi
+        return {
+            candidate["doi"]: candidate
+            for candidate in candidates
+            if candidate.get("doi") and candidate.get("title")
+        }
+
+    # ------------------------------------------------------------------
+    # Negative-result filter
+    # ------------------------------------------------------------------
+
+    async def _known_absent(self, norm_title: str) -> bool:
+        if self._negative_filter is None or not norm_title:
+            return False
+        redis = await self._get_redis()
+        if redis is None:
+            return False
+        return await self._negative_filter.contains(redis, norm_title)
+
+    async def _remember_absent(self, norm_title: str) -> None:
+        if self._negative_filter is None:
+            return
+        redis = await self._get_redis()
+        if redis is not None:
+            await self._negative_filter.add(redis, norm_title)
+
+    # ------------------------------------------------------------------
+    # Local bibliographic index
+    # ------------------------------------------------------------------
+
+    async def _verify_from_index(
+        self,
+        source: SourceInput,
+        norm_doi: str | None,
+        norm_arxiv: str | None,
+        norm_title: str,
+    ) -> VerificationResult | None:
+        """Answer from the local index with the cascade's own rules (DOI,
+        then arXiv id, then title match); None = ask the providers."""
+        if self._index is None:
+            return None
+        found = await self._index.lookup(norm_doi, norm_arxiv, norm_title)
+        for candidate in (found.by_doi, found.by_arxiv):
+            if candidate is not None:
+                score = self._identifier_score(source, norm_title, candidate)
+                return self._indexed_result(candidate, score)
+        best = self._best_candidate(source, norm_title, found.by_title)
+        if best is None:
+            return None
+        candidate, score = best
+        return self._indexed_result(candidate, score)
+
+    def _indexed_result(self, candidate: dict, score: float) -> VerificationResult:
+        result = self._result_from_candidate(
+            candidate, candidate.get("provider"), score
+        )
+        result.from_index = True
+        return result
+
+    async def _index_record(
+        self, result: VerificationResult, arxiv_id: str | None
+    ) -> None:
+        if self._index is not None:
+            await self._index.record_result(result, arxiv_id)
+
     # ------------------------------------------------------------------
     # Matching
     # ------------------------------------------------------------------
@@ -446,15 +732,9 @@ class CitationVerifier:
         self, source: SourceInput, norm_title: str, candidate: dict
     ) -> float | None:
         """Score a candidate against the source; None if it doesn't match."""
-        candidate_title = normalize_title(candidate.get("title"))
-        if not candidate_title or not norm_title:
+        score = self._title_score(norm_title, candidate)
+        if score is None:
             return None
-        if candidate_title == norm_title:
-            score = 1.0
-        else:
-            score = SequenceMatcher(None, norm_title, candidate_title).ratio()
-            if score < FUZZY_MATCH_THRESHOLD:
-                return None
         candidate_year = candidate.get("year")
         if (
             source.year is not None
@@ -468,6 +748,20 @@ class CitationVerifier:
             return None
         return score
 
+    @staticmethod
+    def _title_score(norm_title: str, candidate: dict) -> float | None:
+        """Title similarity if it clears FUZZY_MATCH_THRESHOLD, else None."""
+        candidate_title = normalize_title(candidate.get("title"))
+        if not candidate_title or not norm_title:
+            return None
+        if candidate_title == norm_title:
+            return 1.0
+        score = SequenceMatcher(None, norm_title, candidate_title).ratio()
+        return score if score >= FUZZY_MATCH_THRESHOLD else None
+
+    def _title_seen(self, norm_title: str, candidates: list[dict]) -> bool:
+        return any(self._title_score(norm_title, c) is not None for c in candidates)
+
     def _best_candidate(
         self, source: SourceInput, norm_title: str, candidates: list[dict]
     ) -> tuple[dict, float] | None:
@@ -506,7 +800,7 @@ class CitationVerifier:
         return SequenceMatcher(None, norm_title, candidate_title).ratio()
 
     def _result_from_candidate(
-        self, candidate: dict, provider: str, score: float
+        self, candidate: dict, provider: str | None, score: float
     ) -> VerificationResult:
         return VerificationResult(
             status=VerificationStatus.VERIFIED,
@@ -514,8 +808,8 @@ class CitationVerifier:
             title=candidate.get("title"),
             year=candidate.get("year"),
             authors=list(candidate.get("authors") or []),
-            venue=candidate.get("venue"),
-            abstract=candidate.get("abstract"),
+            venue=self._shared_text.share(candidate.get("venue")),
+            abstract=self._shared_text.share(candidate.get("abstract")),
             provider=provider,
             match_score=round(score, 3),
         )
@@ -542,9 +836,11 @@ class CitationVerifier:
         if headers:
             merged_headers.update(headers)
         while True:
-            await self._limiters[provider].acquire()
+            await self._rate_limiter.acquire(provider)
             error: str
             retryable: bool
+            retry_after: float | None = None
+            throttled = False
             try:
                 async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
                     response = await client.get(
@@ -558,6 +854,9 @@ class CitationVerifier:
                 status_code = e.response.status_code
                 retryable = status_code in RETRYABLE_STATUS
                 error = f"HTTP {status_code}"
+                if status_code == 429:
+                    throttled = True
+                    retry_after = retry_after_seconds(e.response.headers)
             except httpx.HTTPError as e:  # timeouts, network, protocol errors
                 retryable = True
                 error = f"{type(e).__name__}: {e}"
@@ -565,13 +864,21 @@ class CitationVerifier:
                 retryable = False
                 error = f"{type(e).__name__}: {e}"
 
+            delay = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
+            if throttled:
+                # Shared backoff: the limiter holds every caller of this
+                # provider (all processes) until Retry-After has passed, and
+                # the next acquire() does the waiting for this retry too.
+                await self._rate_limiter.penalize(
+                    provider, retry_after if retry_after is not None else delay
+                )
             if retryable and attempt < self.max_retries:
-                delay = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
                 logger.warning(
                     f"Citation API {provider} attempt {attempt + 1} failed "
                     f"({error}), retrying in {delay}s"
                 )
-                await asyncio.sleep(delay)
+                if not throttled:
+                    await asyncio.sleep(delay)
                 attempt += 1
                 continue
             logger.warning(f"Citation API {provider} failed ({error}): {url}")
@@ -621,7 +928,7 @@ class CitationVerifier:
         candidates = [self._parse_crossref_item(i) for i in items]
         best = self._best_candidate(source, norm_title, candidates)
         if best is None:
-            return _ProviderOutcome()
+            return _ProviderOutcome(title_seen=self._title_seen(norm_title, candidates))
         candidate, score = best
         return _ProviderOutcome(
             matched=self._result_from_candidate(candidate, PROVIDER_CROSSREF, score)
@@ -647,7 +954,7 @@ class CitationVerifier:
         candidates = [self._parse_openalex_work(w) for w in works]
         best = self._best_candidate(source, norm_title, candidates)
         if best is None:
-            return _ProviderOutcome()
+            return _ProviderOutcome(title_seen=self._title_seen(norm_title, candidates))
         candidate, score = best
         return _ProviderOutcome(
             matched=self._result_from_candidate(candidate, PROVIDER_OPENALEX, score)
@@ -676,7 +983,7 @@ class CitationVerifier:
         candidates = [self._parse_s2_paper(p) for p in papers]
         best = self._best_candidate(source, norm_title, candidates)
         if best is None:
-            return _ProviderOutcome()
+            return _ProviderOutcome(title_seen=self._title_seen(norm_title, candidates))
         candidate, score = best
         return _ProviderOutcome(
             matched=self._result_from_candidate(
@@ -723,7 +1030,7 @@ class CitationVerifier:
             return _ProviderOutcome(errored=True)
         best = self._best_candidate(source, norm_title, entries)
         if best is None:
-            return _ProviderOutcome()
+            return _ProviderOutcome(title_seen=self._title_seen(norm_title, entries))
         candidate, score = best
         return _ProviderOutcome(
             matched=self._result_from_candidate(candidate, PROVIDER_ARXIV, score)
@@ -853,11 +1160,35 @@ class CitationVerifier:
         ).hexdigest()
         return f"{CACHE_PREFIX}:v{CACHE_SCHEMA_VERSION}:{digest}"
 
+    def _source_cache_key(self, source: SourceInput) -> str | None:
+        """Cache key for a source; None when it has nothing to look up."""
+        norm_doi = normalize_doi(source.doi)
+        norm_arxiv = normalize_arxiv_id(source.arxiv_id)
+        norm_title = normalize_title(source.title)
+        if not (norm_doi or norm_arxiv or norm_title):
+            return None
+        return self._cache_key(
+            norm_doi, norm_arxiv, norm_title, source.year, source.authors
+        )
+
+    @staticmethod
+    def _cacheable(result: VerificationResult) -> bool:
+        # VERIFIED and a fully clean NOT_FOUND only: partial-outage NOT_FOUND
+        # and UNRESOLVABLE must not poison the cache.
+        return result.status == VerificationStatus.VERIFIED or (
+            result.status == VerificationStatus.NOT_FOUND and result.reason is None
+        )
+
     async def _get_redis(self) -> aioredis.Redis | None:
         if self._redis is not None:
             return self._redis
         if not self.cache_enabled or self._redis_init_failed:
             return None
+        # The app-wide pool (initialized at startup) when there is one;
+        # a private client only where it is not (standalone scripts/evals).
+        shared = get_redis_client()
+        if shared is not None:
+            return shared
         try:
             self._redis = await aioredis.from_url(
                 settings.REDIS_URL,
@@ -880,34 +1211,84 @@ class CitationVerifier:
         try:
             raw = await redis.get(key)
         except Exception as e:
+            self._cache_counters["errors"] += 1
             self._warn_cache(f"Redis read failed: {e}")
             return None
-        if not raw:
-            return None
-        try:
-            result = VerificationResult.from_dict(json.loads(raw))
-        except (ValueError, KeyError, TypeError):
-            return None  # malformed cache entry = miss
-        result.from_cache = True
-        return result
+        return self._decode_cached(raw)
 
-    async def _cache_set(self, key: str, result: VerificationResult) -> None:
-        # Only VERIFIED / NOT_FOUND are cached (callers ensure this)
-        if not self.cache_enabled:
-            return
+    async def _cache_get_many(self, keys: list[str]) -> dict[str, VerificationResult]:
+        """One MGET for a batch; {key: result} for the hits."""
+        if not self.cache_enabled or not keys:
+            return {}
         redis = await self._get_redis()
         if redis is None:
-            return
-        payload = json.dumps(
+            return {}
+        try:
+            raws = await redis.mget(keys)
+        except Exception as e:
+            self._cache_counters["errors"] += 1
+            self._warn_cache(f"Redis read failed: {e}")
+            return {}
+        hits: dict[str, VerificationResult] = {}
+        for key, raw in zip(keys, raws, strict=True):
+            result = self._decode_cached(raw)
+            if result is not None:
+                hits[key] = result
+        return hits
+
+    def _decode_cached(self, raw: str | bytes | None) -> VerificationResult | None:
+        if raw:
+            try:
+                result = VerificationResult.from_dict(json.loads(raw))
+            except (ValueError, KeyError, TypeError):
+                result = None  # malformed cache entry = miss
+            if result is not None:
+                result.from_cache = True
+                result.venue = self._shared_text.share(result.venue)
+                result.abstract = self._shared_text.share(result.abstract)
+                self._cache_counters["hits"] += 1
+                return result
+        self._cache_counters["misses"] += 1
+        return None
+
+    def _encode_cached(self, result: VerificationResult) -> str:
+        return json.dumps(
             {
                 "v": CACHE_SCHEMA_VERSION,
                 "cached_at": datetime.utcnow().isoformat(),
                 **result.to_dict(),
             }
         )
+
+    async def _cache_set(self, key: str, result: VerificationResult) -> None:
+        # Only VERIFIED / NOT_FOUND are cached (callers ensure this)
+        if not self.cache_enabled:
+            return
+        redis = await self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(key, self._encode_cached(result), ex=self.cache_ttl_seconds)
+            self._cache_counters["writes"] += 1
+        except Exception as e:
+            self._cache_counters["errors"] += 1
+            self._warn_cache(f"Redis write failed: {e}")
+
+    async def _cache_set_many(self, results: dict[str, VerificationResult]) -> None:
+        """Write a batch's cacheable results in one pipelined round trip."""
+        if not self.cache_enabled or not results:
+            return
+        redis = await self._get_redis()
+        if redis is None:
+            return
         try:
-            await redis.set(key, payload, ex=self.cache_ttl_seconds)
+            pipe = redis.pipeline(transaction=False)
+            for key, result in results.items():
+                pipe.set(key, self._encode_cached(result), ex=self.cache_ttl_seconds)
+            await pipe.execute()
+            self._cache_counters["writes"] += len(results)
         except Exception as e:
+            self._cache_counters["errors"] += 1
             self._warn_cache(f"Redis write failed: {e}")
 
     def _warn_cache(self, message: str) -> None:
@@ -3,16 +3,14 @@ Custom requirements file upload and processing service
 Handles PDF, DOCX, and TXT file uploads for additional document requirements
 """
 
-import io
 import logging
 from pathlib import Path
 
-from docx import Document as DocxDocument
 from fastapi import UploadFile
-from pypdf import PdfReader
 
 from app.core.exceptions import ValidationError
 from app.services.file_validator import FileValidator
+from app.services.parsing_service import get_parsing_service
 
 logger = logging.getLogger(__name__)
 
@@ -135,15 +133,8 @@ class CustomRequirementsService:
             content = await file.read()
             file.file.seek(0)  # Reset file pointer
 
-            pdf = PdfReader(io.BytesIO(content))
-            text_parts = []
-
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    text_parts.append(page_text)
-
-            extracted_text = "\n\n".join(text_parts)
+            pages = await get_parsing_service().pdf_pages(content)
+            extracted_text = "\n\n".join(page for page in pages if page.strip())
             if not extracted_text or not extracted_text.strip():
                 raise ValidationError(
                     "PDF file appears to be empty or contains no extractable text"
@@ -164,28 +155,12 @@ class CustomRequirementsService:
             content = await file.read()
             file.file.seek(0)  # Reset file pointer
 
-            doc = DocxDocument(io.BytesIO(content))
-            text_parts = []
-
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-
             # University templates often keep decisive formatting/citation
             # rules in tables, headers, or footers rather than body paragraphs.
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            if paragraph.text.strip():
-                                text_parts.append(paragraph.text)
-            for section in doc.sections:
-                for container in (section.header, section.footer):
-                    for paragraph in container.paragraphs:
-                        if paragraph.text.strip():
-                            text_parts.append(paragraph.text)
-
-            extracted_text = "\n\n".join(text_parts)
+            paragraphs = await get_parsing_service().docx_paragraphs(
+                content, include_tables=True
+            )
+            extracted_text = "\n\n".join(p for p in paragraphs if p.strip())
             if not extracted_text or not extracted_text.strip():
                 raise ValidationError(
                     "DOCX file appears to be empty or contains no extractable text"
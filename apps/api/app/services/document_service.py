@@ -3,7 +3,6 @@ Document service for managing documents and sections
 """
 
 import hashlib
-import io
 import logging
 from datetime import datetime, timedelta
 from typing import Any
@@ -21,11 +20,15 @@ from app.models.document import (
     ProductionCase,
 )
 from app.models.payment import Payment
-from app.services.ai_pipeline.citation_formatter import (
-    bibliography_heading,
-    merge_bibliographies,
-)
 from app.services.ai_pipeline.citation_keys import internal_marker_keys
+from app.services.blocking_executor import run_blocking
+from app.services.export_renderer import (
+    EXPORT_CONTENT_TYPES,
+    build_export_model,
+    export_cache_key,
+    render_export,
+)
+from app.services.generation_worker import enqueue_artifact_deletions
 
 logger = logging.getLogger(__name__)
 
@@ -774,7 +777,12 @@ class DocumentService:
 
             # List all files in bucket
             try:
-                objects = client.list_objects(settings.MINIO_BUCKET, recursive=True)
+                objects = await run_blocking(
+                    "minio.list_objects",
+                    lambda: list(
+                        client.list_objects(settings.MINIO_BUCKET, recursive=True)
+                    ),
+                )
                 for obj in objects:
                     storage_files.append(obj.object_name)
 
@@ -820,6 +828,52 @@ class DocumentService:
                 "timestamp": time.time(),
             }
 
+    async def _reusable_export(
+        self,
+        document: Document,
+        format: str,
+        export_key: str,
+        storage_service: Any,
+    ) -> dict[str, Any] | None:
+        """The stored artifact when it was rendered from ``export_key``.
+
+        Returns None (render again) when the pointer carries another key or
+        storage no longer has the object.
+        """
+        stored_path = getattr(document, f"{format}_path")
+        stored_sha256 = getattr(document, f"{format}_sha256")
+        if (
+            not stored_path
+            or not stored_sha256
+            or getattr(document, f"{format}_export_key") != export_key
+        ):
+            return None
+        try:
+            file_size = await storage_service.get_file_size(str(stored_path))
+        except Exception as e:
+            logger.warning(
+                f"Stored {format} export {stored_path} is unavailable, "
+                f"rendering again: {e}"
+            )
+            return None
+
+        from app.core.config import settings
+
+        logger.info(f"Reusing unchanged {format} export {stored_path}")
+        return {
+            "download_url": (
+                f"http://{settings.MINIO_ENDPOINT}/"
+                f"{str(stored_path).removeprefix('s3://')}"
+            ),
+            "expires_at": (datetime.utcnow() + timedelta(hours=1)).isoformat(),
+            "file_size": file_size,
+            "format": format,
+            "artifact_sha256": str(stored_sha256),
+            "storage_path": str(stored_path),
+            "export_key": export_key,
+            "reused": True,
+        }
+
     async def export_document(
         self,
         document_id: int,
@@ -833,8 +887,6 @@ class DocumentService:
             f"🚀 Starting export_document: doc_id={document_id}, format={format}, user_id={user_id}"
         )
         try:
-            from docx import Document as DocxDocument
-
             from app.core.config import settings
 
             logger.info(f"📄 Getting document {document_id} from database...")
@@ -867,212 +919,29 @@ class DocumentService:
                     f"{preview}"
                 )
 
-            # Generate file based on format
-            if format == "docx":
-                # Create DOCX document
-                docx = DocxDocument()
-
-                # Add title
-                docx.add_heading(document.title, 0)
-
-                # Add metadata
-                docx.add_paragraph(f"Topic: {document.topic}")
-                docx.add_paragraph(f"Language: {document.language}")
-                docx.add_paragraph(
-                    f"Created: {document.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
-                )
-                docx.add_paragraph("")  # Empty line
-
-                # Add content if available
-                if document.content:
-                    # Render "# ..." blocks (section titles and the
-                    # Bibliografia heading appended at assembly) as real
-                    # headings, everything else as body paragraphs
-                    for block in document.content.split("\n\n"):
-                        stripped = block.strip()
-                        if not stripped:
-                            continue
-                        if stripped.startswith("# "):
-                            docx.add_heading(stripped[2:].strip(), 1)
-                        else:
-                            docx.add_paragraph(stripped)
-                elif document.sections:
-                    # Add sections
-                    sorted_sections = sorted(
-                        document.sections, key=lambda s: s.section_index
-                    )
-                    for section in sorted_sections:
-                        docx.add_heading(section.title, 1)
-                        if section.content:
-                            docx.add_paragraph(section.content)
-                        docx.add_paragraph("")  # Empty line between sections
-
-                    # Bibliography from persisted per-section references
-                    section_bibliography = merge_bibliographies(
-                        s.bibliography for s in sorted_sections
-                    )
-                    if section_bibliography:
-                        docx.add_heading(
-                            bibliography_heading(str(document.language)), 1
-                        )
-                        for reference in section_bibliography:
-                            docx.add_paragraph(reference)
-
-                # Save to BytesIO
-                file_stream = io.BytesIO()
-                logger.info(f"Saving DOCX document for doc_id={document_id}")
-                docx.save(file_stream)
-                file_size = file_stream.tell()  # Get size BEFORE seeking to 0
-                logger.info(f"DOCX saved, file_size after save: {file_size} bytes")
-                file_stream.seek(0)
-                file_data = file_stream.getvalue()  # Get bytes for upload
-
-                file_extension = "docx"
-                content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-
-            elif format == "pdf":
-                # Create PDF document using ReportLab
-                from reportlab.lib import colors
-                from reportlab.lib.pagesizes import letter
-                from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-                from reportlab.lib.units import inch
-                from reportlab.platypus import (
-                    Paragraph,
-                    SimpleDocTemplate,
-                    Spacer,
-                )
-
-                # Create PDF in memory
-                file_stream = io.BytesIO()
-                pdf = SimpleDocTemplate(
-                    file_stream,
-                    pagesize=letter,
-                    rightMargin=72,
-                    leftMargin=72,
-                    topMargin=72,
-                    bottomMargin=18,
-                )
-
-                # Container for PDF elements
-                elements = []
-                styles = getSampleStyleSheet()
-
-                # Custom styles
-                title_style = ParagraphStyle(
-                    "CustomTitle",
-                    parent=styles["Heading1"],
-                    fontSize=24,
-                    textColor=colors.HexColor("#1a1a1a"),
-                    spaceAfter=30,
-                    alignment=1,  # Center
-                )
-
-                heading_style = ParagraphStyle(
-                    "CustomHeading",
-                    parent=styles["Heading2"],
-                    fontSize=16,
-                    textColor=colors.HexColor("#2c3e50"),
-                    spaceAfter=12,
-                )
+            content_type = EXPORT_CONTENT_TYPES.get(format)
+            if content_type is None:
+                raise ValidationError(f"Unsupported export format: {format}")
 
-                body_style = ParagraphStyle(
-                    "CustomBody",
-                    parent=styles["Normal"],
-                    fontSize=11,
-                    leading=14,
-                    spaceAfter=12,
-                )
+            from app.services.storage_service import StorageService
 
-                # Add title
-                elements.append(Paragraph(document.title, title_style))
-                elements.append(Spacer(1, 0.2 * inch))
-
-                # Add metadata
-                metadata = f"""
-                <b>Topic:</b> {document.topic}<br/>
-                <b>Language:</b> {document.language}<br/>
-                <b>Created:</b> {document.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-                """
-                elements.append(Paragraph(metadata, body_style))
-                elements.append(Spacer(1, 0.3 * inch))
-
-                def escape_pdf_text(text: str) -> str:
-                    return (
-                        text.replace("&", "&amp;")
-                        .replace("<", "&lt;")
-                        .replace(">", "&gt;")
-                    )
+            storage_service = StorageService()
 
-                # Add content
-                if document.content:
-                    # Split content by paragraphs; render "# ..." blocks
-                    # (section titles, Bibliografia heading) as headings
-                    for paragraph in document.content.split("\n\n"):
-                        stripped = paragraph.strip()
-                        if not stripped:
-                            continue
-                        if stripped.startswith("# "):
-                            elements.append(
-                                Paragraph(
-                                    escape_pdf_text(stripped[2:].strip()),
-                                    heading_style,
-                                )
-                            )
-                        else:
-                            elements.append(
-                                Paragraph(escape_pdf_text(stripped), body_style)
-                            )
-                elif document.sections:
-                    # Add sections
-                    sorted_sections = sorted(
-                        document.sections, key=lambda s: s.section_index
-                    )
-                    for section in sorted_sections:
-                        # Section heading
-                        elements.append(Paragraph(section.title, heading_style))
-                        elements.append(Spacer(1, 0.1 * inch))
-
-                        # Section content
-                        if section.content:
-                            for paragraph in section.content.split("\n\n"):
-                                if paragraph.strip():
-                                    elements.append(
-                                        Paragraph(
-                                            escape_pdf_text(paragraph), body_style
-                                        )
-                                    )
-
-                        elements.append(Spacer(1, 0.2 * inch))
-
-                    # Bibliography from persisted per-section references
-                    section_bibliography = merge_bibliographies(
-                        s.bibliography for s in sorted_sections
-                    )
-                    if section_bibliography:
-                        elements.append(
-                            Paragraph(
-                                bibliography_heading(str(document.language)),
-                                heading_style,
-                            )
-                        )
-                        for reference in section_bibliography:
-                            elements.append(
-                                Paragraph(escape_pdf_text(reference), body_style)
-                            )
-
-                # Build PDF
-                logger.info(f"Generating PDF document for doc_id={document_id}")
-                pdf.build(elements)
-                file_size = file_stream.tell()
-                logger.info(f"PDF generated, file_size: {file_size} bytes")
-                file_stream.seek(0)
-                file_data = file_stream.getvalue()  # Get bytes for upload
-
-                file_extension = "pdf"
-                content_type = "application/pdf"
+            # Snapshot the document as plain data here; the file itself is
+            # rendered in a worker process, off the event loop. An unchanged
+            # model reuses the artifact it produced last time.
+            model = build_export_model(document)
+            export_key = export_cache_key(model, format)
+            reused = await self._reusable_export(
+                document, format, export_key, storage_service
+            )
+            if reused is not None:
+                return reused
 
-            else:
-                raise ValidationError(f"Unsupported export format: {format}")
+            logger.info(f"Rendering {format} document for doc_id={document_id}")
+            file_data = await render_export(model, format)
+            file_size = len(file_data)
+            file_extension = format
 
             artifact_sha256 = hashlib.sha256(file_data).hexdigest()
 
@@ -1086,9 +955,6 @@ class DocumentService:
             logger.info(f"Uploading {format} file: {object_name} ({file_size} bytes)")
 
             # Upload file using StorageService
-            from app.services.storage_service import StorageService
-
-            storage_service = StorageService()
             storage_path = await storage_service.upload_file(
                 object_name, file_data, content_type
             )
@@ -1104,23 +970,23 @@ class DocumentService:
             # interactive/manual exports retain the original behavior.
             storage_path = f"s3://{settings.MINIO_BUCKET}/{object_name}"
             if persist_pointer:
-                if format == "docx":
-                    await self.db.execute(
-                        update(Document)
-                        .where(Document.id == document_id)
-                        .values(
-                            docx_path=storage_path,
-                            docx_sha256=artifact_sha256,
-                        )
+                previous_path = getattr(document, f"{format}_path")
+                await self.db.execute(
+                    update(Document)
+                    .where(Document.id == document_id)
+                    .values(
+                        {
+                            f"{format}_path": storage_path,
+                            f"{format}_sha256": artifact_sha256,
+                            f"{format}_export_key": export_key,
+                        }
                     )
-                elif format == "pdf":
-                    await self.db.execute(
-                        update(Document)
-                        .where(Document.id == document_id)
-                        .values(
-                            pdf_path=storage_path,
-                            pdf_sha256=artifact_sha256,
-                        )
+                )
+                # The replaced artifact is evicted by the deletion outbox
+                # sweep, enqueued in the transaction that supersedes it.
+                if previous_path and str(previous_path) != storage_path:
+                    await enqueue_artifact_deletions(
+                        self.db, [str(previous_path)], reason="superseded"
                     )
                 await self.db.commit()
 
@@ -1132,6 +998,8 @@ class DocumentService:
                 "format": format,
                 "artifact_sha256": artifact_sha256,
                 "storage_path": storage_path,
+                "export_key": export_key,
+                "reused": False,
             }
 
         except NotFoundError:
@@ -0,0 +1,314 @@
+"""
+Off-loop rendering of document exports (DOCX and PDF).
+
+python-docx and ReportLab are pure Python, and rendering costs CPU in
+proportion to document size. export_document used to build both formats
+inside the async method, so every WebSocket heartbeat and API request on
+the instance waited for a long thesis to render. Rendering now runs in
+worker processes.
+
+The caller turns the ORM document into an ``ExportDocument`` on the event
+loop (``build_export_model``): plain strings in frozen dataclasses, so
+nothing bound to a session crosses the process boundary. ``render_docx``
+and ``render_pdf`` are module-level functions of that model alone and
+produce the same files the inline exporter did.
+
+Workers are a dedicated ParsingService pool (parsing_service.py) of
+EXPORT_RENDER_MAX_WORKERS processes with a per-export wall-clock budget of
+EXPORT_RENDER_TIMEOUT_SECONDS, so a burst of exports never queues behind
+upload parsing or the other way round; 0 workers renders on the blocking
+thread pool instead. Render times are observed in the
+``document_export_render_seconds`` histogram (per format, exposed on
+/metrics).
+
+``export_cache_key`` hashes the canonical model together with
+EXPORT_RENDERER_VERSION and the format. export_document stores it next to
+the artifact pointer and reuses the stored object when the key of the next
+export matches, so bump the version with any change to the rendered
+layout.
+"""
+
+import dataclasses
+import hashlib
+import io
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Histogram
+
+from app.core.config import settings
+from app.services.ai_pipeline.citation_formatter import (
+    bibliography_heading,
+    merge_bibliographies,
+)
+from app.services.parsing_service import ParsingService
+
+logger = logging.getLogger(__name__)
+
+# Part of every export cache key: bump when render_docx/render_pdf change
+# the produced layout, so stored artifacts are re-rendered.
+EXPORT_RENDERER_VERSION = 1
+
+EXPORT_CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+RENDER_SECONDS = Histogram(
+    "document_export_render_seconds",
+    "Time to render a document export, including the wait for a worker.",
+    ["format"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ExportBlock:
+    """One rendered unit of the document body.
+
+    kind is "heading" or "paragraph" for blocks of document.content, and
+    "section", "section_body" or "section_end" for the per-section
+    fallback (title, content, separator).
+    """
+
+    kind: str
+    text: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class ExportDocument:
+    """Everything a renderer needs, as plain data."""
+
+    title: str
+    topic: str
+    language: str
+    created_at: str
+    blocks: tuple[ExportBlock, ...]
+    bibliography_heading: str | None = None
+    bibliography: tuple[str, ...] = ()
+
+
+def build_export_model(document: Any) -> ExportDocument:
+    """Snapshot a Document (sections loaded) for rendering."""
+    blocks: list[ExportBlock] = []
+    references: list[str] = []
+    if document.content:
+        # "# ..." blocks (section titles and the Bibliografia heading
+        # appended at assembly) render as real headings.
+        for block in document.content.split("\n\n"):
+            stripped = block.strip()
+            if not stripped:
+                continue
+            if stripped.startswith("# "):
+                blocks.append(ExportBlock("heading", stripped[2:].strip()))
+            else:
+                blocks.append(ExportBlock("paragraph", stripped))
+    elif document.sections:
+        sorted_sections = sorted(document.sections, key=lambda s: s.section_index)
+        for section in sorted_sections:
+            blocks.append(ExportBlock("section", str(section.title)))
+            if section.content:
+                blocks.append(ExportBlock("section_body", str(section.content)))
+            blocks.append(ExportBlock("section_end"))
+        # Bibliography from persisted per-section references
+        references = merge_bibliographies(s.bibliography for s in sorted_sections)
+    return ExportDocument(
+        title=str(document.title),
+        topic=str(document.topic),
+        language=str(document.language),
+        created_at=document.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        blocks=tuple(blocks),
+        bibliography_heading=(
+            bibliography_heading(str(document.language)) if references else None
+        ),
+        bibliography=tuple(references),
+    )
+
+
+def export_cache_key(model: ExportDocument, format: str) -> str:
+    """Identity of one rendered export: model, format and renderer version."""
+    material = json.dumps(
+        [EXPORT_RENDERER_VERSION, format, dataclasses.asdict(model)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Worker side: module-level functions, picklable by reference.
+# ---------------------------------------------------------------------------
+
+
+def render_docx(model: ExportDocument) -> bytes:
+    from docx import Document as DocxDocument
+
+    docx = DocxDocument()
+    docx.add_heading(model.title, 0)
+    docx.add_paragraph(f"Topic: {model.topic}")
+    docx.add_paragraph(f"Language: {model.language}")
+    docx.add_paragraph(f"Created: {model.created_at}")
+    docx.add_paragraph("")  # Empty line
+
+    for block in model.blocks:
+        if block.kind in ("heading", "section"):
+            docx.add_heading(block.text, 1)
+        elif block.kind == "section_end":
+            docx.add_paragraph("")  # Empty line between sections
+        else:
+            docx.add_paragraph(block.text)
+
+    if model.bibliography:
+        docx.add_heading(model.bibliography_heading, 1)
+        for reference in model.bibliography:
+            docx.add_paragraph(reference)
+
+    stream = io.BytesIO()
+    docx.save(stream)
+    return stream.getvalue()
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_pdf(model: ExportDocument) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    stream = io.BytesIO()
+    pdf = SimpleDocTemplate(
+        stream,
+        pagesize=letter,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18,
+    )
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        "CustomTitle",
+        parent=styles["Heading1"],
+        fontSize=24,
+        textColor=colors.HexColor("#1a1a1a"),
+        spaceAfter=30,
+        alignment=1,  # Center
+    )
+    heading_style = ParagraphStyle(
+        "CustomHeading",
+        parent=styles["Heading2"],
+        fontSize=16,
+        textColor=colors.HexColor("#2c3e50"),
+        spaceAfter=12,
+    )
+    body_style = ParagraphStyle(
+        "CustomBody",
+        parent=styles["Normal"],
+        fontSize=11,
+        leading=14,
+        spaceAfter=12,
+    )
+
+    elements: list[Any] = [
+        Paragraph(model.title, title_style),
+        Spacer(1, 0.2 * inch),
+    ]
+    metadata = f"""
+                <b>Topic:</b> {model.topic}<br/>
+                <b>Language:</b> {model.language}<br/>
+                <b>Created:</b> {model.created_at}
+                """
+    elements.append(Paragraph(metadata, body_style))
+    elements.append(Spacer(1, 0.3 * inch))
+
+    for block in model.blocks:
+        if block.kind == "heading":
+            elements.append(Paragraph(_escape_pdf_text(block.text), heading_style))
+        elif block.kind == "paragraph":
+            elements.append(Paragraph(_escape_pdf_text(block.text), body_style))
+        elif block.kind == "section":
+            elements.append(Paragraph(block.text, heading_style))
+            elements.append(Spacer(1, 0.1 * inch))
+        elif block.kind == "section_body":
+            for paragraph in block.text.split("\n\n"):
+                if paragraph.strip():
+                    elements.append(Paragraph(_escape_pdf_text(paragraph), body_style))
+        elif block.kind == "section_end":
+            elements.append(Spacer(1, 0.2 * inch))
+
+    if model.bibliography:
+        elements.append(Paragraph(str(model.bibliography_heading), heading_style))
+        for reference in model.bibliography:
+            elements.append(Paragraph(_escape_pdf_text(reference), body_style))
+
+    pdf.build(elements)
+    return stream.getvalue()
+
+
+_RENDERERS = {"docx": render_docx, "pdf": render_pdf}
+
+
+# ---------------------------------------------------------------------------
+# Parent side.
+# ---------------------------------------------------------------------------
+
+_render_service: ParsingService | None = None
+
+
+def get_export_render_service() -> ParsingService:
+    """Process-wide pool for export rendering, separate from parsing."""
+    global _render_service
+    if _render_service is None:
+        _render_service = ParsingService(
+            settings.EXPORT_RENDER_MAX_WORKERS,
+            timeout_seconds=settings.EXPORT_RENDER_TIMEOUT_SECONDS,
+        )
+    return _render_service
+
+
+def shutdown_export_render_service() -> None:
+    """Stop the worker processes (application shutdown)."""
+    if _render_service is not None:
+        _render_service.shutdown()
+
+
+async def render_export(
+    model: ExportDocument,
+    format: str,
+    *,
+    service: ParsingService | None = None,
+) -> bytes:
+    """The file bytes of ``model`` in ``format``, rendered in a worker.
+
+    Raises ValueError for an unknown format and ParsingError when the
+    worker times out or dies.
+    """
+    renderer = _RENDERERS.get(format)
+    if renderer is None:
+        raise ValueError(f"Unsupported export format: {format}")
+    service = service or get_export_render_service()
+    with RENDER_SECONDS.labels(format).time():
+        data = await service.run(f"{format}.render", renderer, model)
+    logger.info(f"Rendered {format} export: {len(data)} bytes")
+    return data
+
+
+__all__ = [
+    "EXPORT_CONTENT_TYPES",
+    "EXPORT_RENDERER_VERSION",
+    "RENDER_SECONDS",
+    "ExportBlock",
+    "ExportDocument",
+    "build_export_model",
+    "export_cache_key",
+    "get_export_render_service",
+    "render_docx",
+    "render_export",
+    "render_pdf",
+    "shutdown_export_render_service",
+]
@@ -52,6 +52,29 @@ class FileValidator:
         content = await file.read(1024)
         await file.seek(0)  # Reset file pointer
 
+        FileValidator.validate_header(content, expected_type)
+
+        # Additional validation for DOCX (ZIP structure)
+        if (
+            expected_type
+            == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        ):
+            await FileValidator._validate_docx_structure(file)
+
+    @staticmethod
+    def validate_header(content: bytes, expected_type: str) -> None:
+        """
+        Check the leading bytes of a file (e.g. the first chunk of a
+        streamed upload) for magic bytes and forbidden signatures.
+
+        Args:
+            content: First bytes of the file (1024 are enough)
+            expected_type: Expected MIME type of the file
+
+        Raises:
+            ValidationError: If file content is invalid or potentially dangerous
+        """
+        content = content[:1024]
         if not content:
             raise ValidationError("File appears to be empty")
 
@@ -90,13 +113,6 @@ class FileValidator:
                 "File may have been renamed or corrupted."
             )
 
-        # Additional validation for DOCX (ZIP structure)
-        if (
-            expected_type
-            == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        ):
-            await FileValidator._validate_docx_structure(file)
-
     @staticmethod
     async def _validate_docx_structure(file: UploadFile) -> None:
         """
@@ -701,12 +701,15 @@ async def persist_generation_artifact(
     artifact_format: Literal["docx", "pdf"],
     storage_path: str,
     artifact_sha256: str,
+    export_key: str | None = None,
     now: datetime | None = None,
 ) -> str | None:
     """Atomically bind uploaded bytes to the document under the current lease.
 
-    Returns the replaced object path so the caller can remove it after the DB
-    pointer safely references the new object.
+    ``export_key`` is the export model hash that rendered the bytes, so a
+    later export of the unchanged document reuses them. Returns the
+    replaced object path so the caller can remove it after the DB pointer
+    safely references the new object.
     """
     lease = await _lock_generation_lease(
         db,
@@ -731,6 +734,7 @@ async def persist_generation_artifact(
     previous_path = getattr(document, path_field)
     setattr(document, path_field, storage_path)
     setattr(document, hash_field, artifact_sha256)
+    setattr(document, f"{artifact_format}_export_key", export_key)
     await db.commit()
     return str(previous_path) if previous_path else None
 
@@ -0,0 +1,131 @@
+"""
+Negative-result Bloom filter over titles proven absent by a clean cascade.
+
+The LLM reinvents the same plausible-but-nonexistent titles across documents
+on similar topics. A clean NOT_FOUND is cached only under the exact
+(identifier, title, year, authors) tuple, so every variation of an invented
+citation paid the full Crossref -> OpenAlex -> Semantic Scholar -> arXiv
+cascade again.
+
+CitationVerifier adds a normalized title here only when all four title
+searches completed cleanly and none returned a candidate with a similar
+title (year/author vetoes do not count: the title itself may exist). Later
+identifier-less lookups of that title short-circuit to NOT_FOUND.
+
+The filter is a plain Bloom filter stored as Redis bitmaps (SETBIT/GETBIT,
+no RedisBloom module needed), sized from CITATION_NEGATIVE_FILTER_CAPACITY
+and CITATION_NEGATIVE_FILTER_FP_RATE. It is rebuilt periodically by
+generation rotation: writes go to the current generation, reads check the
+current and the previous one, and each bitmap expires two periods after it
+was started. Entries therefore live between one and two rebuild periods -
+a work indexed by the providers later stops being rejected - and saturation
+never accumulates beyond two generations.
+
+Never raises into callers: Redis problems read as "not in the filter".
+"""
+
+import hashlib
+import logging
+import math
+import time
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FILTER_KEY_PREFIX = "citation_negative"
+FILTER_SCHEMA_VERSION = 1
+
+
+def bloom_parameters(capacity: int, fp_rate: float) -> tuple[int, int]:
+    """Optimal (bits, hash count) for ``capacity`` items at ``fp_rate``."""
+    capacity = max(1, capacity)
+    fp_rate = min(max(fp_rate, 1e-9), 0.5)
+    bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class NegativeTitleFilter:
+    """Redis-backed, generation-rotated Bloom filter of absent titles."""
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        fp_rate: float | None = None,
+        rebuild_seconds: int | None = None,
+    ):
+        self.bits, self.hashes = bloom_parameters(
+            capacity or settings.CITATION_NEGATIVE_FILTER_CAPACITY,
+            fp_rate or settings.CITATION_NEGATIVE_FILTER_FP_RATE,
+        )
+        self.rebuild_seconds = max(
+            60,
+            rebuild_seconds
+            or settings.CITATION_NEGATIVE_FILTER_REBUILD_DAYS * 24 * 3600,
+        )
+        self._warned = False
+
+    async def contains(self, redis: aioredis.Redis, norm_title: str) -> bool:
+        """True if the title is (probably) known to be absent."""
+        if not norm_title:
+            return False
+        positions = self._positions(norm_title)
+        generation = self._generation()
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for key in (self._key(generation), self._key(generation - 1)):
+                for position in positions:
+                    pipe.getbit(key, position)
+            bits = await pipe.execute()
+        except Exception as e:
+            self._warn(f"Negative title filter read failed: {e}")
+            return False
+        if len(bits) != 2 * len(positions):
+            return False
+        current, previous = bits[: len(positions)], bits[len(positions) :]
+        return all(current) or all(previous)
+
+    async def add(self, redis: aioredis.Redis, norm_title: str) -> None:
+        """Record a title a clean cascade proved absent."""
+        if not norm_title:
+            return
+        key = self._key(self._generation())
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for position in self._positions(norm_title):
+                pipe.setbit(key, position, 1)
+            pipe.expire(key, 2 * self.rebuild_seconds)
+            await pipe.execute()
+        except Exception as e:
+            self._warn(f"Negative title filter write failed: {e}")
+
+    def _positions(self, norm_title: str) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing over one SHA-256 digest
+        digest = hashlib.sha256(norm_title.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _generation(self) -> int:
+        return int(time.time() // self.rebuild_seconds)
+
+    def _key(self, generation: int) -> str:
+        # Sizing is part of the key: changing capacity/FP rate starts a
+        # fresh filter instead of misreading the old bit layout.
+        return (
+            f"{FILTER_KEY_PREFIX}:v{FILTER_SCHEMA_VERSION}:"
+            f"{self.bits}x{self.hashes}:{generation}"
+        )
+
+    def _warn(self, message: str) -> None:
+        if self._warned:
+            logger.debug(message)
+        else:
+            logger.warning(message)
+            self._warned = True
+
+
+__all__ = ["NegativeTitleFilter", "bloom_parameters"]
@@ -0,0 +1,534 @@
+"""
+Process pool for PDF and DOCX text extraction.
+
+pypdf and python-docx are pure Python: moving them to the blocking thread
+pool (blocking_executor.py) kept them off the event loop's thread, but a
+400-page upload still held the GIL for its whole extraction, so every other
+request, WebSocket heartbeat and generation job on the instance stalled
+with it. Extraction now runs in worker processes.
+
+Per-file limits are enforced inside the worker: a wall-clock alarm
+(PARSING_TIMEOUT_SECONDS) and an address-space budget on top of the
+worker's baseline (PARSING_MEMORY_LIMIT_MB, Linux only). Both surface as
+``ParsingError``, a ValueError, so callers keep reporting an unreadable
+file. A worker that does not answer within the timeout plus a grace period
+(stuck in C code) is killed together with its pool, which is recreated on
+the next call.
+
+Calls are submitted only when a worker is free: at most max_workers per
+event loop are in the pool, the rest wait for a slot on the loop, so the
+hard deadline starts when a worker takes the call and a long queue can
+never look like a stuck worker. A call that waits longer than
+PARSING_QUEUE_TIMEOUT_SECONDS for a slot fails alone with
+``ParsingQueueTimeoutError``; nothing running is touched.
+
+``iter_pdf_pages`` shards a PDF into page ranges of PARSING_BATCH_PAGES
+pages, one pool task per range. The first range reports the page count;
+the rest are extracted in parallel, up to one per worker, and yielded in
+page order, so a caller can start on the first pages and a 400-page file
+uses every worker instead of one. The timeout covers the whole file
+across ranges. PDFs may be passed as bytes or as a path to a local file;
+bytes are written once to a temp file, and each worker memory-maps the
+file rather than receiving a pickled copy per range. ``stats()`` reports
+in-flight and queued calls plus per-label timings; PARSING_MAX_WORKERS=0
+runs the same functions on the blocking thread pool instead (no process
+pool).
+"""
+
+import asyncio
+import contextlib
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from app.core.config import settings
+from app.services.blocking_executor import OffloadTiming, run_blocking
+
+try:  # POSIX only; memory limits are skipped elsewhere.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# PDF bytes, or the path of a local PDF file.
+PdfSource = bytes | str
+
+# Extra time the parent waits past the per-file timeout before it declares
+# the worker stuck (the in-worker alarm could not interrupt it) and kills it.
+HARD_TIMEOUT_GRACE_SECONDS = 5.0
+
+
+class ParsingError(ValueError):
+    """A file could not be parsed within the parsing service's limits."""
+
+
+class ParsingTimeoutError(ParsingError):
+    """Extraction exceeded PARSING_TIMEOUT_SECONDS."""
+
+
+class ParsingQueueTimeoutError(ParsingTimeoutError):
+    """No worker became free within PARSING_QUEUE_TIMEOUT_SECONDS."""
+
+
+# ---------------------------------------------------------------------------
+# Worker side: module-level functions, picklable by reference.
+# ---------------------------------------------------------------------------
+
+
+def read_pdf_pages(
+    source: PdfSource,
+    *,
+    max_pages: int | None = None,
+    start: int = 0,
+    stop: int | None = None,
+) -> tuple[int, list[str]]:
+    """(page count, texts of pages ``start:stop``), order preserved.
+
+    A page whose text cannot be extracted yields "". Raises ValueError for
+    unreadable or encrypted files and files over ``max_pages``. A path is
+    memory-mapped: workers sharing one file read it from the page cache.
+    """
+    with contextlib.ExitStack() as stack:
+        if isinstance(source, str):
+            try:
+                file = stack.enter_context(open(source, "rb"))
+                stream: Any = stack.enter_context(
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+            except (OSError, ValueError) as exc:  # missing or empty file
+                raise ValueError(f"Not a readable PDF: {exc}") from exc
+        else:
+            stream = io.BytesIO(source)
+        return _read_pdf_stream(stream, max_pages, start, stop)
+
+
+def _read_pdf_stream(
+    stream: Any, max_pages: int | None, start: int, stop: int | None
+) -> tuple[int, list[str]]:
+    from pypdf import PdfReader
+
+    try:
+        reader = PdfReader(stream)
+    except Exception as exc:  # encrypted/corrupt
+        raise ValueError(f"Not a readable PDF: {exc}") from exc
+    if reader.is_encrypted:
+        try:
+            reader.decrypt("")
+        except Exception as exc:
+            raise ValueError("Encrypted PDF is not supported") from exc
+    count = len(reader.pages)
+    if max_pages is not None and count > max_pages:
+        raise ValueError(f"PDF has {count} pages; limit is {max_pages}")
+    pages: list[str] = []
+    for index in range(start, count if stop is None else min(stop, count)):
+        try:
+            pages.append(reader.pages[index].extract_text() or "")
+        except Exception:
+            pages.append("")
+    return count, pages
+
+
+def read_docx_paragraphs(data: bytes, *, include_tables: bool = False) -> list[str]:
+    """Body paragraph texts; with ``include_tables`` also table cells,
+    headers and footers, in that order."""
+    from docx import Document as DocxDocument
+
+    doc = DocxDocument(io.BytesIO(data))
+    paragraphs = [paragraph.text for paragraph in doc.paragraphs]
+    if include_tables:
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    paragraphs.extend(p.text for p in cell.paragraphs)
+        for section in doc.sections:
+            for container in (section.header, section.footer):
+                paragraphs.extend(p.text for p in container.paragraphs)
+    return paragraphs
+
+
+def _stage_pdf(data: bytes) -> str:
+    """Write PDF bytes to a temp file the workers can memory-map."""
+    fd, path = tempfile.mkstemp(prefix="parse-", suffix=".pdf")
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    return path
+
+
+def _raise_timeout(signum: int, frame: Any) -> None:
+    raise ParsingTimeoutError("File took too long to parse")
+
+
+def _address_space_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _limited_call(
+    fn: Callable[..., T],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    seconds: float,
+    memory_bytes: int,
+) -> tuple[float, float, T]:
+    """Run ``fn`` in a worker under the per-file limits.
+
+    Returns (wall-clock start, wall-clock end, result) so the parent can
+    split queue wait from run time.
+    """
+    started = time.time()
+    restore_limit: tuple[int, int] | None = None
+    baseline = _address_space_bytes() if resource is not None else None
+    if memory_bytes > 0 and baseline is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        budget = baseline + memory_bytes
+        if hard == resource.RLIM_INFINITY or budget <= hard:
+            resource.setrlimit(resource.RLIMIT_AS, (budget, hard))
+            restore_limit = (soft, hard)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, max(seconds, 0.001))
+    try:
+        result = fn(*args, **kwargs)
+    except MemoryError as exc:
+        raise ParsingError("File needs more memory than the parsing limit") from exc
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if restore_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, restore_limit)
+    return started, time.time(), result
+
+
+# ---------------------------------------------------------------------------
+# Parent side.
+# ---------------------------------------------------------------------------
+
+
+class ParsingService:
+    """Bounded process pool with per-file limits and per-label timing."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        *,
+        timeout_seconds: float | None = None,
+        memory_limit_mb: int | None = None,
+        batch_pages: int | None = None,
+        queue_timeout_seconds: float | None = None,
+    ):
+        self.max_workers = max(
+            0, settings.PARSING_MAX_WORKERS if max_workers is None else max_workers
+        )
+        self.timeout_seconds = float(
+            settings.PARSING_TIMEOUT_SECONDS
+            if timeout_seconds is None
+            else timeout_seconds
+        )
+        self.memory_limit_mb = (
+            settings.PARSING_MEMORY_LIMIT_MB
+            if memory_limit_mb is None
+            else memory_limit_mb
+        )
+        self.batch_pages = max(1, batch_pages or settings.PARSING_BATCH_PAGES)
+        self.queue_timeout_seconds = float(
+            settings.PARSING_QUEUE_TIMEOUT_SECONDS
+            if queue_timeout_seconds is None
+            else queue_timeout_seconds
+        )
+        self._executor: ProcessPoolExecutor | None = None
+        # Worker slots per event loop (asyncio primitives are loop-bound).
+        self._slots: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._timings: dict[str, OffloadTiming] = {}
+        self._in_flight = 0
+        self._timeouts = 0
+        self._queue_timeouts = 0
+        self._restarts = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that runs an event loop and
+                # thread pools.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def run(
+        self,
+        label: str,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``fn(*args, **kwargs)`` in a worker process and await it.
+
+        ``fn`` must be a module-level function. ``timeout`` (default
+        PARSING_TIMEOUT_SECONDS) bounds the call once a worker runs it; the
+        wait for a free worker is bounded by PARSING_QUEUE_TIMEOUT_SECONDS.
+        Exceptions raised by ``fn`` propagate unchanged.
+        """
+        seconds = self.timeout_seconds if timeout is None else timeout
+        if seconds <= 0:
+            self._record(label, 0.0, 0.0, failed=True, timed_out=True)
+            raise ParsingTimeoutError("File took too long to parse")
+        memory_bytes = max(0, self.memory_limit_mb) * 1024 * 1024
+        submitted = time.time()
+        future: Future | None = None
+        with self._lock:
+            self._in_flight += 1
+        try:
+            if self.max_workers == 0:
+                # Thread fallback: limits are best effort, the caller just
+                # stops waiting at the timeout.
+                started = time.time()
+                result = await asyncio.wait_for(
+                    run_blocking(f"parse.{label}", fn, *args, **kwargs), seconds
+                )
+                finished = time.time()
+            else:
+                future = await self._submit(
+                    label, _limited_call, fn, args, kwargs, seconds, memory_bytes
+                )
+                started, finished, result = await asyncio.wait_for(
+                    asyncio.wrap_future(future),
+                    timeout=seconds + HARD_TIMEOUT_GRACE_SECONDS,
+                )
+        except TimeoutError as e:
+            self._record(label, 0.0, time.time() - submitted, True, True)
+            if future is not None:
+                self._recycle(future)
+            raise ParsingTimeoutError("File took too long to parse") from e
+        except BrokenProcessPool as e:
+            self._record(label, 0.0, time.time() - submitted, True, False)
+            self._recycle(None)
+            raise ParsingError("Parsing worker crashed") from e
+        except BaseException as e:
+            timed_out = isinstance(e, ParsingTimeoutError)
+            self._record(label, 0.0, time.time() - submitted, True, timed_out)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        self._record(label, started - submitted, finished - started, False, False)
+        return result
+
+    async def _submit(self, label: str, *call: Any) -> Future:
+        """Submit once a worker slot is free; the slot is held until the
+        worker is done with the call, even if the caller stops waiting."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = asyncio.Semaphore(self.max_workers)
+        try:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout_seconds)
+        except TimeoutError as e:
+            with self._lock:
+                self._queue_timeouts += 1
+            raise ParsingQueueTimeoutError(
+                f"No parsing worker free for {label}; try again later"
+            ) from e
+        try:
+            future = self._pool().submit(*call)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: _release_slot(loop, slots))
+        return future
+
+    def _recycle(self, future: Future | None) -> None:
+        """Kill a pool whose worker stopped answering; the next call
+        starts a fresh one."""
+        if future is not None and future.cancel():
+            return  # still queued: nothing is stuck
+        with self._lock:
+            executor, self._executor = self._executor, None
+            if executor is None:
+                return
+            self._restarts += 1
+        # Killed workers break the pool: its pending calls fail with
+        # BrokenProcessPool (a ParsingError to their callers).
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.kill()
+        executor.shutdown(wait=False)
+        logger.warning("Parsing pool restarted after a stuck or crashed worker")
+
+    def _record(
+        self,
+        label: str,
+        waited: float,
+        elapsed: float,
+        failed: bool,
+        timed_out: bool,
+    ) -> None:
+        with self._lock:
+            timing = self._timings.setdefault(label, OffloadTiming())
+            timing.calls += 1
+            timing.errors += int(failed)
+            timing.seconds += elapsed
+            timing.max_seconds = max(timing.max_seconds, elapsed)
+            timing.wait_seconds += max(waited, 0.0)
+            timing.max_wait_seconds = max(timing.max_wait_seconds, waited)
+            self._timeouts += int(timed_out)
+
+    async def iter_pdf_pages(
+        self, source: PdfSource, *, max_pages: int | None = None
+    ) -> AsyncIterator[str]:
+        """Page texts in 1-based order, extracted in parallel page ranges."""
+        deadline = time.monotonic() + self.timeout_seconds
+        staged: str | None = None
+        if isinstance(source, bytes) and self.max_workers > 0:
+            staged = await run_blocking("file.write", _stage_pdf, source)
+            source = staged
+        pending: deque[asyncio.Future] = deque()
+        try:
+            count, pages = await self._pdf_range(source, 0, max_pages, deadline)
+            for page in pages:
+                yield page
+            starts = iter(range(self.batch_pages, count, self.batch_pages))
+            for start in starts:
+                pending.append(self._pdf_range_task(source, start, max_pages, deadline))
+                if len(pending) >= max(1, self.max_workers):
+                    break
+            while pending:
+                _, pages = await pending.popleft()
+                following = next(starts, None)
+                if following is not None:
+                    pending.append(
+                        self._pdf_range_task(source, following, max_pages, deadline)
+                    )
+                for page in pages:
+                    yield page
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if staged is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(staged)
+
+    def _pdf_range_task(
+        self,
+        source: PdfSource,
+        start: int,
+        max_pages: int | None,
+        deadline: float,
+    ) -> asyncio.Future:
+        return asyncio.ensure_future(
+            self._pdf_range(source, start, max_pages, deadline)
+        )
+
+    async def _pdf_range(
+        self,
+        source: PdfSource,
+        start: int,
+        max_pages: int | None,
+        deadline: float,
+    ) -> tuple[int, list[str]]:
+        return await self.run(
+            "pdf.pages",
+            read_pdf_pages,
+            source,
+            max_pages=max_pages,
+            start=start,
+            stop=start + self.batch_pages,
+            timeout=deadline - time.monotonic(),
+        )
+
+    async def pdf_pages(
+        self, source: PdfSource, *, max_pages: int | None = None
+    ) -> list[str]:
+        """All page texts of a PDF (see ``iter_pdf_pages``)."""
+        return [page async for page in self.iter_pdf_pages(source, max_pages=max_pages)]
+
+    async def docx_paragraphs(
+        self, data: bytes, *, include_tables: bool = False
+    ) -> list[str]:
+        """Paragraph texts of a DOCX (see ``read_docx_paragraphs``)."""
+        return await self.run(
+            "docx.paragraphs",
+            read_docx_paragraphs,
+            data,
+            include_tables=include_tables,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - max(self.max_workers, 1)),
+                "timeouts": self._timeouts,
+                "queue_timeouts": self._queue_timeouts,
+                "restarts": self._restarts,
+                "calls": {
+                    label: timing.to_dict()
+                    for label, timing in sorted(self._timings.items())
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _release_slot(loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore) -> None:
+    # Runs on the pool's management thread when a call finishes.
+    with contextlib.suppress(RuntimeError):  # loop already closed
+        loop.call_soon_threadsafe(slots.release)
+
+
+_parsing_service: ParsingService | None = None
+
+
+def get_parsing_service() -> ParsingService:
+    """Process-wide parsing pool shared by every upload path."""
+    global _parsing_service
+    if _parsing_service is None:
+        _parsing_service = ParsingService()
+    return _parsing_service
+
+
+def shutdown_parsing_service() -> None:
+    """Stop the worker processes (application shutdown)."""
+    if _parsing_service is not None:
+        _parsing_service.shutdown()
+
+
+__all__ = [
+    "ParsingError",
+    "ParsingQueueTimeoutError",
+    "ParsingService",
+    "ParsingTimeoutError",
+    "PdfSource",
+    "get_parsing_service",
+    "read_docx_paragraphs",
+    "read_pdf_pages",
+    "shutdown_parsing_service",
+]
@@ -0,0 +1,265 @@
+"""
+Cluster-wide per-provider rate limiting for the bibliographic APIs.
+
+The *_RATE_LIMIT_RPS settings are polite-use budgets for the whole
+deployment, yet every generation job creates its own CitationVerifier and
+RAGRetriever, so per-instance spacing let N concurrent jobs hit Crossref /
+OpenAlex / Semantic Scholar / arXiv at N times the configured rate and get
+throttled into retries.
+
+Call starts are scheduled with GCRA: one "theoretical arrival time" (TAT)
+per provider. ``acquire`` atomically reserves the next slot and sleeps until
+it; the reservation is a single Lua script against Redis, so every process
+draws from the same schedule. A 429 pushes the shared TAT past the
+provider's Retry-After, so the whole cluster backs off, not only the caller
+that was throttled. Providers without a budget (RPS 0) still reserve, with a
+zero interval, so they honour those penalties too.
+
+Without Redis (not initialized, unreachable, or
+PROVIDER_RATE_LIMIT_DISTRIBUTED off) the same schedule runs in-process and is
+shared by every verifier/retriever in this process. The reservation itself
+never awaits, so the limiter holds no asyncio primitive and is safe to share
+across event loops. Never raises into callers.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, cast
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.middleware.rate_limit import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RATE_KEY_PREFIX = "provider_rate"
+
+# Provider name -> settings field holding its requests-per-second budget.
+# Names match the PROVIDER_* constants of citation_verifier.py.
+_RATE_SETTINGS = {
+    "crossref": "CROSSREF_RATE_LIMIT_RPS",
+    "openalex": "OPENALEX_RATE_LIMIT_RPS",
+    "semantic_scholar": "SEMANTIC_SCHOLAR_RATE_LIMIT_RPS",
+    "arxiv": "ARXIV_RATE_LIMIT_RPS",
+}
+
+# Reserve the next slot. Server time (TIME) keeps every host on one clock;
+# the key expires shortly after the schedule drains, so idle providers leave
+# nothing behind. Returns the wait in milliseconds.
+_ACQUIRE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then tat = now end
+local next_tat = tat + tonumber(ARGV[1])
+redis.call('SET', KEYS[1], next_tat, 'PX', next_tat - now + 1000)
+return tat - now
+"""
+
+# Push the schedule to at least now + ARGV[1] ms (never pull it forward).
+_PENALIZE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local resume_at = now + tonumber(ARGV[1])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < resume_at then
+  redis.call('SET', KEYS[1], resume_at, 'PX', resume_at - now + 1000)
+end
+return 0
+"""
+
+
+def provider_rates_from_settings() -> dict[str, float]:
+    """Current per-provider RPS budgets from settings."""
+    return {
+        provider: float(getattr(settings, field))
+        for provider, field in _RATE_SETTINGS.items()
+    }
+
+
+def retry_after_seconds(headers: Any) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date); None if absent
+    or malformed. Clamped to PROVIDER_RATE_LIMIT_MAX_RETRY_AFTER_SECONDS."""
+    try:
+        raw = headers.get("Retry-After")
+    except Exception:
+        return None
+    if not isinstance(raw, str) or not raw.strip():
+        return None
+    raw = raw.strip()
+    try:
+        seconds = float(raw)
+    except ValueError:
+        try:
+            resume_at = parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            return None
+        if resume_at.tzinfo is None:
+            resume_at = resume_at.replace(tzinfo=UTC)
+        seconds = (resume_at - datetime.now(UTC)).total_seconds()
+    return max(0.0, min(seconds, settings.PROVIDER_RATE_LIMIT_MAX_RETRY_AFTER_SECONDS))
+
+
+@dataclass
+class ProviderWaitStats:
+    """Per-provider scheduling counters (process-local)."""
+
+    calls: int = 0
+    waited_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    throttled: int = 0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "waited_seconds": round(self.waited_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "throttled": self.throttled,
+        }
+
+
+class ProviderRateLimiter:
+    """GCRA call scheduler per provider, Redis-shared with local fallback."""
+
+    def __init__(
+        self,
+        rates_rps: dict[str, float] | None = None,
+        *,
+        redis_client: aioredis.Redis | None = None,
+        distributed: bool | None = None,
+    ):
+        rates = provider_rates_from_settings()
+        if rates_rps:
+            rates.update(rates_rps)
+        self._intervals = {p: (1.0 / r if r > 0 else 0.0) for p, r in rates.items()}
+        self._redis = redis_client
+        self.distributed = (
+            settings.PROVIDER_RATE_LIMIT_DISTRIBUTED
+            if distributed is None
+            else distributed
+        )
+        self._local_tat: dict[str, float] = {}
+        self._stats: dict[str, ProviderWaitStats] = {}
+        self._redis_warned = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def acquire(self, provider: str) -> float:
+        """Wait for this provider's next call slot; returns seconds waited."""
+        interval = self._intervals.get(provider, 0.0)
+        stats = self._stats.setdefault(provider, ProviderWaitStats())
+        stats.calls += 1
+        # Reserve even without a budget: a 429 penalty still holds the call.
+        wait = await self._reserve(provider, interval)
+        if wait > 0:
+            stats.waited_seconds += wait
+            stats.max_wait_seconds = max(stats.max_wait_seconds, wait)
+            await asyncio.sleep(wait)
+        return wait
+
+    async def penalize(self, provider: str, retry_after: float | None) -> None:
+        """Record a 429: hold every caller of ``provider`` for ``retry_after``
+        seconds (fallback: one regular interval) from now."""
+        self._stats.setdefault(provider, ProviderWaitStats()).throttled += 1
+        pause = (
+            retry_after
+            if retry_after is not None
+            else self._intervals.get(provider, 0.0)
+        )
+        if pause <= 0:
+            return
+        logger.info(f"Provider {provider} throttled (429); pausing {pause:.1f}s")
+        redis = self._shared_redis()
+        if redis is not None:
+            try:
+                await self._run_script(
+                    redis, _PENALIZE_SCRIPT, provider, int(pause * 1000)
+                )
+                return
+            except Exception as e:
+                self._warn_redis(f"Provider rate limiter Redis write failed: {e}")
+        resume_at = time.monotonic() + pause
+        self._local_tat[provider] = max(self._local_tat.get(provider, 0.0), resume_at)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per-provider call/wait/throttle counters since process start."""
+        return {p: s.to_dict() for p, s in sorted(self._stats.items())}
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    async def _reserve(self, provider: str, interval: float) -> float:
+        redis = self._shared_redis()
+        if redis is not None:
+            try:
+                wait_ms = await self._run_script(
+                    redis,
+                    _ACQUIRE_SCRIPT,
+                    provider,
+                    max(1, int(interval * 1000)) if interval > 0 else 0,
+                )
+                return max(0.0, int(wait_ms) / 1000.0)
+            except Exception as e:
+                self._warn_redis(
+                    f"Provider rate limiter Redis unavailable, using local "
+                    f"schedule: {e}"
+                )
+        # No await between read and write: atomic within the event loop.
+        now = time.monotonic()
+        tat = max(now, self._local_tat.get(provider, 0.0))
+        self._local_tat[provider] = tat + interval
+        return tat - now
+
+    def _shared_redis(self) -> aioredis.Redis | None:
+        if not self.distributed:
+            return None
+        return self._redis if self._redis is not None else get_redis_client()
+
+    @staticmethod
+    def _key(provider: str) -> str:
+        return f"{RATE_KEY_PREFIX}:{provider}"
+
+    @classmethod
+    async def _run_script(
+        cls, redis: aioredis.Redis, script: str, provider: str, arg_ms: int
+    ) -> Any:
+        # redis-py annotates eval for the sync and async clients at once
+        # (and its key/argument varargs as lists); the asyncio client awaits.
+        keys_and_args: list[Any] = [cls._key(provider), arg_ms]
+        return await cast(Awaitable[Any], redis.eval(script, 1, *keys_and_args))
+
+    def _warn_redis(self, message: str) -> None:
+        if self._redis_warned:
+            logger.debug(message)
+        else:
+            logger.warning(message)
+            self._redis_warned = True
+
+
+_shared_limiter: ProviderRateLimiter | None = None
+
+
+def get_provider_rate_limiter() -> ProviderRateLimiter:
+    """Process-wide limiter configured from settings (created on first use)."""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = ProviderRateLimiter()
+    return _shared_limiter
+
+
+__all__ = [
+    "ProviderRateLimiter",
+    "ProviderWaitStats",
+    "get_provider_rate_limiter",
+    "provider_rates_from_settings",
+    "retry_after_seconds",
+]
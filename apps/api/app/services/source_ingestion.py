@@ -0,0 +1,442 @@
+"""
+Background ingestion of uploaded source PDFs.
+
+The upload endpoint used to read, parse, derive metadata, split passages
+and write every page inside one request. A 400-page PDF kept the request
+open for its whole parse, so uploads were rate-limited to 30/hour and
+twenty readings uploaded at once timed out.
+
+Now the endpoint only stages the upload (``stage_upload``: copied from
+the request spool to a private temp file chunk by chunk, hashed and
+header-checked on the way, so a request never holds the whole PDF in
+memory), streams it to storage, inserts the DocumentSourceFile row with
+status "pending" and a provisional citation key, then returns. ``ingest_source_file`` does the rest off the
+request: pending -> processing -> parsed | no_text_layer | failed. Parsing
+goes through the parsing process pool (parsing_service.py), so many
+parallel uploads queue there instead of competing for the event loop; the
+workers read the staged file by path, which ingestion deletes when done.
+
+Progress is pushed to the owner's WebSockets as ``source_ingestion``
+events and can be polled at GET /documents/{id}/sources/files/{file_id}/
+status. Metadata the manager already corrected while the file was pending
+is kept. While any file is ingesting, uploaded_sources_blockers() blocks
+generation.
+
+An ingestion claims its row atomically (pending -> processing) with a
+lease token that expires after SOURCE_INGESTION_LEASE_SECONDS, so two
+processes never parse one file. ``resume_source_ingestion`` at startup
+picks up pending rows and processing rows whose lease expired (their
+process died); files another live process is parsing are left alone.
+The final write re-checks the row and the token under the document lock,
+so a file deleted or reclaimed meanwhile is simply dropped.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import secrets
+import tempfile
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, BinaryIO
+
+from fastapi import UploadFile
+from sqlalchemy import and_, or_, select, update
+
+from app.core import database
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.models.document import Document, DocumentSourceFile, SourceFilePage
+from app.services import uploaded_sources
+from app.services.blocking_executor import run_blocking
+from app.services.file_validator import FileValidator
+from app.services.storage_service import StorageService
+from app.services.uploaded_pack_cache import invalidate_uploaded_pack
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied from the request spool per step while staging an upload.
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Startup resumptions, referenced so they are not garbage-collected.
+_resumed_tasks: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True, slots=True)
+class StagedUpload:
+    """An uploaded PDF copied to a local temp file, hashed on the way."""
+
+    path: str
+    sha256: str
+    size: int
+
+
+def _temp_path() -> str:
+    fd, path = tempfile.mkstemp(prefix="source-", suffix=".pdf")
+    os.close(fd)
+    return path
+
+
+def discard_staged(path: str) -> None:
+    """Delete a staged copy; missing files are fine."""
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+def _write_chunk(out: BinaryIO, digest: Any, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def stage_upload(file: UploadFile) -> StagedUpload:
+    """Copy an upload to a temp file ``UPLOAD_CHUNK_BYTES`` at a time.
+
+    The first chunk is checked for PDF magic bytes (FileValidator) and the
+    size limit is enforced while reading, so a bad or oversized upload is
+    rejected without being read whole. Raises ValidationError/ValueError;
+    the copy is removed on failure.
+    """
+    path = _temp_path()
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                if size == 0:
+                    FileValidator.validate_header(chunk, "application/pdf")
+                size += len(chunk)
+                uploaded_sources.check_source_size(size)
+                await run_blocking("file.write", _write_chunk, out, digest, chunk)
+        if size == 0:
+            raise ValidationError("Empty file")
+    except BaseException:
+        discard_staged(path)
+        raise
+    return StagedUpload(path=path, sha256=digest.hexdigest(), size=size)
+
+
+def provisional_citation_key(digest: str) -> str:
+    """Unique-per-document placeholder until metadata is derived."""
+    return f"pending-{digest[:12]}"
+
+
+def source_file_status(source_file: DocumentSourceFile) -> dict[str, Any]:
+    """Status payload shared by the upload, status endpoint and events."""
+    status = str(source_file.status)
+    warning = None
+    if status == "no_text_layer":
+        warning = (
+            "No text layer detected (scanned PDF?) — this source will not be "
+            "used for grounding"
+        )
+    elif status == "failed":
+        warning = f"Could not read this PDF: {source_file.ingestion_error}"
+    return {
+        "id": int(source_file.id),
+        "document_id": int(source_file.document_id),
+        "citation_key": source_file.citation_key,
+        "filename": source_file.filename,
+        "title": source_file.title,
+        "authors": source_file.authors,
+        "year": source_file.year,
+        "page_count": int(source_file.page_count or 0),
+        "status": status,
+        "ingesting": status in uploaded_sources.INGESTING_STATUSES,
+        "metadata_incomplete": bool(source_file.metadata_incomplete),
+        "ingestion_error": source_file.ingestion_error,
+        "warning": warning,
+    }
+
+
+async def _notify(user_id: int | None, payload: dict[str, Any]) -> None:
+    if user_id is None:
+        return
+    try:
+        await manager.send_progress(user_id, {"type": "source_ingestion", **payload})
+    except Exception as e:  # a closed socket must not fail ingestion
+        logger.warning(f"Failed to send source ingestion update: {e}")
+
+
+def _claimable(now: datetime) -> Any:
+    """Rows no live ingestion holds: pending, or processing past its lease."""
+    return or_(
+        DocumentSourceFile.status == "pending",
+        and_(
+            DocumentSourceFile.status == "processing",
+            or_(
+                DocumentSourceFile.ingestion_lease_expires_at.is_(None),
+                DocumentSourceFile.ingestion_lease_expires_at <= now,
+            ),
+        ),
+    )
+
+
+async def _claim(source_file_id: int) -> tuple[dict[str, Any], int | None] | None:
+    """Lease a claimable file as processing; None when there is nothing to do."""
+    now = datetime.now(UTC)
+    token = secrets.token_hex(16)
+    async with database.AsyncSessionLocal() as db:
+        claimed = await db.execute(
+            update(DocumentSourceFile)
+            .where(DocumentSourceFile.id == source_file_id, _claimable(now))
+            .values(
+                status="processing",
+                ingestion_lease_token=token,
+                ingestion_lease_expires_at=now
+                + timedelta(seconds=settings.SOURCE_INGESTION_LEASE_SECONDS),
+            )
+        )
+        if claimed.rowcount != 1:
+            await db.rollback()
+            return None
+        source_file = await db.get(DocumentSourceFile, source_file_id)
+        if source_file is None:
+            await db.rollback()
+            return None
+        user_id = (
+            await db.execute(
+                select(Document.user_id).where(Document.id == source_file.document_id)
+            )
+        ).scalar_one_or_none()
+        await db.commit()
+        return (
+            source_file_status(source_file)
+            | {
+                "storage_path": source_file.storage_path,
+                "sha256": source_file.sha256,
+                "lease_token": token,
+            },
+            user_id,
+        )
+
+
+async def ingest_source_file(
+    source_file_id: int, staged_path: str | None = None
+) -> str | None:
+    """Parse one uploaded file and record the result.
+
+    ``staged_path`` is the upload's staged copy when called right after the
+    upload (deleted here once parsed); otherwise the stored object is
+    downloaded to a temp file. Returns the final status, or None when the
+    file was already ingested or has been deleted.
+    """
+    try:
+        return await _ingest(source_file_id, staged_path)
+    finally:
+        if staged_path is not None:
+            discard_staged(staged_path)
+
+
+async def _ingest(source_file_id: int, staged_path: str | None) -> str | None:
+    claimed = await _claim(source_file_id)
+    if claimed is None:
+        return None
+    state, user_id = claimed
+    filename = str(state["filename"])
+    await _notify(user_id, _event(state))
+
+    outcome: dict[str, Any]
+    downloaded: str | None = None
+    try:
+        path = staged_path
+        if path is None:
+            path = downloaded = _temp_path()
+            await StorageService().download_to_path(str(state["storage_path"]), path)
+        pages = await uploaded_sources.parse_pdf_pages(path)
+        meta = await run_blocking(
+            "pypdf.metadata",
+            uploaded_sources.derive_source_metadata,
+            filename,
+            path,
+            pages,
+        )
+        text_chars = sum(len(p) for p in pages)
+        has_text_layer = bool(pages) and (
+            text_chars / max(1, len(pages)) >= uploaded_sources.MIN_TEXT_CHARS_PER_PAGE
+        )
+        text_pages = [
+            (page_number, text)
+            for page_number, text in enumerate(pages, start=1)
+            if text.strip()
+        ]
+        passage_set = None
+        if has_text_layer:
+            # Split and tokenize once here instead of on every job start.
+            passage_set = await run_blocking(
+                "passages.encode",
+                uploaded_sources.passage_set_for,
+                source_file_id,
+                str(state["sha256"]),
+                text_pages,
+            )
+        outcome = {
+            "status": "parsed" if has_text_layer else "no_text_layer",
+            "meta": meta,
+            "page_count": len(pages),
+            "text_chars": text_chars,
+            "text_pages": text_pages if has_text_layer else [],
+            "passage_set": passage_set,
+        }
+    except ValueError as e:
+        outcome = {"status": "failed", "error": str(e)[:500]}
+    except Exception as e:
+        logger.error(f"Ingestion of source file {source_file_id} failed: {e}")
+        outcome = {"status": "failed", "error": "the file could not be processed"}
+    finally:
+        if downloaded is not None:
+            discard_staged(downloaded)
+
+    token = str(state["lease_token"])
+    try:
+        final = await _record(source_file_id, token, outcome)
+    except Exception as e:
+        logger.error(f"Recording ingestion of source file {source_file_id}: {e}")
+        final = await _record(
+            source_file_id,
+            token,
+            {"status": "failed", "error": "the file could not be processed"},
+        )
+    if final is None:
+        return None
+    await invalidate_uploaded_pack(int(final["document_id"]))
+    logger.info(
+        "Ingested source %s of document %s: %s pages, status=%s",
+        final["citation_key"],
+        final["document_id"],
+        final["page_count"],
+        final["status"],
+    )
+    await _notify(user_id, _event(final))
+    return str(final["status"])
+
+
+async def _record(
+    source_file_id: int, token: str, outcome: dict[str, Any]
+) -> dict[str, Any] | None:
+    async with database.AsyncSessionLocal() as db:
+        source_file = await db.get(DocumentSourceFile, source_file_id)
+        if source_file is None:
+            return None
+        # Same lock order as every source mutation: the document first, so
+        # concurrent ingestions of one document pick distinct citation keys.
+        await db.execute(
+            select(Document.id)
+            .where(Document.id == source_file.document_id)
+            .with_for_update()
+        )
+        source_file = (
+            await db.execute(
+                select(DocumentSourceFile)
+                .where(DocumentSourceFile.id == source_file_id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+        ).scalar_one_or_none()
+        if (
+            source_file is None
+            or source_file.status != "processing"
+            or source_file.ingestion_lease_token != token
+        ):
+            return None  # deleted, or reclaimed and finished elsewhere
+
+        source_file.ingestion_lease_token = None
+        source_file.ingestion_lease_expires_at = None
+        if outcome["status"] == "failed":
+            source_file.status = "failed"
+            source_file.ingestion_error = outcome["error"]
+            source_file.metadata_incomplete = True
+            await db.commit()
+            return source_file_status(source_file)
+
+        meta = outcome["meta"]
+        existing_keys = set(
+            (
+                await db.execute(
+                    select(DocumentSourceFile.citation_key).where(
+                        DocumentSourceFile.document_id == source_file.document_id,
+                        DocumentSourceFile.id != source_file_id,
+                    )
+                )
+            ).scalars()
+        )
+        source_file.citation_key = uploaded_sources.unique_citation_key(
+            str(meta["citation_key"]), existing_keys
+        )
+        # Corrections the manager made while the file was pending win.
+        if source_file.title is None and meta["title"]:
+            source_file.title = str(meta["title"])
+        if source_file.authors is None and meta["authors"]:
+            source_file.authors = str(meta["authors"])
+        if source_file.year is None and meta["year"]:
+            source_file.year = int(meta["year"])
+        source_file.metadata_incomplete = not (
+            str(source_file.authors or "").strip() and source_file.year
+        )
+        source_file.page_count = outcome["page_count"]
+        source_file.text_chars = outcome["text_chars"]
+        source_file.status = outcome["status"]
+        source_file.ingestion_error = None
+        for page_number, text in outcome["text_pages"]:
+            db.add(
+                SourceFilePage(
+                    source_file_id=source_file_id,
+                    page_number=page_number,
+                    text=text,
+                )
+            )
+        if outcome["passage_set"] is not None:
+            db.add(outcome["passage_set"])
+        await db.commit()
+        return source_file_status(source_file)
+
+
+def _event(state: dict[str, Any]) -> dict[str, Any]:
+    return {"source_file_id": state["id"]} | {
+        key: state[key]
+        for key in (
+            "document_id",
+            "citation_key",
+            "filename",
+            "status",
+            "page_count",
+            "metadata_incomplete",
+            "warning",
+        )
+    }
+
+
+async def resume_source_ingestion() -> int:
+    """Restart ingestion of files a previous process left unfinished.
+
+    Files leased by a live process are skipped; a pending file queued by
+    another process is claimed by whichever ingestion gets there first.
+    """
+    async with database.AsyncSessionLocal() as db:
+        file_ids = list(
+            (
+                await db.execute(
+                    select(DocumentSourceFile.id).where(_claimable(datetime.now(UTC)))
+                )
+            ).scalars()
+        )
+    for file_id in file_ids:
+        task = asyncio.create_task(ingest_source_file(int(file_id)))
+        _resumed_tasks.add(task)
+        task.add_done_callback(_resumed_tasks.discard)
+    if file_ids:
+        logger.info(f"Resumed ingestion of {len(file_ids)} uploaded source file(s)")
+    return len(file_ids)
+
+
+__all__ = [
+    "StagedUpload",
+    "discard_staged",
+    "ingest_source_file",
+    "provisional_citation_key",
+    "resume_source_ingestion",
+    "source_file_status",
+    "stage_upload",
+]
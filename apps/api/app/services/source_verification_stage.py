@@ -30,6 +30,7 @@ from app.models.document import (
 )
 from app.services.ai_pipeline.source_identity import sources_equivalent
 from app.services.ai_pipeline.source_pack import SourcePack
+from app.services.bibliographic_index import get_bibliographic_index
 from app.services.citation_verifier import (
     FUZZY_MATCH_THRESHOLD,
     SourceInput,
@@ -69,6 +70,15 @@ def map_verification_status(result: VerificationResult) -> str:
     return "failed"  # VerificationStatus.UNRESOLVABLE
 
 
+async def index_document_sources(sources: list[Any]) -> None:
+    """Feed provider-backed sources into the local bibliographic index so
+    later verifications of the same works resolve without the network.
+    Never raises (the index swallows its own failures)."""
+    index = get_bibliographic_index()
+    if index is not None and sources:
+        await index.record_sources(sources)
+
+
 async def persist_cited_sources(
     db: AsyncSession,
     document_id: int,
@@ -94,7 +104,7 @@ async def persist_cited_sources(
         existing_rows = safe_scalars_all(
             existing_result, f"existing_sources_doc_{document_id}"
         )
-        added = 0
+        added: list[dict[str, Any]] = []
         for source in cited_sources:
             title = (source.get("title") or "").strip()
             if not title:
@@ -122,14 +132,15 @@ async def persist_cited_sources(
             )
             db.add(row)
             existing_rows.append(row)
-            added += 1
+            added.append(source)
 
         if added:
             await db.commit()
             logger.info(
-                f"✅ Persisted {added} cited source(s) for document {document_id} "
-                f"(section {section_id})"
+                f"✅ Persisted {len(added)} cited source(s) for document "
+                f"{document_id} (section {section_id})"
             )
+            await index_document_sources(added)
     except Exception as e:
         # ⚠️ Non-critical: source persistence must never break generation
         logger.warning(
@@ -171,6 +182,9 @@ async def persist_source_pack(
             f"✅ Persisted source pack for document {document_id}: "
             f"{inserted} inserted, {updated} updated"
         )
+        await index_document_sources(
+            [packed.source for packed in pack.canonical_sources()]
+        )
     except Exception as e:
         # ⚠️ Non-critical: pack persistence must never break generation.
         logger.warning(
@@ -7,7 +7,8 @@ Replaces duplicated MinIO client code across:
 - document_service.py verify_file_storage + upload
 
 Design principles:
-- Async everywhere (FastAPI requirement)
+- Async everywhere (FastAPI requirement); the synchronous MinIO SDK calls
+  run on the blocking executor, never on the event loop
 - Lazy client initialization (not at import time)
 - Type hints (mypy compliance)
 - Error handling: S3Error → HTTPException/bool
@@ -28,9 +29,14 @@ from minio import Minio
 from minio.error import S3Error
 
 from app.core.config import settings
+from app.services.blocking_executor import run_blocking
 
 logger = logging.getLogger(__name__)
 
+# Part size of streamed multipart uploads (the S3 minimum). A file upload
+# holds at most one part in memory.
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
 
 class StorageService:
     """Centralized MinIO/S3 storage operations."""
@@ -111,7 +117,9 @@ class StorageService:
 
             logger.info(f"Uploading file: {object_name} ({file_size} bytes)")
 
-            self.client.put_object(
+            await run_blocking(
+                "minio.put_object",
+                self.client.put_object,
                 settings.MINIO_BUCKET,
                 object_name,
                 file_stream,
@@ -129,6 +137,49 @@ class StorageService:
                 status_code=500, detail=f"Failed to upload file: {str(e)}"
             ) from e
 
+    async def upload_path(
+        self,
+        object_name: str,
+        path: str,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """
+        Upload a local file to MinIO, streamed in multipart parts.
+
+        Args:
+            object_name: Path in bucket (e.g., "documents/user_id/doc_id/file.pdf")
+            path: Local file to upload; it is read part by part, never whole
+            content_type: MIME type (default: application/octet-stream)
+
+        Returns:
+            str: S3 path (s3://bucket/object_name)
+
+        Raises:
+            HTTPException: If upload fails
+        """
+        try:
+            logger.info(f"Uploading file: {object_name} (from {path})")
+
+            await run_blocking(
+                "minio.fput_object",
+                self.client.fput_object,
+                settings.MINIO_BUCKET,
+                object_name,
+                path,
+                content_type=content_type,
+                part_size=MULTIPART_PART_SIZE,
+            )
+
+            s3_path = f"s3://{settings.MINIO_BUCKET}/{object_name}"
+            logger.info(f"✅ Uploaded to MinIO: {s3_path}")
+            return s3_path
+
+        except S3Error as e:
+            logger.error(f"MinIO upload failed: {e}")
+            raise HTTPException(
+                status_code=500, detail=f"Failed to upload file: {str(e)}"
+            ) from e
+
     async def download_file(self, file_path: str) -> bytes:
         """
         Download file from MinIO.
@@ -147,10 +198,9 @@ class StorageService:
 
             logger.info(f"Downloading file: {object_name}")
 
-            response = self.client.get_object(bucket_name, object_name)
-            data = response.read()
-            response.close()
-            response.release_conn()
+            data = await run_blocking(
+                "minio.get_object", self._read_object, bucket_name, object_name
+            )
 
             logger.info(f"✅ Downloaded from MinIO: {object_name} ({len(data)} bytes)")
             return bytes(data)  # Explicit cast to bytes
@@ -165,6 +215,38 @@ class StorageService:
                     status_code=500, detail=f"Failed to download file: {str(e)}"
                 ) from e
 
+    async def download_to_path(self, file_path: str, path: str) -> None:
+        """
+        Download file from MinIO into a local file, streamed to disk.
+
+        Args:
+            file_path: S3 path (s3://bucket/path) or object name
+            path: Local destination, overwritten
+
+        Raises:
+            HTTPException: 404 if not found, 500 if download fails
+        """
+        try:
+            bucket_name, object_name = self._parse_path(file_path)
+            await run_blocking(
+                "minio.fget_object",
+                self.client.fget_object,
+                bucket_name,
+                object_name,
+                path,
+            )
+            logger.info(f"✅ Downloaded from MinIO: {object_name} (to {path})")
+
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                logger.warning(f"File not found: {file_path}")
+                raise HTTPException(status_code=404, detail="File not found") from e
+            else:
+                logger.error(f"MinIO download failed: {e}")
+                raise HTTPException(
+                    status_code=500, detail=f"Failed to download file: {str(e)}"
+                ) from e
+
     async def download_file_stream(self, file_path: str) -> AsyncGenerator[bytes, None]:
         """
         Stream file from MinIO (for large files).
@@ -183,15 +265,22 @@ class StorageService:
 
             logger.info(f"Streaming file: {object_name}")
 
-            response = self.client.get_object(bucket_name, object_name)
+            response = await run_blocking(
+                "minio.get_object", self.client.get_object, bucket_name, object_name
+            )
 
-            # Stream in chunks
+            # Stream in chunks; each socket read happens on the worker pool
             chunk_size = 8192  # 8KB chunks
-            for chunk in response.stream(chunk_size):
-                yield chunk
-
-            response.close()
-            response.release_conn()
+            chunks = response.stream(chunk_size)
+            try:
+                while True:
+                    chunk = await run_blocking("minio.read", next, chunks, None)
+                    if chunk is None:
+                        break
+                    yield chunk
+            finally:
+                response.close()
+                response.release_conn()
             logger.info(f"✅ Streamed from MinIO: {object_name}")
 
         except S3Error as e:
@@ -223,7 +312,12 @@ class StorageService:
 
             logger.info(f"Deleting file: {object_name}")
 
-            self.client.remove_object(bucket_name, object_name)
+            await run_blocking(
+                "minio.remove_object",
+                self.client.remove_object,
+                bucket_name,
+                object_name,
+            )
             logger.info(f"✅ Deleted from MinIO: {object_name}")
             return True
 
@@ -256,7 +350,9 @@ class StorageService:
         """
         try:
             bucket_name, object_name = self._parse_path(file_path)
-            self.client.stat_object(bucket_name, object_name)
+            await run_blocking(
+                "minio.stat_object", self.client.stat_object, bucket_name, object_name
+            )
             return True
         except S3Error:
             return False
@@ -264,12 +360,27 @@ class StorageService:
     async def get_file_size(self, file_path: str) -> int:
         """Return stored object size, raising if storage cannot confirm it."""
         bucket_name, object_name = self._parse_path(file_path)
-        stat = self.client.stat_object(bucket_name, object_name)
+        stat = await run_blocking(
+            "minio.stat_object", self.client.stat_object, bucket_name, object_name
+        )
         return int(stat.size)
 
     async def get_file_sha256(self, file_path: str) -> str:
         """Hash the exact stored bytes so review cannot bind to a mutable path."""
         bucket_name, object_name = self._parse_path(file_path)
+        return await run_blocking(
+            "minio.sha256", self._hash_object, bucket_name, object_name
+        )
+
+    def _read_object(self, bucket_name: str, object_name: str) -> bytes:
+        response = self.client.get_object(bucket_name, object_name)
+        try:
+            return bytes(response.read())
+        finally:
+            response.close()
+            response.release_conn()
+
+    def _hash_object(self, bucket_name: str, object_name: str) -> str:
         response = self.client.get_object(bucket_name, object_name)
         digest = hashlib.sha256()
         try:
@@ -299,8 +410,12 @@ class StorageService:
         try:
             bucket_name, object_name = self._parse_path(file_path)
 
-            url = self.client.presigned_get_object(
-                bucket_name, object_name, expires=timedelta(seconds=expiry_seconds)
+            url = await run_blocking(
+                "minio.presign",
+                self.client.presigned_get_object,
+                bucket_name,
+                object_name,
+                expires=timedelta(seconds=expiry_seconds),
             )
 
             logger.info(
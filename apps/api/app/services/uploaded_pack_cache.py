@@ -0,0 +1,319 @@
+"""
+Memo of built uploaded-source packs.
+
+Every resume, retry and top-up of a document with uploaded PDFs rebuilt the
+same uploaded SourcePack from the database: the file rows, every stored
+passage set (or a re-split of the pages) and the per-file abstracts and
+keys. build_uploaded_source_pack now looks the result up first.
+
+An entry is keyed by ``uploaded_pack_key``: the document's
+uploaded_sources_digest (file bytes and citation metadata), the ids of the
+files usable for grounding, the topic and PASSAGE_PARAMS_VERSION. Anything
+that changes the pack changes the key, so a stale entry is never served;
+correctness does not depend on invalidation. The source-change lock path
+(upload, metadata patch, delete) and the end of an ingestion still call
+``invalidate_uploaded_pack`` so replaced material is dropped at once
+instead of aging out.
+
+One entry per document lives in an in-process LRU of
+UPLOADED_PACK_CACHE_MEMORY_ENTRIES documents and, when Redis is available,
+under ``uploaded_pack:v<version>:<document_id>`` as compressed JSON so a
+job resumed on another worker skips the rebuild too. Entries expire after
+UPLOADED_PACK_CACHE_TTL_SECONDS (0 disables the memo). Cache failures read
+as a miss and never raise into callers.
+
+Entries hold the material of the pack, not SourcePack objects: sources as
+SourceDoc keyword arguments (a hit builds fresh, per-job objects) and the
+frozen SourcePassage list, shared read-only between hits.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.services.uploaded_sources import PASSAGE_PARAMS_VERSION, SourcePassage
+
+logger = logging.getLogger(__name__)
+
+UPLOADED_PACK_CACHE_VERSION = 1
+REDIS_KEY_PREFIX = "uploaded_pack"
+
+# Larger packs (compressed, before base64) are memoized in-process only.
+REDIS_MAX_PAYLOAD_BYTES = 16 * 1024 * 1024
+
+
+def uploaded_pack_key(digest: str, usable_file_ids: list[int], topic: str) -> str:
+    """Identity of one uploaded pack build."""
+    material = json.dumps(
+        [
+            UPLOADED_PACK_CACHE_VERSION,
+            PASSAGE_PARAMS_VERSION,
+            digest,
+            sorted(usable_file_ids),
+            topic,
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class UploadedPackEntry:
+    """Material of a built uploaded pack."""
+
+    key: str
+    # SourceDoc keyword arguments and citation key, in pack order.
+    sources: tuple[tuple[dict[str, Any], str], ...]
+    passages: list[SourcePassage]
+
+
+def encode_entry(entry: UploadedPackEntry) -> bytes:
+    """Compressed JSON of an entry; terms are stored once in a vocabulary."""
+    vocabulary: dict[str, int] = {}
+    files: dict[int, list[str]] = {}
+    rows: list[list[Any]] = []
+    for passage in entry.passages:
+        files.setdefault(
+            passage.source_file_id, [passage.citation_key, passage.filename]
+        )
+        terms = passage.terms
+        rows.append(
+            [
+                passage.source_file_id,
+                passage.page_number,
+                passage.text,
+                (
+                    None
+                    if terms is None
+                    else [
+                        vocabulary.setdefault(term, len(vocabulary)) for term in terms
+                    ]
+                ),
+                None if terms is None else list(terms.values()),
+            ]
+        )
+    body = {
+        "key": entry.key,
+        "sources": [[kwargs, key] for kwargs, key in entry.sources],
+        "files": {str(file_id): meta for file_id, meta in files.items()},
+        "terms": list(vocabulary),
+        "passages": rows,
+    }
+    return zlib.compress(
+        json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def decode_entry(payload: bytes) -> UploadedPackEntry:
+    """Inverse of encode_entry. Raises ValueError on a corrupt payload."""
+    try:
+        body = json.loads(zlib.decompress(payload))
+        vocabulary = body["terms"]
+        files = body["files"]
+        passages = []
+        for file_id, page_number, text, term_ids, counts in body["passages"]:
+            citation_key, filename = files[str(file_id)]
+            passages.append(
+                SourcePassage(
+                    source_file_id=int(file_id),
+                    citation_key=citation_key,
+                    filename=filename,
+                    page_number=int(page_number),
+                    text=text,
+                    terms=(
+                        None
+                        if term_ids is None
+                        else {
+                            vocabulary[term]: count
+                            for term, count in zip(term_ids, counts, strict=True)
+                        }
+                    ),
+                )
+            )
+        return UploadedPackEntry(
+            key=str(body["key"]),
+            sources=tuple((dict(kwargs), str(key)) for kwargs, key in body["sources"]),
+            passages=passages,
+        )
+    except (zlib.error, KeyError, IndexError, TypeError, ValueError) as exc:
+        raise ValueError(f"Unreadable uploaded pack entry: {exc}") from exc
+
+
+class UploadedPackCache:
+    """In-process LRU of uploaded packs over an optional Redis copy."""
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis | None = None,
+        *,
+        use_redis: bool = True,
+        ttl_seconds: int | None = None,
+        memory_entries: int | None = None,
+    ):
+        self._redis = redis_client
+        self.use_redis = use_redis
+        self.ttl_seconds = (
+            settings.UPLOADED_PACK_CACHE_TTL_SECONDS
+            if ttl_seconds is None
+            else ttl_seconds
+        )
+        self.memory_entries = max(
+            0,
+            (
+                settings.UPLOADED_PACK_CACHE_MEMORY_ENTRIES
+                if memory_entries is None
+                else memory_entries
+            ),
+        )
+        self._front: OrderedDict[int, tuple[float, UploadedPackEntry]] = OrderedDict()
+        self._counters = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+        self._warned = False
+
+    async def get(self, document_id: int, key: str) -> UploadedPackEntry | None:
+        """The document's memoized pack when it was built under ``key``."""
+        if self.ttl_seconds <= 0:
+            return None
+        cached = self._front.get(document_id)
+        if cached is not None:
+            expires_at, entry = cached
+            if expires_at > time.monotonic() and entry.key == key:
+                self._front.move_to_end(document_id)
+                self._counters["memory_hits"] += 1
+                return entry
+            del self._front[document_id]
+
+        stored = await self._load(document_id)
+        if stored is None or stored.key != key:
+            self._counters["misses"] += 1
+            return None
+        self._counters["redis_hits"] += 1
+        self._remember(document_id, stored)
+        return stored
+
+    async def put(self, document_id: int, entry: UploadedPackEntry) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._counters["writes"] += 1
+        self._remember(document_id, entry)
+        redis = self._client()
+        if redis is None:
+            return
+        payload = encode_entry(entry)
+        if len(payload) > REDIS_MAX_PAYLOAD_BYTES:
+            return
+        try:
+            await redis.set(
+                self._key(document_id),
+                base64.b64encode(payload).decode("ascii"),
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            self._error(f"Uploaded pack cache write failed: {e}")
+
+    async def invalidate(self, document_id: int) -> None:
+        """Drop the document's entry here and in Redis."""
+        self._counters["invalidations"] += 1
+        self._front.pop(document_id, None)
+        redis = self._client()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self._key(document_id))
+        except Exception as e:
+            self._error(f"Uploaded pack cache invalidation failed: {e}")
+
+    def stats(self) -> dict[str, int]:
+        return {**self._counters, "memory_entries": len(self._front)}
+
+    async def _load(self, document_id: int) -> UploadedPackEntry | None:
+        redis = self._client()
+        if redis is None:
+            return None
+        try:
+            stored = await redis.get(self._key(document_id))
+            if stored is None:
+                return None
+            return decode_entry(base64.b64decode(stored))
+        except Exception as e:
+            self._error(f"Uploaded pack cache read failed: {e}")
+            return None
+
+    def _remember(self, document_id: int, entry: UploadedPackEntry) -> None:
+        if not self.memory_entries:
+            return
+        self._front[document_id] = (time.monotonic() + self.ttl_seconds, entry)
+        self._front.move_to_end(document_id)
+        while len(self._front) > self.memory_entries:
+            self._front.popitem(last=False)
+
+    def _client(self) -> aioredis.Redis | None:
+        if not self.use_redis:
+            return None
+        if self._redis is not None:
+            return self._redis
+        # Lazy: the shared app pool is created at startup, after this object.
+        from app.middleware.rate_limit import get_redis_client
+
+        return get_redis_client()
+
+    def _error(self, message: str) -> None:
+        self._counters["errors"] += 1
+        if self._warned:
+            logger.debug(message)
+        else:
+            logger.warning(message)
+            self._warned = True
+
+    @staticmethod
+    def _key(document_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:v{UPLOADED_PACK_CACHE_VERSION}:{document_id}"
+
+
+_uploaded_pack_cache: UploadedPackCache | None = None
+
+
+def get_uploaded_pack_cache() -> UploadedPackCache | None:
+    """Process-wide memo; None when UPLOADED_PACK_CACHE_TTL_SECONDS is 0."""
+    global _uploaded_pack_cache
+    if settings.UPLOADED_PACK_CACHE_TTL_SECONDS <= 0:
+        return None
+    if _uploaded_pack_cache is None:
+        _uploaded_pack_cache = UploadedPackCache()
+    return _uploaded_pack_cache
+
+
+async def invalidate_uploaded_pack(document_id: int) -> None:
+    """Forget a document's uploaded pack after its sources changed."""
+    cache = get_uploaded_pack_cache()
+    if cache is not None:
+        await cache.invalidate(document_id)
+
+
+__all__ = [
+    "UPLOADED_PACK_CACHE_VERSION",
+    "UploadedPackCache",
+    "UploadedPackEntry",
+    "decode_entry",
+    "encode_entry",
+    "get_uploaded_pack_cache",
+    "invalidate_uploaded_pack",
+    "uploaded_pack_key",
+]
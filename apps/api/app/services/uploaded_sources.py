@@ -14,17 +14,35 @@ from __future__ import annotations
 
 import hashlib
 import io
+import json
 import logging
+import os
 import re
 import unicodedata
-from dataclasses import dataclass
-from typing import Any
+import zlib
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
 
 from pypdf import PdfReader
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.document import DocumentSourceFile, SourceFilePage
+from app.models.document import (
+    DocumentSourceFile,
+    SourceFilePage,
+    SourceFilePassageSet,
+)
+from app.services.parsing_service import (
+    PdfSource,
+    get_parsing_service,
+    read_pdf_pages,
+)
+
+if TYPE_CHECKING:
+    from app.services.uploaded_pack_cache import UploadedPackCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +50,8 @@ MAX_SOURCE_FILE_BYTES = 25 * 1024 * 1024
 MAX_SOURCE_FILE_PAGES = 400
 # Below this many characters per page on average, the PDF is a scan.
 MIN_TEXT_CHARS_PER_PAGE = 120
+# Upload accepted, ingestion (source_ingestion.py) not finished yet.
+INGESTING_STATUSES = frozenset({"pending", "processing"})
 
 # Passage shaping: big enough to carry an argument, small enough that a
 # handful fit into a section prompt with their page labels.
@@ -40,6 +60,12 @@ PASSAGE_MIN_CHARS = 200
 # Consecutive windows share this much tail context so an argument cut at a
 # window boundary is still retrievable as one piece.
 PASSAGE_OVERLAP_CHARS = 150
+# Version of the persisted passage sets (SourceFilePassageSet). Bump it
+# whenever the passage shaping above, split_passages or _terms changes:
+# stored sets of another version are ignored and re-split from the pages.
+PASSAGE_PARAMS_VERSION = 1
+# Page rows fetched per round trip when pages are streamed for a re-split.
+PAGE_STREAM_BATCH = 500
 
 _YEAR_RE = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
 _KEY_SANITIZE_RE = re.compile(r"[^0-9A-Za-z]+")
@@ -66,7 +92,7 @@ def _terms(text: str) -> list[str]:
     return [t for t in _WORD_RE.findall(_normalize(text)) if t not in _STOPWORDS]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SourcePassage:
     """One retrievable excerpt with its exact provenance."""
 
@@ -76,38 +102,42 @@ class SourcePassage:
     page_number: int  # 1-based, as shown in a PDF reader
     text: str
     score: float = 0.0
+    # Term counts of ``text`` when loaded from a persisted passage set;
+    # PassageIndex tokenizes the text itself when absent.
+    terms: dict[str, int] | None = field(default=None, compare=False, repr=False)
 
 
-def extract_pdf_pages(data: bytes) -> list[str]:
-    """Per-page text, 1-based order preserved. Raises ValueError on limits."""
-    if len(data) > MAX_SOURCE_FILE_BYTES:
+def check_source_size(size: int) -> None:
+    """Raise ValueError for a file of ``size`` bytes over
+    MAX_SOURCE_FILE_BYTES."""
+    if size > MAX_SOURCE_FILE_BYTES:
         raise ValueError(
             f"PDF exceeds the {MAX_SOURCE_FILE_BYTES // (1024 * 1024)} MB limit"
         )
-    try:
-        reader = PdfReader(io.BytesIO(data))
-    except Exception as exc:  # encrypted/corrupt
-        raise ValueError(f"Not a readable PDF: {exc}") from exc
-    if reader.is_encrypted:
-        try:
-            reader.decrypt("")
-        except Exception as exc:
-            raise ValueError("Encrypted PDF is not supported") from exc
-    if len(reader.pages) > MAX_SOURCE_FILE_PAGES:
-        raise ValueError(
-            f"PDF has {len(reader.pages)} pages; limit is {MAX_SOURCE_FILE_PAGES}"
-        )
-    pages: list[str] = []
-    for page in reader.pages:
-        try:
-            pages.append(page.extract_text() or "")
-        except Exception:
-            pages.append("")
-    return pages
+
+
+def _source_size(source: PdfSource) -> int:
+    return os.path.getsize(source) if isinstance(source, str) else len(source)
+
+
+def extract_pdf_pages(source: PdfSource) -> list[str]:
+    """Per-page text, 1-based order preserved. Raises ValueError on limits.
+
+    ``source`` is the PDF bytes or the path of a local copy."""
+    check_source_size(_source_size(source))
+    return read_pdf_pages(source, max_pages=MAX_SOURCE_FILE_PAGES)[1]
+
+
+async def parse_pdf_pages(source: PdfSource) -> list[str]:
+    """``extract_pdf_pages`` on the parsing process pool (request path)."""
+    check_source_size(_source_size(source))
+    return await get_parsing_service().pdf_pages(
+        source, max_pages=MAX_SOURCE_FILE_PAGES
+    )
 
 
 def derive_source_metadata(
-    filename: str, data: bytes, pages: list[str]
+    filename: str, source: PdfSource, pages: list[str]
 ) -> dict[str, object]:
     """Best-effort citation metadata; honesty over invention.
 
@@ -118,7 +148,9 @@ def derive_source_metadata(
     title: str | None = None
     author: str | None = None
     try:
-        meta = PdfReader(io.BytesIO(data)).metadata
+        meta = PdfReader(
+            source if isinstance(source, str) else io.BytesIO(source)
+        ).metadata
         if meta:
             raw_title = (meta.title or "").strip()
             raw_author = (meta.author or "").strip()
@@ -167,6 +199,17 @@ def derive_source_metadata(
     }
 
 
+def unique_citation_key(citation_key: str, existing_keys: set[str]) -> str:
+    """``citation_key`` or its first free b..z suffix within a document."""
+    if citation_key not in existing_keys:
+        return citation_key
+    for suffix in "bcdefghijklmnopqrstuvwxyz":
+        candidate = f"{citation_key}{suffix}"
+        if candidate not in existing_keys:
+            return candidate
+    raise ValueError("Too many sources with the same citation key")
+
+
 def split_passages(
     *,
     source_file_id: int,
@@ -224,6 +267,15 @@ def split_passages(
     return passages
 
 
+def _combined_score(
+    covered: int, query_size: int, matched: int, passage_size: int
+) -> float:
+    """The one scoring formula shared by score_passage and PassageIndex."""
+    coverage = covered / query_size
+    density = matched / passage_size
+    return round(coverage + min(density, 0.2), 4)
+
+
 def score_passage(query: str, passage_text: str) -> float:
     """Lexical overlap score in [0, 1]-ish: coverage of query terms with a
     small density bonus. Language-tolerant via accent stripping; no model
@@ -236,48 +288,268 @@ def score_passage(query: str, passage_text: str) -> float:
         return 0.0
     passage_set = set(passage_terms)
     covered = sum(1 for t in query_terms if t in passage_set)
-    coverage = covered / len(query_terms)
-    density = sum(1 for t in passage_terms if t in query_terms) / len(passage_terms)
-    return round(coverage + min(density, 0.2), 4)
+    matched = sum(1 for t in passage_terms if t in query_terms)
+    return _combined_score(covered, len(query_terms), matched, len(passage_terms))
 
 
-def select_passages(
-    passages: list[SourcePassage], query: str, *, limit: int = 6
+def _rank_key(item: tuple[float, SourcePassage]) -> tuple[float, str, int]:
+    return (-item[0], item[1].citation_key, item[1].page_number)
+
+
+def _take_capped(
+    ranked: Iterable[tuple[float, SourcePassage]], limit: int
 ) -> list[SourcePassage]:
-    """Top passages for a query, at most two per file so one source cannot
-    monopolize the prompt."""
-    scored = sorted(
-        (
-            SourcePassage(
-                source_file_id=p.source_file_id,
-                citation_key=p.citation_key,
-                filename=p.filename,
-                page_number=p.page_number,
-                text=p.text,
-                score=score_passage(query, p.text),
-            )
-            for p in passages
-        ),
-        key=lambda p: (-p.score, p.citation_key, p.page_number),
-    )
+    """Walk a ranking, at most two passages per file, up to ``limit``."""
     selected: list[SourcePassage] = []
     per_file: dict[int, int] = {}
-    for passage in scored:
-        if passage.score <= 0:
+    for score, passage in ranked:
+        if score <= 0:
             break
         if per_file.get(passage.source_file_id, 0) >= 2:
             continue
-        selected.append(passage)
+        selected.append(replace(passage, score=score))
         per_file[passage.source_file_id] = per_file.get(passage.source_file_id, 0) + 1
         if len(selected) >= limit:
             break
     return selected
 
 
+def select_passages(
+    passages: list[SourcePassage], query: str, *, limit: int = 6
+) -> list[SourcePassage]:
+    """Top passages for a query, at most two per file so one source cannot
+    monopolize the prompt."""
+    # Only the selected passages are copied to carry their score; the rest
+    # of the corpus is ranked as (score, passage) pairs.
+    scored = sorted(
+        ((score_passage(query, p.text), p) for p in passages), key=_rank_key
+    )
+    return _take_capped(scored, limit)
+
+
+class PassageIndex:
+    """Inverted index over a fixed passage list, built once per source pack.
+
+    select_passages re-tokenizes every passage for every query, and
+    prompt_block asks once per section: ten 400-page PDFs meant thousands
+    of passages normalized and tokenized again for each section prompt.
+    The index reads each passage's term counts (persisted at upload, see
+    encode_passage_set) or tokenizes it once, into postings (term -> passage
+    positions and term counts) plus each passage's term count; a query only
+    touches the postings of its own terms.
+
+    ``select`` returns exactly what ``select_passages`` returns for the same
+    list: ``_combined_score`` gets the same integers (query terms covered,
+    passage tokens matching a query term, token counts), unmatched passages
+    score 0 and are never selected, and candidates are ranked in list order
+    with the same stable sort key and per-file cap.
+    """
+
+    __slots__ = ("passages", "_lengths", "_postings")
+
+    def __init__(self, passages: Iterable[SourcePassage]):
+        self.passages = list(passages)
+        # Compact arrays: a large upload set has millions of postings.
+        self._lengths = array("I")
+        self._postings: dict[str, tuple[array, array]] = {}
+        for position, passage in enumerate(self.passages):
+            terms = passage.terms
+            if terms is None:
+                terms = Counter(_terms(passage.text))
+            self._lengths.append(sum(terms.values()))
+            for term, count in terms.items():
+                positions, counts = self._postings.setdefault(
+                    term, (array("I"), array("I"))
+                )
+                positions.append(position)
+                counts.append(count)
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def scores(self, query: str) -> dict[int, float]:
+        """score_passage(query, text) of every matching passage, by position."""
+        query_terms = set(_terms(query))
+        covered: dict[int, int] = {}
+        matched: dict[int, int] = {}
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            for position, count in zip(*postings, strict=True):
+                covered[position] = covered.get(position, 0) + 1
+                matched[position] = matched.get(position, 0) + count
+        return {
+            position: _combined_score(
+                covered[position],
+                len(query_terms),
+                matched[position],
+                self._lengths[position],
+            )
+            for position in covered
+        }
+
+    def select(self, query: str, *, limit: int = 6) -> list[SourcePassage]:
+        """Same result as ``select_passages(self.passages, query, limit=...)``."""
+        scores = self.scores(query)
+        # Ascending positions keep the stable sort's ties in list order.
+        ranked = sorted(
+            ((scores[pos], self.passages[pos]) for pos in sorted(scores)),
+            key=_rank_key,
+        )
+        return _take_capped(ranked, limit)
+
+
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def encode_passage_set(pages: list[tuple[int, str]]) -> tuple[bytes, int]:
+    """(payload, passage count): one file's passages with their term
+    counts, compressed.
+
+    File identity (id, citation key, filename) is attached on load, so a
+    metadata edit never touches the stored set. Terms are stored once in a
+    vocabulary and referenced by position.
+    """
+    vocabulary: dict[str, int] = {}
+    rows: list[list[Any]] = []
+    for passage in split_passages(
+        source_file_id=0, citation_key="", filename="", pages=pages
+    ):
+        counts = Counter(_terms(passage.text))
+        rows.append(
+            [
+                passage.page_number,
+                passage.text,
+                [vocabulary.setdefault(term, len(vocabulary)) for term in counts],
+                list(counts.values()),
+            ]
+        )
+    body = {
+        "version": PASSAGE_PARAMS_VERSION,
+        "terms": list(vocabulary),
+        "passages": rows,
+    }
+    payload = zlib.compress(
+        json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+    return payload, len(rows)
+
+
+def decode_passage_set(
+    payload: bytes, *, source_file_id: int, citation_key: str, filename: str
+) -> list[SourcePassage]:
+    """Inverse of encode_passage_set. Raises ValueError on a corrupt blob."""
+    try:
+        body = json.loads(zlib.decompress(payload))
+        vocabulary = body["terms"]
+        return [
+            SourcePassage(
+                source_file_id=source_file_id,
+                citation_key=citation_key,
+                filename=filename,
+                page_number=int(page_number),
+                text=text,
+                terms={
+                    vocabulary[term]: count
+                    for term, count in zip(term_ids, counts, strict=True)
+                },
+            )
+            for page_number, text, term_ids, counts in body["passages"]
+        ]
+    except (zlib.error, KeyError, IndexError, TypeError, ValueError) as exc:
+        raise ValueError(f"Unreadable passage set: {exc}") from exc
+
+
+def passage_set_for(
+    source_file_id: int, sha256: str, pages: list[tuple[int, str]]
+) -> SourceFilePassageSet:
+    """The persisted passage set row for a freshly parsed upload."""
+    payload, passage_count = encode_passage_set(pages)
+    return SourceFilePassageSet(
+        source_file_id=source_file_id,
+        sha256=sha256,
+        passage_version=PASSAGE_PARAMS_VERSION,
+        passage_count=passage_count,
+        payload=payload,
+    )
+
+
+async def _load_passages(
+    db: AsyncSession,
+    files: list[Any],
+    *,
+    yield_per: int | None = PAGE_STREAM_BATCH,
+) -> dict[int, list[SourcePassage]]:
+    """Passages of many parsed files, keyed by file id, in two queries.
+
+    Each file uses its stored set when current; the rest (uploads older
+    than the set, a bumped PASSAGE_PARAMS_VERSION, a corrupt blob) are
+    re-split from their pages, fetched for all of them in ONE ordered
+    query. With ``yield_per`` the page text is streamed in batches instead
+    of being buffered whole. Query count does not grow with the number of
+    files (it used to be two per file).
+    """
+    if not files:
+        return {}
+    by_id = {int(f.id): f for f in files}
+    passages: dict[int, list[SourcePassage]] = {}
+    sets = await db.execute(
+        select(
+            SourceFilePassageSet.source_file_id,
+            SourceFilePassageSet.sha256,
+            SourceFilePassageSet.payload,
+        ).where(
+            SourceFilePassageSet.source_file_id.in_(by_id),
+            SourceFilePassageSet.passage_version == PASSAGE_PARAMS_VERSION,
+        )
+    )
+    for source_file_id, sha256, payload in sets:
+        source_file = by_id[int(source_file_id)]
+        if sha256 != source_file.sha256:
+            continue
+        try:
+            passages[int(source_file_id)] = decode_passage_set(
+                payload,
+                source_file_id=int(source_file_id),
+                citation_key=str(source_file.citation_key),
+                filename=str(source_file.filename),
+            )
+        except ValueError as e:
+            logger.warning(f"Re-splitting source file {source_file_id}: {e}")
+
+    missing = sorted(set(by_id) - set(passages))
+    if not missing:
+        return passages
+    statement = (
+        select(
+            SourceFilePage.source_file_id,
+            SourceFilePage.page_number,
+            SourceFilePage.text,
+        )
+        .where(SourceFilePage.source_file_id.in_(missing))
+        .order_by(SourceFilePage.source_file_id.asc(), SourceFilePage.page_number.asc())
+    )
+    pages: dict[int, list[tuple[int, str]]] = {file_id: [] for file_id in missing}
+    if yield_per:
+        result = await db.stream(statement.execution_options(yield_per=yield_per))
+        async for source_file_id, page_number, text in result:
+            pages[int(source_file_id)].append((int(page_number), str(text)))
+    else:
+        for source_file_id, page_number, text in await db.execute(statement):
+            pages[int(source_file_id)].append((int(page_number), str(text)))
+    for file_id in missing:
+        source_file = by_id[file_id]
+        passages[file_id] = split_passages(
+            source_file_id=file_id,
+            citation_key=str(source_file.citation_key),
+            filename=str(source_file.filename),
+            pages=pages[file_id],
+        )
+    return passages
+
+
 async def load_document_passages(
     db: AsyncSession, document_id: int
 ) -> list[SourcePassage]:
@@ -285,39 +557,19 @@ async def load_document_passages(
     files = (
         (
             await db.execute(
-                select(DocumentSourceFile).where(
+                select(DocumentSourceFile)
+                .where(
                     DocumentSourceFile.document_id == document_id,
                     DocumentSourceFile.status == "parsed",
                 )
+                .order_by(DocumentSourceFile.id.asc())
             )
         )
         .scalars()
         .all()
     )
-    if not files:
-        return []
-    passages: list[SourcePassage] = []
-    for source_file in files:
-        rows = (
-            (
-                await db.execute(
-                    select(SourceFilePage)
-                    .where(SourceFilePage.source_file_id == source_file.id)
-                    .order_by(SourceFilePage.page_number.asc())
-                )
-            )
-            .scalars()
-            .all()
-        )
-        passages.extend(
-            split_passages(
-                source_file_id=int(source_file.id),
-                citation_key=str(source_file.citation_key),
-                filename=str(source_file.filename),
-                pages=[(int(r.page_number), str(r.text)) for r in rows],
-            )
-        )
-    return passages
+    by_file = await _load_passages(db, list(files))
+    return [passage for f in files for passage in by_file[int(f.id)]]
 
 
 async def uploaded_sources_digest(db: AsyncSession, document_id: int) -> str | None:
@@ -332,11 +584,15 @@ async def uploaded_sources_digest(db: AsyncSession, document_id: int) -> str | N
                 DocumentSourceFile.title,
                 DocumentSourceFile.authors,
                 DocumentSourceFile.year,
-            )
-            .where(DocumentSourceFile.document_id == document_id)
-            .order_by(DocumentSourceFile.sha256.asc())
+            ).where(DocumentSourceFile.document_id == document_id)
         )
     ).all()
+    return _sources_digest(rows)
+
+
+def _sources_digest(rows: Iterable[Any]) -> str | None:
+    """uploaded_sources_digest over already loaded file rows."""
+    rows = sorted(rows, key=lambda row: row.sha256)
     if not rows:
         return None
     # Metadata is part of the contract: editing authors/year changes the
@@ -353,6 +609,14 @@ async def uploaded_sources_digest(db: AsyncSession, document_id: int) -> str | N
 def _file_issue(source_file: Any) -> str | None:
     """Why one uploaded file cannot ground text, or None when usable."""
     name = str(source_file.filename)
+    if source_file.status in INGESTING_STATUSES:
+        return f"'{name}': still being processed — wait for the upload to finish"
+    if source_file.status == "failed":
+        reason = source_file.ingestion_error or "unreadable file"
+        return (
+            f"'{name}': could not be read ({reason}) — delete it and upload "
+            f"a readable PDF"
+        )
     if source_file.status != "parsed":
         return (
             f"'{name}': scanned PDF without a text layer — replace it "
@@ -375,7 +639,8 @@ async def uploaded_sources_blockers(
     default. Only files the manager explicitly marked mandatory may stop
     generation; an unusable supplementary file is excluded with a visible
     warning instead. Nothing is ever silently invented or silently
-    dropped — warnings land in provenance and the contract view.
+    dropped — warnings land in provenance and the contract view. A file
+    still being ingested blocks until its usability is known.
     """
     files = (
         (
@@ -394,14 +659,24 @@ async def uploaded_sources_blockers(
         issue = _file_issue(source_file)
         if issue is None:
             continue
-        if getattr(source_file, "mandatory", False):
+        if source_file.status in INGESTING_STATUSES:
+            # Transient: whether the file is usable is not known yet, so
+            # generation waits instead of silently dropping it.
+            blockers.append(f"[processing] {issue}")
+        elif getattr(source_file, "mandatory", False):
             blockers.append(f"[mandatory] {issue}")
         else:
             warnings.append(f"[excluded from grounding] {issue}")
     return blockers, warnings
 
 
-async def build_uploaded_source_pack(db: AsyncSession, document_id: int, topic: str):
+async def build_uploaded_source_pack(
+    db: AsyncSession,
+    document_id: int,
+    topic: str,
+    *,
+    pack_cache: UploadedPackCache | None = None,
+):
     """Build the grounding pack FROM manager-uploaded PDFs, or None.
 
     Uploaded files enter the pack with on_topic_score 1.0 (the score
@@ -410,10 +685,17 @@ async def build_uploaded_source_pack(db: AsyncSession, document_id: int, topic:
     never replace it outright (course correction 2026-07-11). Only usable
     files participate (parsed text layer + confirmed metadata); exclusions
     are surfaced by uploaded_sources_blockers(). Deterministic: a resumed
-    run rebuilds the identical uploaded part, passages included.
+    run rebuilds the identical uploaded part, passages included — or
+    takes it from the memo (uploaded_pack_cache.py, ``pack_cache`` or the
+    shared one) when the sources are unchanged.
     """
     from app.services.ai_pipeline.rag_retriever import SourceDoc
     from app.services.ai_pipeline.source_pack import PackedSource, SourcePack
+    from app.services.uploaded_pack_cache import (
+        UploadedPackEntry,
+        get_uploaded_pack_cache,
+        uploaded_pack_key,
+    )
 
     files = (
         (
@@ -429,63 +711,64 @@ async def build_uploaded_source_pack(db: AsyncSession, document_id: int, topic:
     if not files:
         return None
 
-    all_passages: list[SourcePassage] = []
-    packed: list[PackedSource] = []
-    for source_file in files:
-        if _file_issue(source_file) is not None:
-            # Unusable file: excluded here, surfaced as a warning (or a
-            # blocker when mandatory) by uploaded_sources_blockers — never
-            # invented around.
-            continue
-        rows = (
-            (
-                await db.execute(
-                    select(SourceFilePage)
-                    .where(SourceFilePage.source_file_id == source_file.id)
-                    .order_by(SourceFilePage.page_number.asc())
+    # Unusable files are excluded here, surfaced as a warning (or a
+    # blocker when mandatory) by uploaded_sources_blockers — never invented
+    # around.
+    usable = [f for f in files if _file_issue(f) is None]
+    if not usable:
+        return None
+    cache = pack_cache or get_uploaded_pack_cache()
+    key = uploaded_pack_key(
+        str(_sources_digest(files)), [int(f.id) for f in usable], topic
+    )
+    entry = await cache.get(document_id, key) if cache is not None else None
+    if entry is None:
+        by_file = await _load_passages(db, usable)
+        all_passages: list[SourcePassage] = []
+        sources: list[tuple[dict[str, Any], str]] = []
+        for source_file in usable:
+            passages = by_file[int(source_file.id)]
+            all_passages.extend(passages)
+            authors = [
+                a.strip()
+                for a in str(source_file.authors or "").split(";")
+                if a.strip()
+            ]
+            sources.append(
+                (
+                    {
+                        "title": str(source_file.title or source_file.filename),
+                        "authors": authors,
+                        "year": int(source_file.year),
+                        "abstract": passages[0].text[:1000] if passages else None,
+                        "paper_id": f"uploaded:{int(source_file.id)}",
+                        "venue": None,
+                        "url": None,
+                        "doi": None,
+                    },
+                    str(source_file.citation_key),
                 )
             )
-            .scalars()
-            .all()
-        )
-        passages = split_passages(
-            source_file_id=int(source_file.id),
-            citation_key=str(source_file.citation_key),
-            filename=str(source_file.filename),
-            pages=[(int(r.page_number), str(r.text)) for r in rows],
+        entry = UploadedPackEntry(
+            key=key, sources=tuple(sources), passages=all_passages
         )
-        all_passages.extend(passages)
-
-        authors = [
-            a.strip() for a in str(source_file.authors or "").split(";") if a.strip()
-        ]
-        year = int(source_file.year)
-        abstract = passages[0].text[:1000] if passages else None
-        packed.append(
-            PackedSource(
-                SourceDoc(
-                    title=str(source_file.title or source_file.filename),
-                    authors=authors,
-                    year=year,
-                    abstract=abstract,
-                    paper_id=f"uploaded:{int(source_file.id)}",
-                    venue=None,
-                    url=None,
-                    doi=None,
-                ),
-                str(source_file.citation_key),
-                1.0,
-            )
+        if cache is not None:
+            await cache.put(document_id, entry)
+
+    packed = [
+        PackedSource(
+            SourceDoc(**{**kwargs, "authors": list(kwargs["authors"])}),
+            citation_key,
+            1.0,
         )
-
-    if not packed:
-        return None
+        for kwargs, citation_key in entry.sources
+    ]
     pack = SourcePack(document_id=document_id, topic=topic, sources=packed)
-    pack.passages = all_passages
+    pack.passages = entry.passages
     logger.info(
         "Built uploaded-sources pack for document %s: %s files, %s passages",
         document_id,
         len(packed),
-        len(all_passages),
+        len(entry.passages),
     )
     return pack
@@ -41,7 +41,11 @@ from app.core.monitoring import setup_prometheus, setup_sentry
 from app.middleware.csrf import CSRFMiddleware
 from app.middleware.maintenance import MaintenanceModeMiddleware
 from app.middleware.rate_limit import close_redis, init_redis, setup_rate_limiter
+from app.services.blocking_executor import shutdown_blocking_executor
+from app.services.export_renderer import shutdown_export_render_service
 from app.services.generation_worker import GenerationWorker
+from app.services.parsing_service import shutdown_parsing_service
+from app.services.source_ingestion import resume_source_ingestion
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -57,6 +61,7 @@ async def lifespan(app: FastAPI):
         await init_db()
         logger.info("Database initialized")
         await init_redis()
+        await resume_source_ingestion()
         if settings.GENERATION_WORKER_ENABLED:
             generation_worker = GenerationWorker()
             await generation_worker.start()
@@ -71,6 +76,9 @@ async def lifespan(app: FastAPI):
             if generation_worker is not None:
                 await generation_worker.stop()
             await close_redis()
+            shutdown_blocking_executor()
+            shutdown_parsing_service()
+            shutdown_export_render_service()
 
 
 # Create FastAPI application
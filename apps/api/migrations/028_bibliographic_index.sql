@@ -0,0 +1,37 @@
+-- 028: local bibliographic index consulted before the external APIs.
+--
+-- Verified works used to live only as Redis blobs keyed by the exact query
+-- tuple (citation_verify:v2:...), so a slightly different title or author
+-- list re-ran the full Crossref/OpenAlex/S2/arXiv cascade. Canonical records
+-- of every VERIFIED lookup and every API-sourced document source are now
+-- kept here; CitationVerifier answers from this table with the same matching
+-- rules before going to the network.
+
+CREATE TABLE IF NOT EXISTS bibliographic_works (
+    id SERIAL PRIMARY KEY,
+    normalized_title VARCHAR(1000) NOT NULL,
+    -- Head/tail of normalized_title: candidate prefilter for fuzzy matches.
+    title_prefix VARCHAR(16) NOT NULL,
+    title_suffix VARCHAR(16) NOT NULL,
+    title VARCHAR(1000) NOT NULL,
+    authors JSON,
+    year INTEGER,
+    venue VARCHAR(500),
+    abstract TEXT,
+    doi VARCHAR(255),
+    arxiv_id VARCHAR(50),
+    provider VARCHAR(50),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_bibliographic_works_doi
+    ON bibliographic_works (doi) WHERE doi IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_bibliographic_works_arxiv_id
+    ON bibliographic_works (arxiv_id);
+CREATE INDEX IF NOT EXISTS ix_bibliographic_works_normalized_title
+    ON bibliographic_works (normalized_title);
+CREATE INDEX IF NOT EXISTS ix_bibliographic_works_title_prefix
+    ON bibliographic_works (title_prefix);
+CREATE INDEX IF NOT EXISTS ix_bibliographic_works_title_suffix
+    ON bibliographic_works (title_suffix);
@@ -0,0 +1,25 @@
+-- 029: retrieval passages of uploaded PDFs, split once at upload time.
+--
+-- Every job start and resume re-ran split_passages over the raw page text
+-- of every uploaded PDF, and every excerpt selection re-tokenized the
+-- result. The upload endpoint now stores the passages with their term
+-- counts as one compressed blob per file. A set is used only while its
+-- sha256 matches the file and passage_version matches the code's
+-- PASSAGE_PARAMS_VERSION; anything else falls back to source_file_pages.
+-- Rollback: DROP TABLE source_file_passage_sets;
+
+CREATE TABLE IF NOT EXISTS source_file_passage_sets (
+    id SERIAL PRIMARY KEY,
+    source_file_id INTEGER NOT NULL
+        REFERENCES document_source_files(id) ON DELETE CASCADE,
+    sha256 CHAR(64) NOT NULL,
+    passage_version INTEGER NOT NULL,
+    passage_count INTEGER NOT NULL DEFAULT 0,
+    payload BYTEA NOT NULL,              -- zlib-compressed JSON
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    CONSTRAINT uq_source_file_passage_sets_file_version
+        UNIQUE (source_file_id, passage_version)
+);
+
+CREATE INDEX IF NOT EXISTS ix_source_file_passage_sets_file
+    ON source_file_passage_sets (source_file_id);
@@ -0,0 +1,11 @@
+-- 030: asynchronous ingestion of uploaded source PDFs.
+--
+-- The upload request used to parse, derive metadata and split passages
+-- before answering. It now stores the object, inserts the row with status
+-- 'pending' and returns; a background ingestion moves the row through
+-- 'processing' to 'parsed' | 'no_text_layer' | 'failed'. Failures keep
+-- their reason here for the status endpoint.
+-- Rollback: ALTER TABLE document_source_files DROP COLUMN ingestion_error;
+
+ALTER TABLE document_source_files
+    ADD COLUMN IF NOT EXISTS ingestion_error TEXT;
@@ -0,0 +1,19 @@
+-- 031: content-hash keys for generated exports.
+--
+-- Every export re-rendered and re-uploaded the DOCX/PDF, and because
+-- python-docx and ReportLab stamp the time into the file, each one became
+-- a new object. The key stored next to each artifact pointer is the hash
+-- of the canonical export model and renderer version that produced it. An
+-- export whose key matches reuses the stored object and its sha256 as-is.
+-- Pointers written without a key (legacy rows, resets) never match.
+-- Rollback: ALTER TABLE documents DROP COLUMN docx_export_key,
+--           DROP COLUMN pdf_export_key;
+
+ALTER TABLE documents
+    ADD COLUMN IF NOT EXISTS docx_export_key VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS pdf_export_key VARCHAR(64);
+
+COMMENT ON COLUMN documents.docx_export_key IS
+    'Export model hash that produced the DOCX at docx_path.';
+COMMENT ON COLUMN documents.pdf_export_key IS
+    'Export model hash that produced the PDF at pdf_path.';
@@ -0,0 +1,15 @@
+-- 032: lease for background ingestion of uploaded source PDFs.
+--
+-- Startup resumed every 'pending' and 'processing' row, so each API
+-- process or replica that started re-ingested files another live process
+-- was still parsing. An ingestion now claims its row atomically
+-- (pending -> processing) with a random token and an expiry. Startup and
+-- retries reclaim 'processing' rows only once the lease has expired, and
+-- only the token holder may record the result.
+-- Rollback: ALTER TABLE document_source_files
+--           DROP COLUMN ingestion_lease_token,
+--           DROP COLUMN ingestion_lease_expires_at;
+
+ALTER TABLE document_source_files
+    ADD COLUMN IF NOT EXISTS ingestion_lease_token VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS ingestion_lease_expires_at TIMESTAMPTZ;
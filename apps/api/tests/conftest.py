@@ -7,6 +7,7 @@ import asyncio
 import os
 import pathlib
 from importlib import import_module
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -60,6 +61,18 @@ os.environ.setdefault("QUALITY_PANEL_ENABLED", "false")
 # runs; unguarded, pipeline tests that don't patch CitationVerifier run the
 # live Step 4.7 stage (Crossref/OpenAlex/S2 lookups) against the network.
 os.environ.setdefault("CITATION_VERIFICATION_ENABLED", "false")
+# The local bibliographic index is a table in the per-module test database:
+# left on, a work verified by one test would answer the next test's lookup
+# before its mocked providers. Tests that exercise it pass an instance.
+os.environ.setdefault("BIBLIOGRAPHIC_INDEX_ENABLED", "false")
+# The shared RAG search cache would persist mocked provider answers in
+# /tmp/rag_cache across tests and runs. Tests that exercise the cache pass
+# an explicit cache_dir (or cache instance).
+os.environ.setdefault("RAG_CACHE_BACKEND", "off")
+# Same for the uploaded-pack memo: document ids restart in every test
+# database, so a pack memoized by one test could answer the next one's
+# build. Tests that exercise it pass a cache instance.
+os.environ.setdefault("UPLOADED_PACK_CACHE_TTL_SECONDS", "0")
 # App-lifespan tests must not start a real polling loop against the shared
 # module database. Worker behavior has focused tests with explicit instances.
 os.environ.setdefault("GENERATION_WORKER_ENABLED", "false")
@@ -143,6 +156,19 @@ async def db_session():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture
+def mock_redis():
+    """Empty verification cache for CitationVerifier tests (every read misses)."""
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+    redis.set = AsyncMock()
+    redis.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+    pipeline = MagicMock()
+    pipeline.execute = AsyncMock(return_value=[])
+    redis.pipeline = MagicMock(return_value=pipeline)
+    return redis
+
+
 @pytest.fixture(scope="session")
 def redis_available() -> bool:
     """
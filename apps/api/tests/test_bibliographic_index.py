@@ -0,0 +1,234 @@
+"""
+Unit tests for the local bibliographic index (SQLite test DB, mocked HTTP)
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.document import BibliographicWork
+from app.services.bibliographic_index import BibliographicIndex, work_from_source
+from app.services.citation_verifier import (
+    SourceInput,
+    VerificationResult,
+    VerificationStatus,
+)
+from tests.test_citation_verifier import make_client, make_response, make_verifier
+
+CROSSREF_SEARCH = {
+    "message": {
+        "items": [
+            {
+                "title": ["Attention Is All You Need"],
+                "author": [
+                    {"given": "Ashish", "family": "Vaswani"},
+                    {"given": "Noam", "family": "Shazeer"},
+                ],
+                "issued": {"date-parts": [[2017, 6]]},
+                "container-title": ["NeurIPS"],
+                "DOI": "10.5555/3295222",
+            }
+        ]
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+async def _empty_index():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(BibliographicWork))
+        await db.commit()
+    yield
+
+
+@pytest.mark.asyncio
+async def test_verified_work_answers_later_variant_locally(mock_redis):
+    index = BibliographicIndex()
+    verifier = make_verifier(mock_redis, bibliographic_index=index)
+    client = make_client([make_response(200, CROSSREF_SEARCH)])
+
+    with patch("httpx.AsyncClient", return_value=client):
+        first = await verifier.verify_source(
+            SourceInput(title="Attention Is All You Need", year=2017)
+        )
+        # Different punctuation/typo and author list: a Redis cache miss,
+        # but the same work for _match_candidate.
+        second = await verifier.verify_source(
+            SourceInput(
+                title="Attention is all you need!!",
+                authors=["A. Vaswani", "N. Parmar"],
+                year=2018,
+            )
+        )
+        third = await verifier.verify_source(
+            SourceInput(title="Attention Is All You Ned", year=2017)
+        )
+
+    assert first.status == VerificationStatus.VERIFIED
+    assert not first.from_index
+    assert client.get.await_count == 1  # only the first call hit the network
+    for result in (second, third):
+        assert result.status == VerificationStatus.VERIFIED
+        assert result.from_index
+        assert result.provider == "crossref"
+        assert result.doi == "10.5555/3295222"
+    assert second.match_score == 1.0
+    assert 0.9 <= third.match_score < 1.0
+
+
+@pytest.mark.asyncio
+async def test_index_candidates_obey_author_and_year_rules(mock_redis):
+    index = BibliographicIndex()
+    await index.record_result(
+        VerificationResult(
+            status=VerificationStatus.VERIFIED,
+            title="Attention Is All You Need",
+            authors=["Ashish Vaswani"],
+            year=2017,
+            provider="crossref",
+        )
+    )
+
+    found = await index.lookup(None, None, "attention is all you need")
+    assert [c["title"] for c in found.by_title] == ["Attention Is All You Need"]
+
+    verifier = make_verifier(mock_redis, bibliographic_index=index)
+    client = make_client([make_response(200, {"message": {"items": []}})] * 4)
+    with patch("httpx.AsyncClient", return_value=client):
+        result = await verifier._verify_from_index(
+            SourceInput(title="Attention Is All You Need", authors=["Rossi"]),
+            None,
+            None,
+            "attention is all you need",
+        )
+    assert result is None  # author veto: falls through to the providers
+
+
+@pytest.mark.asyncio
+async def test_doi_hit_uses_identifier_score(mock_redis):
+    index = BibliographicIndex()
+    await index.record_sources(
+        [
+            {
+                "title": "Deep Residual Learning for Image Recognition",
+                "authors": ["Kaiming He"],
+                "year": 2016,
+                "doi": "https://doi.org/10.1109/CVPR.2016.90",
+                "provider": "openalex",
+            }
+        ]
+    )
+    verifier = make_verifier(mock_redis, bibliographic_index=index)
+
+    result = await verifier._verify_from_index(
+        SourceInput(title="Something else entirely", doi="10.1109/cvpr.2016.90"),
+        "10.1109/cvpr.2016.90",
+        None,
+        "something else entirely",
+    )
+
+    assert result.status == VerificationStatus.VERIFIED
+    assert result.from_index
+    assert result.provider == "openalex"
+    assert result.match_score < 0.9  # mapped to 'mismatched' downstream
+
+
+@pytest.mark.asyncio
+async def test_record_upserts_by_doi():
+    index = BibliographicIndex()
+    work = {
+        "title": "Deep Residual Learning",
+        "year": 2016,
+        "doi": "10.1109/cvpr.2016.90",
+        "provider": "crossref",
+    }
+    await index.record([work])
+    await index.record(
+        [{**work, "title": "Deep Residual Learning for Image Recognition"}]
+    )
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(select(BibliographicWork))).scalars().all()
+    assert len(rows) == 1
+    assert rows[0].title == "Deep Residual Learning for Image Recognition"
+    assert rows[0].normalized_title == "deep residual learning for image recognition"
+
+
+@pytest.mark.asyncio
+async def test_title_candidates_are_ranked_before_the_limit():
+    index = BibliographicIndex(max_candidates=5)
+    head = "The impact of artificial intelligence on "
+    # Older works sharing only the common head fill the prefilter.
+    await index.record(
+        {"title": f"{head}{topic} in Europe", "provider": "crossref"}
+        for topic in [f"sector number {n} of the economy" for n in range(30)]
+    )
+    target = f"{head}small and medium enterprises"
+    await index.record([{"title": target, "year": 2024, "provider": "openalex"}])
+
+    typo = f"{head}smal and medium enterprises"
+    found = await index.lookup(None, None, typo.lower())
+
+    assert len(found.by_title) == 5
+    assert found.by_title[0]["title"] == target
+
+
+@pytest.mark.asyncio
+async def test_racing_upsert_only_skips_its_own_row():
+    from sqlalchemy.exc import IntegrityError
+
+    index = BibliographicIndex()
+    upsert = BibliographicIndex._upsert
+
+    async def racing(self, db, work):
+        await upsert(self, db, work)
+        if work["title"] == "Raced":
+            raise IntegrityError("INSERT", {}, Exception("duplicate doi"))
+
+    with patch.object(BibliographicIndex, "_upsert", new=racing):
+        written = await index.record(
+            {"title": title, "provider": "crossref"}
+            for title in ("First", "Raced", "Last")
+        )
+
+    async with AsyncSessionLocal() as db:
+        titles = (await db.execute(select(BibliographicWork.title))).scalars().all()
+    assert written == 2
+    assert sorted(titles) == ["First", "Last"]
+
+
+@pytest.mark.parametrize(
+    ("source", "indexed"),
+    [
+        ({"title": "A", "provider": "crossref"}, True),
+        ({"title": "A", "provider": "tavily"}, False),  # web search hit
+        ({"title": "A"}, False),  # LLM-cited, unverified
+        (
+            {
+                "title": "Claimed title",
+                "verification_status": "verified",
+                "canonical_metadata": {
+                    "status": "verified",
+                    "title": "Canonical title",
+                    "provider": "semantic_scholar",
+                },
+            },
+            True,
+        ),
+        (
+            {
+                "title": "Uploaded",
+                "verification_status": "verified",
+                "canonical_metadata": {
+                    "status": "verified",
+                    "provider": "uploaded_file",
+                },
+            },
+            False,
+        ),
+    ],
+)
+def test_work_from_source_only_indexes_provider_records(source, indexed):
+    assert (work_from_source(source) is not None) is indexed
@@ -0,0 +1,108 @@
+"""
+Unit tests for the blocking-call executor (blocking_executor.py)
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.ai_pipeline.rag_retriever import RAGRetriever
+from app.services.blocking_executor import BlockingExecutor
+
+
+class SlowTavilyClient:
+    """Synchronous SDK stand-in that blocks its thread like a real HTTP call."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.thread: str | None = None
+
+    def search(self, **kwargs):
+        self.thread = threading.current_thread().name
+        time.sleep(self.delay)
+        return {"results": [{"title": "Slow result", "url": "https://x.edu/1"}]}
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_during_slow_tavily_search():
+    executor = BlockingExecutor(max_workers=2)
+    retriever = RAGRetriever(tavily_api_key=None)
+    retriever.tavily_client = SlowTavilyClient(delay=0.3)
+    ticks: list[float] = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    with patch(
+        "app.services.blocking_executor.get_blocking_executor",
+        return_value=executor,
+    ):
+        ticking = asyncio.create_task(ticker())
+        try:
+            docs = await retriever.search_tavily("slow query", max_results=1)
+        finally:
+            ticking.cancel()
+    executor.shutdown()
+
+    assert [doc.title for doc in docs] == ["Slow result"]
+    assert retriever.tavily_client.thread.startswith("blocking-io")
+    # A blocked loop would record one tick before and one after the 0.3s call.
+    assert len(ticks) >= 10
+    assert max(b - a for a, b in zip(ticks, ticks[1:], strict=False)) < 0.15
+    calls = executor.stats()["calls"]["tavily.search"]
+    assert calls["calls"] == 1
+    assert calls["max_seconds"] >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_pool_is_bounded_and_records_queue_wait_and_errors():
+    executor = BlockingExecutor(max_workers=1)
+    release = threading.Event()
+
+    def hold():
+        release.wait(timeout=2)
+        return "held"
+
+    def fail():
+        raise ValueError("corrupt pdf")
+
+    first = asyncio.create_task(executor.run("hold", hold))
+    second = asyncio.create_task(executor.run("parse", fail))
+    await asyncio.sleep(0.05)
+    stats = executor.stats()
+    assert (stats["running"], stats["queued"]) == (1, 1)
+
+    release.set()
+    assert await first == "held"
+    with pytest.raises(ValueError, match="corrupt pdf"):
+        await second
+    executor.shutdown()
+
+    stats = executor.stats()
+    assert (stats["running"], stats["queued"]) == (0, 0)
+    assert stats["calls"]["parse"]["errors"] == 1
+    assert stats["calls"]["parse"]["max_wait_seconds"] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_call_never_runs():
+    executor = BlockingExecutor(max_workers=1)
+    release = threading.Event()
+    ran: list[str] = []
+
+    first = asyncio.create_task(executor.run("hold", release.wait, 2))
+    queued = asyncio.create_task(executor.run("late", ran.append, "late"))
+    await asyncio.sleep(0.05)
+    queued.cancel()
+    await asyncio.sleep(0.05)  # let the cancellation reach the pool
+    release.set()
+    await first
+    executor.shutdown()
+
+    assert ran == []
+    assert executor.stats()["queued"] == 0
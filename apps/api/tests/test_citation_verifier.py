@@ -119,14 +119,6 @@ def empty_dispatch(url, params=None, headers=None):
     return make_response(200, CROSSREF_EMPTY)
 
 
-@pytest.fixture
-def mock_redis():
-    redis = MagicMock()
-    redis.get = AsyncMock(return_value=None)
-    redis.set = AsyncMock()
-    return redis
-
-
 def make_verifier(mock_redis, **kwargs) -> CitationVerifier:
     """Verifier with instant retries and effectively unlimited rate limits"""
     return CitationVerifier(
@@ -541,6 +533,137 @@ async def test_verify_sources_preserves_order(mock_redis):
     ]
 
 
+@pytest.mark.asyncio
+async def test_verify_sources_resolves_dois_in_batch(mock_redis):
+    verifier = make_verifier(mock_redis)
+    openalex_only = {
+        **OPENALEX_WORK,
+        "title": "BERT: Pre-training of Deep Bidirectional Transformers",
+        "publication_year": 2019,
+        "doi": "https://doi.org/10.48550/arxiv.1810.04805",
+    }
+    sources = [
+        SourceInput(title="Attention Is All You Need", doi="10.5555/3295222"),
+        SourceInput(
+            title="BERT: Pre-training of Deep Bidirectional Transformers",
+            doi="https://doi.org/10.48550/arXiv.1810.04805",
+        ),
+        SourceInput(title="Made Up Study", doi="10.9999/missing"),
+    ]
+
+    def dispatch(url, params=None, headers=None):
+        assert "/works/10." not in url, "per-source DOI lookup not expected"
+        params = params or {}
+        if params.get("filter", "").startswith("doi:") and "openalex" in url:
+            assert params["filter"] == "doi:10.48550/arxiv.1810.04805|10.9999/missing"
+            return make_response(200, {"results": [openalex_only]})
+        if params.get("filter", "").startswith("doi:"):
+            assert params["filter"].count("doi:") == 3
+            return make_response(200, {"message": {"items": [CROSSREF_WORK]}})
+        return empty_dispatch(url, params, headers)
+
+    client = make_client(dispatch)
+    with patch("httpx.AsyncClient", return_value=client):
+        results = await verifier.verify_sources(sources)
+
+    assert [(r.status, r.provider) for r in results] == [
+        (VerificationStatus.VERIFIED, "crossref"),
+        (VerificationStatus.VERIFIED, "openalex"),
+        (VerificationStatus.NOT_FOUND, None),  # title cascade, cleanly empty
+    ]
+    assert results[0].match_score == 1.0
+    # 2 batch requests + 4 title searches for the one unknown DOI
+    assert client.get.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_doi_error_falls_back_to_per_source_lookup(mock_redis):
+    verifier = make_verifier(mock_redis)
+    sources = [
+        SourceInput(title="Attention Is All You Need", doi="10.5555/3295222"),
+        SourceInput(title="Other Paper", doi="10.1000/other"),
+    ]
+
+    def dispatch(url, params=None, headers=None):
+        if (params or {}).get("filter", "").startswith("doi:"):
+            return make_response(503)
+        if "/works/10.5555/3295222" in url:
+            return make_response(200, {"message": CROSSREF_WORK})
+        if "/works/10.1000/other" in url:
+            return make_response(404)
+        return empty_dispatch(url, params, headers)
+
+    client = make_client(dispatch)
+    with patch("httpx.AsyncClient", return_value=client):
+        results = await verifier.verify_sources(sources)
+
+    assert results[0].status == VerificationStatus.VERIFIED
+    assert results[1].status == VerificationStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_verify_sources_batches_cache_reads_and_writes(mock_redis):
+    verifier = make_verifier(mock_redis, negative_filter_enabled=False)
+    cached = SourceInput(title="Attention Is All You Need", year=2017)
+    cached_key = verifier._source_cache_key(cached)
+    hit = VerificationResult(
+        status=VerificationStatus.VERIFIED,
+        title="Attention Is All You Need",
+        provider="crossref",
+        match_score=1.0,
+    )
+    mock_redis.mget = AsyncMock(
+        side_effect=lambda keys: [
+            json.dumps(hit.to_dict()) if key == cached_key else None for key in keys
+        ]
+    )
+    missing = SourceInput(title="Nonexistent Paper About Nothing")
+    sources = [cached, missing, missing]
+
+    client = make_client(empty_dispatch)
+    with patch("httpx.AsyncClient", return_value=client):
+        results = await verifier.verify_sources(sources)
+
+    assert [r.status for r in results] == [
+        VerificationStatus.VERIFIED,
+        VerificationStatus.NOT_FOUND,
+        VerificationStatus.NOT_FOUND,
+    ]
+    assert results[0].from_cache is True
+    assert results[1] is not results[2]  # duplicates get their own copy
+    mock_redis.mget.assert_awaited_once()
+    assert len(mock_redis.mget.await_args.args[0]) == 2  # deduplicated keys
+    mock_redis.get.assert_not_called()
+    mock_redis.set.assert_not_called()
+    pipeline = mock_redis.pipeline.return_value
+    assert pipeline.set.call_count == 1  # one clean NOT_FOUND, written once
+    pipeline.execute.assert_awaited_once()
+    assert client.get.await_count == 4  # duplicate verified once
+    assert verifier.cache_stats() == {
+        "hits": 1,
+        "misses": 1,
+        "writes": 1,
+        "errors": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cache_uses_shared_app_redis_pool():
+    shared = MagicMock()
+    shared.get = AsyncMock(return_value=None)
+    verifier = CitationVerifier(
+        rate_limits_rps=dict.fromkeys(PROVIDERS, 10000.0), retry_delays=[0, 0]
+    )
+
+    with (
+        patch("app.services.citation_verifier.get_redis_client", return_value=shared),
+        patch("app.services.citation_verifier.aioredis.from_url") as from_url,
+    ):
+        assert await verifier._get_redis() is shared
+
+    from_url.assert_not_called()
+
+
 # ----------------------------------------------------------------------
 # Abstract extraction (parsers + serialization, no mocks)
 # ----------------------------------------------------------------------
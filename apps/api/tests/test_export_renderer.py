@@ -0,0 +1,309 @@
+"""
+Unit tests for off-loop export rendering (export_renderer.py)
+"""
+
+import io
+import pickle
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from docx import Document as DocxDocument
+from prometheus_client import REGISTRY
+from pypdf import PdfReader
+from sqlalchemy import select
+
+from app.models.auth import User
+from app.models.document import ArtifactDeletionOutbox, Document
+from app.services import export_renderer
+from app.services.document_service import DocumentService
+from app.services.export_renderer import (
+    ExportBlock,
+    ExportDocument,
+    build_export_model,
+    export_cache_key,
+    render_export,
+)
+from app.services.parsing_service import ParsingService
+
+REF_A = "Rossi, M. (2021). Intelligenza artificiale & PMI. Milano: Egea."
+REF_B = "Bianchi, A. (2019). Formazione <digitale>. Roma: Carocci."
+
+
+def _document(**overrides):
+    fields = {
+        "title": "Tesi di prova",
+        "topic": "AI nelle PMI",
+        "language": "it",
+        "created_at": datetime(2026, 3, 1, 9, 30, 0),
+        "content": None,
+        "sections": [],
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _section(index, title, content, bibliography):
+    return SimpleNamespace(
+        section_index=index, title=title, content=content, bibliography=bibliography
+    )
+
+
+def _observed(format: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "document_export_render_seconds_count", {"format": format}
+        )
+        or 0.0
+    )
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = ParsingService(max_workers=1, timeout_seconds=60)
+    yield service
+    service.shutdown()
+
+
+def test_model_is_plain_data_in_render_order():
+    document = _document(
+        sections=[
+            _section(2, "Metodi", "Uno.\n\nDue.", [REF_B, REF_A]),
+            _section(1, "Introduzione", None, [REF_A]),
+        ]
+    )
+
+    model = build_export_model(document)
+
+    assert pickle.loads(pickle.dumps(model)) == model
+    assert model.created_at == "2026-03-01 09:30:00"
+    assert model.blocks == (
+        ExportBlock("section", "Introduzione"),
+        ExportBlock("section_end"),
+        ExportBlock("section", "Metodi"),
+        ExportBlock("section_body", "Uno.\n\nDue."),
+        ExportBlock("section_end"),
+    )
+    assert model.bibliography_heading == "Bibliografia"
+    assert model.bibliography == (REF_B, REF_A)
+
+    content_model = build_export_model(
+        _document(content="# Introduzione\n\n  Testo.  \n\n\n\n# Bibliografia")
+    )
+    assert content_model.blocks == (
+        ExportBlock("heading", "Introduzione"),
+        ExportBlock("paragraph", "Testo."),
+        ExportBlock("heading", "Bibliografia"),
+    )
+    assert content_model.bibliography == ()
+
+
+@pytest.mark.asyncio
+async def test_formats_render_in_worker_processes(service):
+    model = build_export_model(
+        _document(sections=[_section(1, "Introduzione", "Testo <uno> & due.", [REF_A])])
+    )
+    docx_before, pdf_before = _observed("docx"), _observed("pdf")
+
+    docx_data = await render_export(model, "docx", service=service)
+    pdf_data = await render_export(model, "pdf", service=service)
+
+    docx = DocxDocument(io.BytesIO(docx_data))
+    headings = [p.text for p in docx.paragraphs if p.style.name.startswith("Heading")]
+    assert headings == ["Introduzione", "Bibliografia"]
+    assert REF_A in [p.text for p in docx.paragraphs]
+    pdf_text = "\n".join(
+        page.extract_text() for page in PdfReader(io.BytesIO(pdf_data)).pages
+    )
+    assert "Testo <uno> & due." in pdf_text
+    assert "Bibliografia" in pdf_text
+
+    calls = service.stats()["calls"]
+    assert calls["docx.render"]["calls"] == 1
+    assert calls["pdf.render"]["calls"] == 1
+    assert _observed("docx") == docx_before + 1
+    assert _observed("pdf") == pdf_before + 1
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        await render_export(model, "odt", service=service)
+
+
+async def _seed(db_session, email: str) -> tuple[User, Document]:
+    user = User(email=email, full_name="Export Render")
+    db_session.add(user)
+    await db_session.flush()
+    document = Document(
+        user_id=user.id,
+        title="Tesi esportata",
+        topic="AI nelle PMI",
+        status="completed",
+        language="it",
+        content=f"# Introduzione\n\nTesto.\n\n# Bibliografia\n\n{REF_A}",
+    )
+    db_session.add(document)
+    await db_session.commit()
+    await db_session.refresh(document)
+    return user, document
+
+
+def _storage(storage_class):
+    storage = storage_class.return_value
+    storage.upload_file = AsyncMock(
+        side_effect=lambda name, data, content_type: f"s3://test/{name}"
+    )
+    storage.get_file_size = AsyncMock(return_value=2048)
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_export_document_sends_only_the_model_to_the_renderer(db_session):
+    user, document = await _seed(db_session, "export-render@example.com")
+
+    render = AsyncMock(return_value=b"%PDF-rendered")
+    with (
+        patch("app.services.document_service.render_export", new=render),
+        patch("app.services.storage_service.StorageService") as storage_class,
+    ):
+        storage_class.return_value.upload_file = AsyncMock(
+            return_value="s3://test/object"
+        )
+        result = await DocumentService(db_session).export_document(
+            document_id=int(document.id), format="pdf", user_id=int(user.id)
+        )
+
+    model, format = render.await_args.args
+    assert format == "pdf"
+    assert isinstance(model, ExportDocument)
+    assert model.blocks[-1] == ExportBlock("paragraph", REF_A)
+    assert result["file_size"] == len(b"%PDF-rendered")
+    assert result["storage_path"].endswith(".pdf")
+    content_type = storage_class.return_value.upload_file.await_args.args[2]
+    assert content_type == export_renderer.EXPORT_CONTENT_TYPES["pdf"]
+
+
+def test_cache_key_covers_model_format_and_renderer_version():
+    model = build_export_model(_document(content="# Uno\n\nTesto."))
+    key = export_cache_key(model, "docx")
+
+    assert (
+        export_cache_key(
+            build_export_model(_document(content="# Uno\n\nTesto.")), "docx"
+        )
+        == key
+    )
+    assert export_cache_key(model, "pdf") != key
+    assert (
+        export_cache_key(
+            build_export_model(_document(content="# Uno\n\nAltro.")), "docx"
+        )
+        != key
+    )
+    with patch.object(export_renderer, "EXPORT_RENDERER_VERSION", 2):
+        assert export_cache_key(model, "docx") != key
+
+
+@pytest.mark.asyncio
+async def test_unchanged_document_reuses_its_stored_export(db_session):
+    user, document = await _seed(db_session, "export-cache@example.com")
+    renders = iter([b"docx-first", b"docx-second"])
+    render = AsyncMock(side_effect=lambda model, format: next(renders))
+    service = DocumentService(db_session)
+
+    with (
+        patch("app.services.document_service.render_export", new=render),
+        patch("app.services.storage_service.StorageService") as storage_class,
+    ):
+        storage = _storage(storage_class)
+        first = await service.export_document(
+            document_id=int(document.id), format="docx", user_id=int(user.id)
+        )
+        again = await service.export_document(
+            document_id=int(document.id), format="docx", user_id=int(user.id)
+        )
+
+        assert render.await_count == 1
+        assert storage.upload_file.await_count == 1
+        assert again["reused"] and not first["reused"]
+        assert again["storage_path"] == first["storage_path"]
+        assert again["artifact_sha256"] == first["artifact_sha256"]
+        assert again["download_url"] == first["download_url"]
+        assert again["file_size"] == 2048
+        await db_session.refresh(document)
+        assert document.docx_export_key == first["export_key"]
+
+        # An edit is a new key: render, upload, and evict the old object.
+        document.content = f"# Introduzione\n\nTesto rivisto.\n\n{REF_B}"
+        await db_session.commit()
+        edited = await service.export_document(
+            document_id=int(document.id), format="docx", user_id=int(user.id)
+        )
+
+    assert render.await_count == 2 and not edited["reused"]
+    assert edited["storage_path"] != first["storage_path"]
+    await db_session.refresh(document)
+    assert document.docx_path == edited["storage_path"]
+    outbox = (await db_session.execute(select(ArtifactDeletionOutbox))).scalars().all()
+    assert [(row.file_path, row.reason) for row in outbox] == [
+        (first["storage_path"], "superseded")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_missing_stored_export_is_rendered_again(db_session):
+    user, document = await _seed(db_session, "export-cache-missing@example.com")
+    render = AsyncMock(return_value=b"pdf-bytes")
+    service = DocumentService(db_session)
+
+    with (
+        patch("app.services.document_service.render_export", new=render),
+        patch("app.services.storage_service.StorageService") as storage_class,
+    ):
+        storage = _storage(storage_class)
+        first = await service.export_document(
+            document_id=int(document.id), format="pdf", user_id=int(user.id)
+        )
+        storage.get_file_size.side_effect = RuntimeError("NoSuchKey")
+        second = await service.export_document(
+            document_id=int(document.id), format="pdf", user_id=int(user.id)
+        )
+
+    assert render.await_count == 2 and not second["reused"]
+    # Same bytes, same content-addressed object: nothing to evict.
+    assert second["storage_path"] == first["storage_path"]
+    assert (await db_session.execute(select(ArtifactDeletionOutbox))).first() is None
+
+
+@pytest.mark.asyncio
+async def test_failed_bind_of_a_reused_export_keeps_the_bound_object():
+    from app.services import background_jobs
+
+    service = MagicMock()
+    service.export_document = AsyncMock(
+        return_value={
+            "storage_path": "s3://test/bound.docx",
+            "artifact_sha256": "a" * 64,
+            "export_key": "k" * 64,
+            "reused": True,
+        }
+    )
+    with (
+        patch.object(
+            background_jobs,
+            "persist_generation_artifact",
+            new=AsyncMock(side_effect=RuntimeError("lease lost")),
+        ),
+        patch.object(background_jobs, "StorageService") as storage_class,
+    ):
+        storage_class.return_value.delete_file = AsyncMock(return_value=True)
+        with pytest.raises(RuntimeError, match="lease lost"):
+            await background_jobs._export_document_with_fence(
+                MagicMock(),
+                document_service=service,
+                document_id=1,
+                user_id=1,
+                job_id=1,
+                lease_owner="worker",
+                lease_token="token",
+            )
+
+    storage_class.return_value.delete_file.assert_not_awaited()
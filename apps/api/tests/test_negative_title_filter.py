@@ -0,0 +1,151 @@
+"""
+Unit tests for the negative-result title filter (in-memory Redis bitmaps)
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.citation_verifier import SourceInput, VerificationStatus
+from app.services.negative_title_filter import NegativeTitleFilter, bloom_parameters
+from tests.test_citation_verifier import (
+    empty_dispatch,
+    make_client,
+    make_response,
+    make_verifier,
+)
+
+
+class FakeBitmapRedis:
+    """Just enough of redis.asyncio for GETBIT/SETBIT pipelines + get/set."""
+
+    def __init__(self):
+        self.bitmaps: dict[str, set[int]] = {}
+        self.get = AsyncMock(return_value=None)
+        self.set = AsyncMock()
+
+    def pipeline(self, transaction=True):
+        redis = self
+        ops = []
+
+        class Pipeline:
+            def getbit(self, key, offset):
+                ops.append(lambda: int(offset in redis.bitmaps.get(key, set())))
+
+            def setbit(self, key, offset, value):
+                ops.append(lambda: redis.bitmaps.setdefault(key, set()).add(offset))
+
+            def expire(self, key, seconds):
+                ops.append(lambda: True)
+
+            async def execute(self):
+                return [op() for op in ops]
+
+        return Pipeline()
+
+
+def dispatch_with(crossref_items):
+    def dispatch(url, params=None, headers=None):
+        if "crossref" in url:
+            return make_response(200, {"message": {"items": crossref_items}})
+        return empty_dispatch(url, params, headers)
+
+    return dispatch
+
+
+def test_bloom_parameters_follow_fp_rate():
+    bits, hashes = bloom_parameters(100_000, 0.0001)
+    assert 1_900_000 < bits < 2_000_000
+    assert hashes == 13
+    assert bloom_parameters(100_000, 0.01)[0] < bits
+
+
+@pytest.mark.asyncio
+async def test_filter_membership_and_rotation():
+    redis = FakeBitmapRedis()
+    bloom = NegativeTitleFilter(capacity=1000, fp_rate=0.001, rebuild_seconds=3600)
+
+    with patch("app.services.negative_title_filter.time.time", return_value=7200.0):
+        await bloom.add(redis, "quantum blockchain pedagogy in rural schools")
+        assert await bloom.contains(
+            redis, "quantum blockchain pedagogy in rural schools"
+        )
+        assert not await bloom.contains(redis, "attention is all you need")
+    # Next period: the previous generation is still consulted...
+    with patch("app.services.negative_title_filter.time.time", return_value=10800.0):
+        assert await bloom.contains(
+            redis, "quantum blockchain pedagogy in rural schools"
+        )
+    # ...two periods later the entry has been rotated out.
+    with patch("app.services.negative_title_filter.time.time", return_value=14400.0):
+        assert not await bloom.contains(
+            redis, "quantum blockchain pedagogy in rural schools"
+        )
+
+
+@pytest.mark.asyncio
+async def test_repeat_invented_title_short_circuits():
+    redis = FakeBitmapRedis()
+    verifier = make_verifier(redis, negative_filter_enabled=True)
+    client = make_client(dispatch_with([]))
+
+    with patch("httpx.AsyncClient", return_value=client):
+        first = await verifier.verify_source(
+            SourceInput(title="Neural Pedagogy of Quantum Ledgers", year=2021)
+        )
+        calls = client.get.await_count
+        # Different year/authors: a cache miss, same invented title
+        second = await verifier.verify_source(
+            SourceInput(
+                title="Neural pedagogy of quantum ledgers.",
+                authors=["Rossi"],
+                year=2019,
+            )
+        )
+
+    assert first.status == VerificationStatus.NOT_FOUND
+    assert first.reason is None
+    assert calls == 4
+    assert second.status == VerificationStatus.NOT_FOUND
+    assert second.reason == "negative_filter"
+    assert client.get.await_count == calls  # no further API calls
+
+
+@pytest.mark.asyncio
+async def test_author_veto_does_not_mark_title_absent():
+    redis = FakeBitmapRedis()
+    verifier = make_verifier(redis, negative_filter_enabled=True)
+    real = {
+        "title": ["Attention Is All You Need"],
+        "author": [{"given": "Ashish", "family": "Vaswani"}],
+        "issued": {"date-parts": [[2017]]},
+    }
+    client = make_client(dispatch_with([real]))
+
+    with patch("httpx.AsyncClient", return_value=client):
+        vetoed = await verifier.verify_source(
+            SourceInput(title="Attention Is All You Need", authors=["Rossi"])
+        )
+        genuine = await verifier.verify_source(
+            SourceInput(title="Attention Is All You Need", authors=["Vaswani"])
+        )
+
+    assert vetoed.status == VerificationStatus.NOT_FOUND
+    assert redis.bitmaps == {}
+    assert genuine.status == VerificationStatus.VERIFIED
+
+
+@pytest.mark.asyncio
+async def test_identifier_sources_bypass_the_filter():
+    redis = FakeBitmapRedis()
+    verifier = make_verifier(redis, negative_filter_enabled=True)
+    await verifier._negative_filter.add(redis, "invented title")
+    client = make_client(dispatch_with([]))
+
+    with patch("httpx.AsyncClient", return_value=client):
+        result = await verifier.verify_source(
+            SourceInput(title="Invented Title", doi="10.1234/abc")
+        )
+
+    assert result.reason != "negative_filter"
+    assert client.get.await_count > 0
@@ -0,0 +1,287 @@
+"""
+Unit tests for the cross-document source-pack candidate cache
+(pack_candidate_cache.py)
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.ai_pipeline.pack_candidate_cache import (
+    PackCandidateCache,
+    pack_candidate_key,
+)
+from app.services.ai_pipeline.rag_retriever import SourceDoc
+from app.services.ai_pipeline.retrieval_cache import RetrievalCache
+from app.services.ai_pipeline.source_pack import SourcePackBuilder
+from app.services.ai_pipeline.source_pack_preflight import preverify_source_pack
+from app.services.citation_verifier import VerificationResult, VerificationStatus
+
+
+def _counting_provider(name, calls, *, fail=False):
+    async def search(query, limit=10, **_):
+        calls.append((name, query))
+        if fail:
+            raise RuntimeError("provider down")
+        return [
+            SourceDoc(
+                title=f"AI education evidence {name} {i}",
+                authors=[f"Rossi {i}"],
+                year=2020 + i % 4,
+                abstract="AI education for school students",
+                doi=f"10.1/{name}.{i}",
+                provider=name,
+                source_type="journal-article",
+            )
+            for i in range(12)
+        ]
+
+    return search
+
+
+def _builder(cache, calls, **kwargs):
+    builder = SourcePackBuilder(candidate_cache=cache)
+    builder.rag.search_crossref = _counting_provider("crossref", calls, **kwargs)
+    builder.rag.search_openalex = _counting_provider("openalex", calls)
+    return builder
+
+
+def _cache(ttl_seconds=3600):
+    return PackCandidateCache(RetrievalCache(ttl_seconds=3600), ttl_seconds=ttl_seconds)
+
+
+def test_key_is_the_normalized_query_list():
+    key = pack_candidate_key(
+        ["AI in education", "AI in education  school"],
+        language="it",
+        domain="education",
+        per_query=24,
+        retrieval_page=1,
+    )
+
+    assert key == pack_candidate_key(
+        ["AI in EDUCATION", "ai in education school", "AI in education"],
+        language="IT",
+        domain="education",
+        per_query=24,
+        retrieval_page=1,
+    )
+    assert key != pack_candidate_key(
+        ["AI in education school", "AI in education"],
+        language="it",
+        domain="education",
+        per_query=24,
+        retrieval_page=1,
+    )
+    assert key != pack_candidate_key(
+        ["AI in education", "AI in education school"],
+        language="en",
+        domain="education",
+        per_query=24,
+        retrieval_page=1,
+    )
+    assert key != pack_candidate_key(
+        ["AI in education", "AI in education school"],
+        language="it",
+        domain="education",
+        per_query=24,
+        retrieval_page=2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_second_document_reuses_candidates_but_builds_its_own_pack():
+    cache = _cache()
+    calls: list = []
+    common = {"topic": "AI in education", "language": "en", "target_size": 8}
+
+    first = await _builder(cache, calls).build(
+        document_id=1, raise_on_provider_error=True, **common
+    )
+    first_calls = len(calls)
+    second = await _builder(cache, calls).build(document_id=2, **common)
+
+    assert first_calls > 0
+    assert len(calls) == first_calls  # no provider request for document 2
+    assert second.document_id == 2
+    assert second.sha256() == first.sha256()
+    assert second.sources[0].source is not first.sources[0].source
+    assert cache.stats()["candidate_hits"] == 1
+
+    # A different query plan (section titles) is a different entry.
+    await _builder(cache, calls).build(
+        document_id=3, section_titles=["Assessment"], **common
+    )
+    assert len(calls) > first_calls
+
+
+@pytest.mark.asyncio
+async def test_reordered_query_plan_builds_the_same_pack_warm_or_cold():
+    """Candidates are cached in grid/dedup order, so the same query set in
+    another order must not be served the first plan's candidate order."""
+
+    def provider(name):
+        async def search(query, limit=10, **_):
+            docs = [
+                SourceDoc(
+                    title=f"AI education evidence {name} {i}",
+                    authors=[f"Rossi {i}"],
+                    year=2021,
+                    abstract="AI education for school students",
+                    doi=f"10.1/{name}.{i}",
+                    provider=name,
+                    source_type="journal-article",
+                )
+                for i in range(4)
+            ]
+            section = query.removeprefix("AI in education ")
+            if section in ("Assessment", "Curriculum design"):
+                # Both section queries return this paper with their own
+                # author order; dedup merges it into whichever comes first.
+                lead = "Bianchi" if section == "Assessment" else "Verdi"
+                docs.append(
+                    SourceDoc(
+                        title="AI education in school practice",
+                        authors=[lead, "Bianchi", "Verdi"],
+                        year=2022,
+                        abstract="AI education for school students",
+                        doi="10.1/shared",
+                        provider=name,
+                        source_type="journal-article",
+                    )
+                )
+            return docs
+
+        return search
+
+    async def build(cache, section_titles):
+        builder = SourcePackBuilder(candidate_cache=cache)
+        builder.rag.search_crossref = provider("crossref")
+        builder.rag.search_openalex = provider("openalex")
+        return await builder.build(
+            topic="AI in education",
+            language="en",
+            target_size=8,
+            document_id=1,
+            section_titles=section_titles,
+            raise_on_provider_error=True,
+        )
+
+    forward = ["Assessment", "Curriculum design"]
+    reverse = ["Curriculum design", "Assessment"]
+    warm = _cache()
+    await build(warm, forward)
+    warm_pack = await build(warm, reverse)
+    cold_pack = await build(_cache(), reverse)
+
+    assert warm_pack.sha256() == cold_pack.sha256()
+    assert warm.stats()["candidate_hits"] == 0
+    assert (await build(warm, reverse)).sha256() == cold_pack.sha256()
+    assert warm.stats()["candidate_hits"] == 1
+    assert [s.citation_key for s in warm_pack.sources] == [
+        s.citation_key for s in cold_pack.sources
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stale_or_degraded_builds_are_not_reused():
+    calls: list = []
+    common = {"topic": "AI in education", "language": "en", "target_size": 8}
+
+    degraded = _cache()
+    await _builder(degraded, calls, fail=True).build(
+        document_id=1, raise_on_provider_error=True, **common
+    )
+    await _builder(degraded, calls).build(document_id=2, **common)
+    assert degraded.stats()["candidate_hits"] == 0  # provider errors: not stored
+
+    stale = _cache(ttl_seconds=60)
+    await _builder(stale, calls).build(
+        document_id=1, raise_on_provider_error=True, **common
+    )
+    with patch(
+        "app.services.ai_pipeline.pack_candidate_cache.time.time",
+        return_value=10**12,
+    ):
+        await _builder(stale, calls).build(document_id=2, **common)
+    assert stale.stats()["candidate_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lenient_builds_read_but_never_store_candidates():
+    """Lenient provider calls swallow HTTP errors and return [], so a
+    degraded candidate list would look clean: it must not be cached."""
+    cache = _cache()
+    calls: list = []
+    common = {"topic": "AI in education", "language": "en", "target_size": 8}
+
+    async def swallowed(query, limit=10, **_):
+        calls.append(("crossref", query))
+        return []  # search_crossref after a logged HTTP 503
+
+    degraded = _builder(cache, calls)
+    degraded.rag.search_crossref = swallowed
+    await degraded.build(document_id=1, **common)
+    await _builder(cache, calls).build(document_id=2, **common)
+    assert cache.stats()["candidate_hits"] == 0
+    assert cache.stats()["candidate_writes"] == 0
+
+    strict = await _builder(cache, calls).build(
+        document_id=3, raise_on_provider_error=True, **common
+    )
+    lenient = await _builder(cache, calls).build(document_id=4, **common)
+    assert cache.stats()["candidate_hits"] == 1
+    assert lenient.sha256() == strict.sha256()
+
+
+def _verifying(pack):
+    verifier = MagicMock()
+
+    async def verify_sources(inputs):
+        return [
+            VerificationResult(
+                status=VerificationStatus.VERIFIED,
+                doi=item.doi,
+                title=item.title,
+                authors=list(item.authors),
+                year=item.year,
+                provider="crossref",
+                match_score=1.0,
+            )
+            for item in inputs
+        ]
+
+    verifier.verify_sources = AsyncMock(side_effect=verify_sources)
+    return verifier
+
+
+@pytest.mark.asyncio
+async def test_preflight_reuses_verification_recorded_by_another_document():
+    cache = _cache()
+    calls: list = []
+    common = {"topic": "AI in education", "language": "en", "target_size": 8}
+
+    first_pack = await _builder(cache, calls).build(document_id=1, **common)
+    first_verifier = _verifying(first_pack)
+    first = await preverify_source_pack(
+        first_pack,
+        first_verifier,
+        target_size=6,
+        minimum_verified=4,
+        candidate_cache=cache,
+    )
+    second_pack = await _builder(cache, calls).build(document_id=2, **common)
+    second_verifier = _verifying(second_pack)
+    second = await preverify_source_pack(
+        second_pack,
+        second_verifier,
+        target_size=6,
+        minimum_verified=4,
+        candidate_cache=cache,
+    )
+
+    assert len(first_verifier.verify_sources.await_args.args[0]) == 8
+    assert second_verifier.verify_sources.await_args.args[0] == []
+    assert second.pack.sha256() == first.pack.sha256()
+    assert second.pack.document_id == 2
+    assert cache.stats()["verified_reused"] == 8
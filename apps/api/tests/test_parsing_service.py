@@ -0,0 +1,264 @@
+"""
+Unit tests for the process-pool parsing service (parsing_service.py)
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import signal
+import time
+from unittest.mock import patch
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from app.services import parsing_service
+from app.services.parsing_service import (
+    ParsingError,
+    ParsingQueueTimeoutError,
+    ParsingService,
+    ParsingTimeoutError,
+)
+from app.services.uploaded_sources import extract_pdf_pages
+
+
+def _pdf(pages: int) -> bytes:
+    out = io.BytesIO()
+    pdf = canvas.Canvas(out)
+    for number in range(1, pages + 1):
+        for line in range(40):
+            pdf.drawString(40, 800 - line * 18, f"Page {number} line {line} testo")
+        pdf.showPage()
+    pdf.save()
+    return out.getvalue()
+
+
+def _ignore_alarm_and_sleep(seconds: float) -> None:
+    """A call the in-worker alarm cannot interrupt (like a stuck C call)."""
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    time.sleep(seconds)
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = ParsingService(max_workers=2, timeout_seconds=30, batch_pages=7)
+    yield service
+    service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pages_stream_in_order_across_batches(service):
+    data = _pdf(23)
+
+    streamed = [page async for page in service.iter_pdf_pages(data, max_pages=400)]
+
+    assert streamed == extract_pdf_pages(data)
+    assert [page.split()[1] for page in streamed] == [str(n) for n in range(1, 24)]
+    assert service.stats()["calls"]["pdf.pages"]["calls"] >= 4  # 23 pages / 7
+    with pytest.raises(ValueError, match="limit is 20"):
+        await service.pdf_pages(data, max_pages=20)
+    with pytest.raises(ValueError, match="Not a readable PDF"):
+        await service.pdf_pages(b"%PDF-1.4 truncated")
+
+
+@pytest.mark.asyncio
+async def test_page_ranges_are_extracted_in_parallel_from_one_mapped_file():
+    data = _pdf(23)
+    service = ParsingService(max_workers=2, timeout_seconds=30, batch_pages=5)
+    staged: list[str] = []
+    peak = 0
+    stage, run = parsing_service._stage_pdf, service.run
+
+    def tracked_stage(content):
+        staged.append(stage(content))
+        return staged[-1]
+
+    async def tracked_run(label, fn, *args, **kwargs):
+        nonlocal peak
+        task = asyncio.ensure_future(run(label, fn, *args, **kwargs))
+        await asyncio.sleep(0)
+        peak = max(peak, service.stats()["in_flight"])
+        return await task
+
+    try:
+        with (
+            patch.object(parsing_service, "_stage_pdf", new=tracked_stage),
+            patch.object(service, "run", new=tracked_run),
+        ):
+            pages = await service.pdf_pages(data)
+            assert pages == extract_pdf_pages(data)
+            assert peak == 2
+            assert not os.path.exists(staged[0])
+
+            # A consumer that stops early cancels the outstanding ranges.
+            async with contextlib.aclosing(service.iter_pdf_pages(data)) as stream:
+                assert (await anext(stream)).startswith("Page 1 line 0")
+            assert not os.path.exists(staged[1])
+            assert service.stats()["in_flight"] == 0
+
+        # A path is passed through as is; nothing is staged.
+        path = staged[0]
+        with open(path, "wb") as file:
+            file.write(data)
+        assert await service.pdf_pages(path) == pages
+        assert os.path.exists(path) and len(staged) == 2
+        os.unlink(path)
+        with pytest.raises(ValueError, match="Not a readable PDF"):
+            await service.pdf_pages(path)
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_while_parsing(service):
+    data = _pdf(120)
+    await service.pdf_pages(_pdf(1))  # workers started
+    ticks: list[float] = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        pages = await service.pdf_pages(data)
+    finally:
+        ticking.cancel()
+
+    assert len(pages) == 120
+    assert len(ticks) >= 5
+    assert max(b - a for a, b in zip(ticks, ticks[1:], strict=False)) < 0.15
+
+
+@pytest.mark.asyncio
+async def test_time_and_memory_limits_fail_the_file_not_the_pool(service):
+    with pytest.raises(ParsingTimeoutError):
+        await service.run("sleep", time.sleep, 5, timeout=0.3)
+    limited = ParsingService(max_workers=1, memory_limit_mb=64)
+    try:
+        with pytest.raises(ParsingError, match="memory"):
+            await limited.run("alloc", bytearray, 512 * 1024 * 1024)
+        assert await limited.run("alloc", bytearray, 1024) == bytearray(1024)
+    finally:
+        limited.shutdown()
+
+    assert await service.run("sleep", time.sleep, 0) is None
+    stats = service.stats()
+    assert stats["timeouts"] == 1 and stats["restarts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stuck_worker_is_killed_and_queue_depth_reported():
+    service = ParsingService(max_workers=1, timeout_seconds=0.3)
+    try:
+        await service.run("warmup", time.sleep, 0)
+        with patch.object(parsing_service, "HARD_TIMEOUT_GRACE_SECONDS", 0.2):
+            stuck = asyncio.create_task(
+                service.run("stuck", _ignore_alarm_and_sleep, 30)
+            )
+            queued = asyncio.create_task(service.run("sleep", time.sleep, 0))
+            await asyncio.sleep(0.1)
+            assert (service.stats()["in_flight"], service.stats()["queued"]) == (2, 1)
+            with pytest.raises(ParsingTimeoutError):
+                await stuck
+            # It waited for a worker slot, not in the killed pool: it runs
+            # on the fresh one.
+            assert await queued is None
+
+        stats = service.stats()
+        assert stats["restarts"] == 1
+        assert stats["in_flight"] == 0
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_does_not_count_as_a_stuck_worker():
+    service = ParsingService(max_workers=1, timeout_seconds=1.0)
+    try:
+        await service.run("warmup", time.sleep, 0)
+        with patch.object(parsing_service, "HARD_TIMEOUT_GRACE_SECONDS", 0.3):
+            # The last call waits ~1.4 s, past timeout + grace, yet is healthy.
+            results = await asyncio.gather(
+                *(service.run("sleep", time.sleep, 0.7) for _ in range(3))
+            )
+
+        assert results == [None, None, None]
+        stats = service.stats()
+        assert (stats["restarts"], stats["timeouts"]) == (0, 0)
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_fails_only_the_waiting_call():
+    service = ParsingService(
+        max_workers=1, timeout_seconds=5, queue_timeout_seconds=0.2
+    )
+    try:
+        await service.run("warmup", time.sleep, 0)
+        running = asyncio.create_task(service.run("sleep", time.sleep, 0.6))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ParsingQueueTimeoutError):
+            await service.run("sleep", time.sleep, 0)
+
+        assert await running is None
+        stats = service.stats()
+        assert (stats["queue_timeouts"], stats["restarts"]) == (1, 0)
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_requirement_files_are_extracted_through_the_pool(service, tmp_path):
+    from docx import Document as DocxDocument
+
+    from app.services.background_jobs import BackgroundJobService
+
+    pdf_path = tmp_path / "requirements.pdf"
+    pdf_path.write_bytes(_pdf(3))
+    docx_path = tmp_path / "requirements.docx"
+    doc = DocxDocument()
+    doc.add_paragraph("Citazioni in stile APA")
+    doc.add_paragraph("Margini 2,5 cm")
+    doc.save(str(docx_path))
+
+    with (
+        patch("app.services.background_jobs.get_parsing_service", return_value=service),
+        patch.object(service, "pdf_pages", wraps=service.pdf_pages) as pdf_pages,
+    ):
+        pdf_text = await BackgroundJobService._extract_pdf_text(str(pdf_path))
+        docx_text = await BackgroundJobService._extract_docx_text(str(docx_path))
+
+    # The path goes to the workers; the parent never reads the PDF.
+    pdf_pages.assert_awaited_once_with(str(pdf_path))
+    assert pdf_text.startswith("Page 1 line 0") and "Page 3 line 39" in pdf_text
+    assert docx_text == "Citazioni in stile APA\nMargini 2,5 cm"
+    assert service.stats()["calls"]["docx.paragraphs"]["calls"] == 1
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_page_parallel_extraction_benchmark():
+    """400-page PDF: sharded page ranges on 4 workers against the
+    single-threaded extract_pdf_pages."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 1
+    if cpus < 4:
+        pytest.skip(f"needs 4 CPUs for a meaningful comparison, have {cpus}")
+    data = _pdf(400)
+    service = ParsingService(max_workers=4, timeout_seconds=300, batch_pages=25)
+    try:
+        await service.pdf_pages(_pdf(1))  # workers started
+        started = time.perf_counter()
+        sequential = extract_pdf_pages(data)
+        sequential_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        parallel = await service.pdf_pages(data)
+        parallel_seconds = time.perf_counter() - started
+    finally:
+        service.shutdown()
+
+    assert parallel == sequential
+    assert parallel_seconds < sequential_seconds / 2
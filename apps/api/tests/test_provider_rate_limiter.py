@@ -0,0 +1,191 @@
+"""
+Unit tests for the cluster-wide provider rate limiter (mocked Redis, no sleep)
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services.citation_verifier import (
+    PROVIDERS,
+    CitationVerifier,
+    SourceInput,
+    VerificationStatus,
+)
+from app.services.provider_rate_limiter import (
+    ProviderRateLimiter,
+    retry_after_seconds,
+)
+
+
+@pytest.fixture
+def sleeps():
+    """Record asyncio.sleep calls made by the limiter instead of sleeping."""
+    recorded: list[float] = []
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    with patch(
+        "app.services.provider_rate_limiter.asyncio.sleep", side_effect=fake_sleep
+    ):
+        yield recorded
+
+
+@pytest.mark.asyncio
+async def test_local_schedule_spaces_calls_per_provider(sleeps):
+    limiter = ProviderRateLimiter({"crossref": 2.0, "arxiv": 1.0}, distributed=False)
+
+    assert await limiter.acquire("crossref") == 0.0
+    second = await limiter.acquire("crossref")
+    # Other providers keep their own schedule
+    assert await limiter.acquire("arxiv") == 0.0
+
+    assert 0.45 < second <= 0.5
+    stats = limiter.stats()
+    assert stats["crossref"]["calls"] == 2
+    assert stats["crossref"]["waited_seconds"] == pytest.approx(second, abs=1e-3)
+    assert stats["arxiv"]["waited_seconds"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_penalize_holds_following_callers(sleeps):
+    limiter = ProviderRateLimiter({"openalex": 1000.0}, distributed=False)
+
+    await limiter.penalize("openalex", 5.0)
+    wait = await limiter.acquire("openalex")
+
+    assert 4.9 < wait <= 5.0
+    assert limiter.stats()["openalex"]["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_penalty_holds_providers_without_a_budget(sleeps):
+    limiter = ProviderRateLimiter({"arxiv": 0.0}, distributed=False)
+
+    assert await limiter.acquire("arxiv") == 0.0
+    assert await limiter.acquire("arxiv") == 0.0
+    await limiter.penalize("arxiv", 3.0)
+    wait = await limiter.acquire("arxiv")
+
+    assert 2.9 < wait <= 3.0
+    assert sleeps == [wait]
+
+    redis = MagicMock()
+    redis.eval = AsyncMock(return_value=1500)
+    shared = ProviderRateLimiter({"arxiv": 0.0}, redis_client=redis)
+    assert await shared.acquire("arxiv") == 1.5
+    assert redis.eval.call_args.args[1:] == (1, "provider_rate:arxiv", 0)
+
+
+@pytest.mark.asyncio
+async def test_redis_schedule_is_used_when_available(sleeps):
+    redis = MagicMock()
+    redis.eval = AsyncMock(return_value=250)
+    limiter = ProviderRateLimiter({"crossref": 5.0}, redis_client=redis)
+
+    wait = await limiter.acquire("crossref")
+
+    assert wait == 0.25
+    assert sleeps == [0.25]
+    args = redis.eval.call_args.args
+    assert args[1:] == (1, "provider_rate:crossref", 200)
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_local_schedule(sleeps):
+    redis = MagicMock()
+    redis.eval = AsyncMock(side_effect=ConnectionError("redis down"))
+    limiter = ProviderRateLimiter({"crossref": 2.0}, redis_client=redis)
+
+    assert await limiter.acquire("crossref") == 0.0
+    assert await limiter.acquire("crossref") > 0.4
+
+
+@pytest.mark.asyncio
+async def test_rate_overrides_never_touch_the_shared_schedule(sleeps):
+    redis = MagicMock()
+    redis.eval = AsyncMock(return_value=0)
+    with (
+        patch(
+            "app.services.provider_rate_limiter.settings.PROVIDER_RATE_LIMIT_DISTRIBUTED",
+            True,
+        ),
+        patch(
+            "app.services.provider_rate_limiter.get_redis_client", return_value=redis
+        ),
+    ):
+        verifier = CitationVerifier(
+            redis_client=MagicMock(),
+            rate_limits_rps=dict.fromkeys(PROVIDERS, 10000.0),
+        )
+        await verifier._rate_limiter.acquire("crossref")
+        await verifier._rate_limiter.penalize("crossref", 1.0)
+
+    redis.eval.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"Retry-After": "3"}, 3.0),
+        ({"Retry-After": "3600"}, 60.0),  # clamped
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),  # in the past
+        ({"Retry-After": "soon"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_seconds(headers, expected):
+    assert retry_after_seconds(httpx.Headers(headers)) == expected
+
+
+@pytest.mark.asyncio
+async def test_verifier_429_backs_off_through_shared_limiter():
+    limiter = MagicMock()
+    limiter.acquire = AsyncMock(return_value=0.0)
+    limiter.penalize = AsyncMock()
+    limiter.stats = MagicMock(return_value={})
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+    redis.set = AsyncMock()
+    verifier = CitationVerifier(
+        redis_client=redis,
+        retry_delays=[0, 0],
+        rate_limits_rps=dict.fromkeys(PROVIDERS, 10000.0),
+        rate_limiter=limiter,
+    )
+
+    throttled = httpx.Response(
+        429,
+        headers={"Retry-After": "7"},
+        request=httpx.Request("GET", "https://api.crossref.org/works"),
+    )
+    ok = httpx.Response(
+        200,
+        json={
+            "message": {
+                "items": [
+                    {
+                        "title": ["Attention Is All You Need"],
+                        "author": [{"given": "Ashish", "family": "Vaswani"}],
+                        "issued": {"date-parts": [[2017]]},
+                    }
+                ]
+            }
+        },
+        request=httpx.Request("GET", "https://api.crossref.org/works"),
+    )
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=[throttled, ok])
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+
+    with patch("httpx.AsyncClient", return_value=client):
+        result = await verifier.verify_source(
+            SourceInput(title="Attention Is All You Need", year=2017)
+        )
+
+    assert result.status == VerificationStatus.VERIFIED
+    limiter.penalize.assert_awaited_once_with("crossref", 7.0)
+    assert limiter.acquire.await_count == 2
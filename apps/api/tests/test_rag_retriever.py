@@ -3,6 +3,8 @@ Tests for RAG Retriever service (Semantic Scholar, Perplexity, Tavily, Serper)
 Testing: API mocking, error handling, caching, deduplication
 """
 
+import asyncio
+import random
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -12,6 +14,7 @@ import httpx
 import pytest
 
 from app.services.ai_pipeline.rag_retriever import RAGRetriever, SourceDoc
+from app.services.ai_pipeline.retrieval_cache import retrieval_cache_key
 
 # ============================================================================
 # FIXTURES
@@ -395,8 +398,9 @@ async def test_cache_expiry_after_7_days(
 
     os.utime(cache_file, (old_timestamp, old_timestamp))
 
-    # Act - try to load expired cache
-    loaded_docs = await retriever._load_from_cache(query)
+    # Act - try to load expired cache from a fresh process (no memory front)
+    fresh = RAGRetriever(cache_dir=str(temp_cache_dir), max_results=10)
+    loaded_docs = await fresh._load_from_cache(query)
 
     # Assert - should return None (expired)
     assert loaded_docs is None
@@ -407,21 +411,22 @@ async def test_cache_expiry_after_7_days(
 # ============================================================================
 
 
-def test_query_to_cache_key():
-    """Test cache key generation from query"""
+def test_retrieval_cache_key():
+    """Test cache key generation from provider request parameters"""
     # Arrange
-    query1 = "machine learning"
-    query2 = "machine learning"
-    query3 = "deep learning"
+    base = {"limit": 10, "page": 1}
 
     # Act
-    key1 = RAGRetriever._query_to_cache_key(query1)
-    key2 = RAGRetriever._query_to_cache_key(query2)
-    key3 = RAGRetriever._query_to_cache_key(query3)
+    key1 = retrieval_cache_key("crossref", "machine learning", **base)
+    key2 = retrieval_cache_key("crossref", "machine learning", **base, year_min=None)
+    key3 = retrieval_cache_key("crossref", "deep learning", **base)
 
-    # Assert - same query = same key, different query = different key
+    # Assert - same request = same key; query/provider/page/limit all count
     assert key1 == key2
     assert key1 != key3
+    assert key1 != retrieval_cache_key("openalex", "machine learning", **base)
+    assert key1 != retrieval_cache_key("crossref", "machine learning", limit=10, page=2)
+    assert key1 != retrieval_cache_key("crossref", "machine learning", limit=20)
     assert len(key1) == 64  # SHA256 hash length
 
 
@@ -519,6 +524,53 @@ def test_deduplicate_sources_by_title():
     assert deduplicated[1].title == "Deep Learning"
 
 
+def _pairwise_deduplicate(sources: list[SourceDoc]) -> list[SourceDoc]:
+    """The original O(n^2) scan, kept as the reference behaviour."""
+    kept: list[SourceDoc] = []
+    for source in sources:
+        match = next(
+            (
+                i
+                for i, existing in enumerate(kept)
+                if RAGRetriever._retrieval_records_equivalent(existing, source)
+            ),
+            None,
+        )
+        if match is None:
+            kept.append(source)
+        else:
+            kept[match] = RAGRetriever._merge_source_docs(kept[match], source)
+    return kept
+
+
+def test_indexed_deduplication_matches_pairwise_scan():
+    """Indexed dedup is identical to the pairwise scan on overlapping records"""
+    rng = random.Random(1234)
+    titles = ["Machine Learning", "machine learning!", "Deep Learning", "Ética IA"]
+    authors = [[], ["Ada Rossi"], ["Rossi, A.", "Bo Chen"], ["Chen"]]
+    dois = [None, None, "10.1/a", "https://doi.org/10.1/A", "10.1/b"]
+    urls = [None, None, "https://x.org/p/", "HTTPS://X.ORG/p", "https://y.org/q"]
+    paper_ids = [None, None, None, "uploaded:1", "uploaded:2"]
+    for _ in range(50):
+        sources = [
+            SourceDoc(
+                title=rng.choice(titles),
+                authors=list(rng.choice(authors)),
+                year=rng.choice([0, 2020, 2021, 2022]),
+                doi=rng.choice(dois),
+                url=rng.choice(urls),
+                paper_id=rng.choice(paper_ids),
+                abstract=rng.choice([None, "short", "a longer abstract"]),
+                citation_count=rng.choice([None, 3, 10]),
+            )
+            for _ in range(rng.randint(1, 40))
+        ]
+
+        assert RAGRetriever()._deduplicate_sources(sources) == (
+            _pairwise_deduplicate(sources)
+        )
+
+
 # ============================================================================
 # PERPLEXITY API TESTS
 # ============================================================================
@@ -827,6 +879,99 @@ async def test_retrieve_sources_handles_partial_api_failures(retriever: RAGRetri
         assert results[0].title == "Semantic Paper"
 
 
+def _delayed(delay: float, docs: list[SourceDoc]):
+    async def search(query: str) -> list[SourceDoc]:
+        await asyncio.sleep(delay)
+        return docs
+
+    return search
+
+
+@pytest.mark.asyncio
+@patch("app.core.config.settings.SEMANTIC_SCHOLAR_ENABLED", True)
+@patch("app.core.config.settings.PERPLEXITY_API_KEY", None)
+@patch("app.core.config.settings.TAVILY_API_KEY", None)
+@patch("app.core.config.settings.SERPER_API_KEY", None)
+async def test_retrieve_sources_merges_in_provider_order(retriever: RAGRetriever):
+    """Providers run concurrently, but merge order ignores completion order"""
+    # Same DOI from two providers: dedup keeps the first in provider order,
+    # even though OpenAlex answers long before Crossref.
+    crossref = SourceDoc(title="Crossref Copy", authors=[], year=2023, doi="10.1/x")
+    openalex = SourceDoc(title="OpenAlex Copy", authors=[], year=2023, doi="10.1/x")
+    semantic = SourceDoc(title="Semantic Paper", authors=[], year=2023)
+
+    with (
+        patch.object(retriever, "search_crossref", _delayed(0.05, [crossref])),
+        patch.object(retriever, "search_openalex", _delayed(0.0, [openalex])),
+        patch.object(retriever, "search_semantic_scholar", _delayed(0.02, [semantic])),
+    ):
+        results = await retriever.retrieve_sources("test", limit=10)
+
+    assert [doc.title for doc in results] == ["Crossref Copy", "Semantic Paper"]
+    timings = retriever.provider_timings()
+    assert set(timings) == {"Crossref", "OpenAlex", "Semantic Scholar"}
+    assert timings["Crossref"]["calls"] == 1
+    assert timings["Crossref"]["max_seconds"] >= 0.04
+
+
+@pytest.mark.asyncio
+@patch("app.core.config.settings.SEMANTIC_SCHOLAR_ENABLED", True)
+@patch("app.core.config.settings.PERPLEXITY_API_KEY", None)
+@patch("app.core.config.settings.TAVILY_API_KEY", None)
+@patch("app.core.config.settings.SERPER_API_KEY", None)
+@patch("app.core.config.settings.RAG_PROVIDER_TIMEOUT_SECONDS", 0.05)
+async def test_retrieve_sources_provider_deadline(retriever: RAGRetriever):
+    """A provider past its deadline is dropped; the others still count"""
+    with (
+        patch.object(
+            retriever,
+            "search_crossref",
+            _delayed(5, [SourceDoc(title="Late", authors=[], year=2023)]),
+        ),
+        patch.object(
+            retriever,
+            "search_openalex",
+            _delayed(0, [SourceDoc(title="On Time", authors=[], year=2023)]),
+        ),
+        patch.object(
+            retriever, "search_semantic_scholar", side_effect=Exception("API error")
+        ),
+    ):
+        results = await retriever.retrieve_sources("test", limit=10)
+
+    assert [doc.title for doc in results] == ["On Time"]
+    timings = retriever.provider_timings()
+    assert timings["Crossref"]["timeouts"] == 1
+    assert timings["Semantic Scholar"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+@patch("app.core.config.settings.SEMANTIC_SCHOLAR_ENABLED", False)
+@patch("app.core.config.settings.PERPLEXITY_API_KEY", None)
+@patch("app.core.config.settings.TAVILY_API_KEY", None)
+@patch("app.core.config.settings.SERPER_API_KEY", None)
+@patch("app.core.config.settings.RAG_RETRIEVAL_BUDGET_SECONDS", 0.05)
+async def test_retrieve_sources_budget_returns_partial_results(
+    retriever: RAGRetriever,
+):
+    """When the overall budget expires, finished providers are still used"""
+    with (
+        patch.object(
+            retriever,
+            "search_crossref",
+            _delayed(5, [SourceDoc(title="Slow", authors=[], year=2023)]),
+        ),
+        patch.object(
+            retriever,
+            "search_openalex",
+            _delayed(0, [SourceDoc(title="Fast", authors=[], year=2023)]),
+        ),
+    ):
+        results = await retriever.retrieve_sources("test", limit=10)
+
+    assert [doc.title for doc in results] == ["Fast"]
+
+
 # ============================================================================
 # SOURCEDOC CONVERSION TEST
 # ============================================================================
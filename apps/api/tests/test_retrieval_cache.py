@@ -0,0 +1,270 @@
+"""
+Unit tests for the bounded RAG search cache (retrieval_cache.py)
+"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.ai_pipeline.rag_retriever import RAGRetriever, SourceDoc
+from app.services.ai_pipeline.retrieval_cache import (
+    DiskCacheBackend,
+    FetchLock,
+    RedisCacheBackend,
+    RetrievalCache,
+    SingleFlight,
+    retrieval_cache_key,
+)
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for RedisCacheBackend."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.index: dict[str, float] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def zadd(self, name, mapping):
+        self.index.update(mapping)
+
+    async def zremrangebyscore(self, name, low, high):
+        for member, score in list(self.index.items()):
+            if score <= high:
+                del self.index[member]
+
+    async def zcard(self, name):
+        return len(self.index)
+
+    async def zpopmin(self, name, count):
+        oldest = sorted(self.index.items(), key=lambda item: item[1])[:count]
+        for member, _ in oldest:
+            del self.index[member]
+        return oldest
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        calls = []
+        pipe = MagicMock()
+        pipe.set = lambda *args, **kwargs: calls.append(self.set(*args, **kwargs))
+        pipe.zadd = lambda *args: calls.append(self.zadd(*args))
+
+        async def execute():
+            return [await call for call in calls]
+
+        pipe.execute = execute
+        return pipe
+
+
+@pytest.mark.asyncio
+async def test_memory_front_is_lru_and_reports_hit_rate():
+    cache = RetrievalCache(memory_entries=2, ttl_seconds=60)
+
+    await cache.set("a", "A")
+    await cache.set("b", "B")
+    assert await cache.get("a") == "A"  # a becomes most recent
+    await cache.set("c", "C")  # evicts b
+
+    assert await cache.get("b") is None
+    assert await cache.get("c") == "C"
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_caps_entries(tmp_path: Path):
+    backend = DiskCacheBackend(tmp_path, ttl_seconds=3600, max_entries=3)
+    cache = RetrievalCache(backend, memory_entries=0)
+
+    for i in range(5):
+        await cache.set(f"key{i}", f"payload{i}")
+    # Pruning runs on the first write of each batch; force one more pass.
+    evicted = backend._prune()
+
+    assert evicted == 2
+    assert len(list(tmp_path.glob("*.json"))) == 3
+    assert await cache.get("key4") == "payload4"
+    assert cache.stats()["backend_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_shares_entries_and_evicts_oldest():
+    redis = FakeRedis()
+    writer = RetrievalCache(
+        RedisCacheBackend(redis, ttl_seconds=3600, max_entries=2), memory_entries=0
+    )
+    await writer.set("k1", "v1")
+    await writer.set("k2", "v2")
+    await writer.set("k3", "v3")
+
+    evicted = await writer.backend._prune(redis)
+    reader = RetrievalCache(
+        RedisCacheBackend(redis, ttl_seconds=3600, max_entries=2), memory_entries=8
+    )
+
+    assert evicted == 1
+    assert await reader.get("k1") is None
+    assert await reader.get("k3") == "v3"
+    assert await reader.get("k3") == "v3"  # now served from the memory front
+    assert reader.stats()["backend_hits"] == 1
+    assert reader.stats()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_reads_as_miss():
+    backend = MagicMock()
+    backend.get = AsyncMock(side_effect=ConnectionError("down"))
+    backend.set = AsyncMock(side_effect=ConnectionError("down"))
+    cache = RetrievalCache(backend, memory_entries=0)
+
+    await cache.set("k", "v")
+
+    assert await cache.get("k") is None
+    assert cache.stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_crossref_results_cached_per_page(tmp_path: Path):
+    retriever = RAGRetriever(cache_dir=str(tmp_path), tavily_api_key=None)
+    response = MagicMock()
+    response.raise_for_status = MagicMock()
+    response.json = MagicMock(
+        return_value={
+            "message": {
+                "items": [
+                    {
+                        "title": ["A cached article"],
+                        "author": [{"given": "Ada", "family": "Rossi"}],
+                        "issued": {"date-parts": [[2024]]},
+                        "DOI": "10.1000/cached",
+                    }
+                ]
+            }
+        }
+    )
+    client = MagicMock()
+    client.get = AsyncMock(return_value=response)
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+
+    with patch("httpx.AsyncClient", return_value=client):
+        first = await retriever.search_crossref("query", limit=5)
+        again = await retriever.search_crossref("query", limit=5)
+        await retriever.search_crossref("query", limit=5, page=2)
+
+    assert client.get.await_count == 2  # page 2 is a different request
+    assert again == first
+    assert retriever.cache_stats()["memory_hits"] == 1
+
+
+def _slow_fetch(calls: list[str], delay: float = 0.02):
+    async def fetch(query, limit, page):
+        calls.append(query)
+        await asyncio.sleep(delay)
+        return [SourceDoc(title=f"{query} p{page}", authors=["Rossi"], year=2024)]
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_request():
+    retriever = RAGRetriever(
+        cache=RetrievalCache(memory_entries=0),
+        single_flight=SingleFlight(),
+        tavily_api_key=None,
+    )
+    calls: list[str] = []
+    retriever._fetch_crossref = _slow_fetch(calls)
+
+    results = await asyncio.gather(
+        retriever.search_crossref("ai education", limit=5),
+        retriever.search_crossref("ai education", limit=5),
+        retriever.search_crossref("ai education", limit=5),
+        retriever.search_crossref("ai education", limit=5, page=2),
+    )
+
+    assert calls == ["ai education", "ai education"]  # page 1 once, page 2 once
+    assert results[0] == results[1] == results[2]
+    assert results[0][0] is not results[1][0]  # followers get their own copies
+    assert retriever.single_flight.stats() == {
+        "leaders": 2,
+        "coalesced": 2,
+        "in_flight": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_coalesced_failure_respects_each_callers_error_policy():
+    retriever = RAGRetriever(
+        cache=RetrievalCache(memory_entries=0),
+        single_flight=SingleFlight(),
+        tavily_api_key=None,
+    )
+
+    async def failing(query, limit, page):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    retriever._fetch_openalex = failing
+
+    lenient, strict = await asyncio.gather(
+        retriever.search_openalex("q", limit=5),
+        retriever.search_openalex("q", limit=5, raise_on_error=True),
+        return_exceptions=True,
+    )
+
+    assert lenient == []
+    assert isinstance(strict, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_fetch_lock_makes_other_process_wait_for_shared_cache():
+    redis = FakeRedis()
+
+    def process() -> RAGRetriever:
+        # Separate cache front / in-flight table: a different worker process
+        # sharing only Redis.
+        return RAGRetriever(
+            cache=RetrievalCache(
+                RedisCacheBackend(redis, ttl_seconds=60, max_entries=100),
+                memory_entries=0,
+            ),
+            single_flight=SingleFlight(),
+            fetch_lock=FetchLock(redis, lock_seconds=5),
+            tavily_api_key=None,
+        )
+
+    first, second = process(), process()
+    calls: list[str] = []
+    first._fetch_crossref = _slow_fetch(calls, delay=0.3)
+    second._fetch_crossref = _slow_fetch(calls)
+
+    async def start_second():
+        await asyncio.sleep(0.05)  # first process already holds the lock
+        return await second.search_crossref("q", limit=5)
+
+    a, b = await asyncio.gather(first.search_crossref("q", limit=5), start_second())
+
+    assert calls == ["q"]
+    assert a == b
+    lock_key = FetchLock._key(retrieval_cache_key("crossref", "q", limit=5))
+    assert lock_key not in redis.values  # released by the holder
@@ -1,5 +1,11 @@
 """Unit tests for the upfront topic-locked source pack (source_pack.py)."""
 
+import asyncio
+import gc
+import json
+import random
+import tracemalloc
+import zlib
 from unittest.mock import AsyncMock
 
 import pytest
@@ -7,9 +13,11 @@ import pytest
 from app.services.ai_pipeline.rag_retriever import SourceDoc
 from app.services.ai_pipeline.source_pack import (
     PackedSource,
+    RetrievalSession,
     SourcePack,
     SourcePackBuilder,
 )
+from app.services.ai_pipeline.text_utils import SharedText
 
 
 def _edu_source(title, authors=("Rossi",), year=2021, abstract=""):
@@ -235,6 +243,60 @@ async def test_candidate_build_records_provider_outage():
     assert "outage" in pack.provider_errors[0]
 
 
+async def _grid_build(builder, delays):
+    """Build over a fixed query grid; each cell sleeps per ``delays``."""
+    in_flight = {"now": 0, "peak": 0}
+
+    def provider(name):
+        async def search(query, limit=10):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(delays(query, name))
+            in_flight["now"] -= 1
+            # The same DOI from every cell: dedup keeps the first in grid order.
+            return [
+                SourceDoc(
+                    title=f"AI education {name} {query}",
+                    authors=["Rossi"],
+                    year=2021,
+                    doi="10.1/shared" if name == "openalex" else None,
+                )
+            ]
+
+        return search
+
+    builder.rag.search_crossref = provider("crossref")
+    builder.rag.search_openalex = provider("openalex")
+    pack = await builder.build(
+        topic="AI in education",
+        language="en",
+        document_id=1,
+        section_titles=[f"Section {i}" for i in range(6)],
+        allow_threshold_relaxation=False,
+    )
+    return pack, in_flight["peak"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retrieval_is_deterministic_and_bounded():
+    serial, serial_peak = await _grid_build(
+        SourcePackBuilder(max_concurrency=1), lambda query, name: 0
+    )
+    # Later cells finish first under concurrency.
+    concurrent, peak = await _grid_build(
+        SourcePackBuilder(max_concurrency=3, provider_concurrency=2),
+        lambda query, name: 0.02 if query == "AI in education" else 0,
+    )
+
+    assert serial.sources
+    assert serial_peak == 1
+    assert 1 < peak <= 3
+    assert concurrent.sha256() == serial.sha256()
+    assert [s.source.title for s in concurrent.sources] == [
+        s.source.title for s in serial.sources
+    ]
+
+
 def test_prompt_block_uses_keys():
     src = _edu_source("AI tutoring systems", authors=["Rossi", "Bianchi"], year=2021)
     pack = SourcePack(
@@ -511,3 +573,271 @@ def test_learning_in_alt_terms_does_not_flip_education_domain():
         == "education"
     )
     assert SourcePackBuilder._detect_domain(content_tokens(_EDU_TOPIC)) == "education"
+
+
+def _reference_on_topic_score(src, topic_terms, domain):
+    """The original term x marker scoring loop (behaviour reference)."""
+    from app.services.ai_pipeline.source_pack import _DOMAIN_ANCHORS
+    from app.services.ai_pipeline.text_utils import ascii_fold, content_tokens
+
+    def term_hit(terms, markers):
+        return any(ascii_fold(t).startswith(m) for t in terms for m in markers)
+
+    if not topic_terms:
+        return 0.0
+    source_terms = content_tokens(src.title) | content_tokens(src.abstract)
+    if not source_terms:
+        return 0.0
+    if domain is not None:
+        gate_terms = source_terms | content_tokens(src.venue)
+        if not term_hit(gate_terms, _DOMAIN_ANCHORS[domain]["anchor"]):
+            return 0.0
+    score = len(topic_terms & source_terms) / len(topic_terms)
+    if domain is not None:
+        score += 0.15
+        if term_hit(source_terms, _DOMAIN_ANCHORS[domain]["off_topic"]):
+            score -= 0.4
+    return max(0.0, min(1.0, score))
+
+
+def test_feature_scoring_matches_reference_loop():
+    from app.services.ai_pipeline.text_utils import content_tokens
+
+    rng = random.Random(7)
+    vocab = (
+        "educazione educativa università scuola studenti learning formazione "
+        "aziendale corporate clinica diagnosi voto elettorale intelligenza "
+        "artificiale impatto istruzione e-learning higher hr hrm sanità"
+    ).split()
+    topics = [
+        _EDU_TOPIC,
+        "AI in education for students in schools",
+        "Machine learning forecasts of unemployment",
+    ]
+    for _ in range(200):
+        src = SourceDoc(
+            title=" ".join(rng.sample(vocab, rng.randint(0, 5))),
+            authors=["Rossi"],
+            year=2021,
+            abstract=" ".join(rng.sample(vocab, rng.randint(0, 6))) or None,
+            venue=rng.choice([None, "Rivista di Formazione", "Clinical AI"]),
+        )
+        for topic in topics:
+            terms = content_tokens(topic)
+            domain = SourcePackBuilder._detect_domain(terms)
+            assert SourcePackBuilder._on_topic_score(
+                src, terms, domain
+            ) == _reference_on_topic_score(src, terms, domain)
+
+
+def _paged_provider(name, calls):
+    """Deterministic ranked results: item i of a query is the same at any
+    page/limit window, like a real provider's relevance order."""
+
+    async def search(query, limit=10, page=1, raise_on_error=False):
+        calls.append((name, query, limit, page))
+        start = (page - 1) * limit
+        return [
+            SourceDoc(
+                title=f"AI education {name} {query} result {i}",
+                authors=[f"Author {i}"],
+                year=2020 + i % 4,
+                abstract="AI education evidence for students",
+            )
+            for i in range(start, min(start + limit, 60))
+        ]
+
+    return search
+
+
+def _session_builder(calls):
+    builder = SourcePackBuilder()
+    builder.rag.search_crossref = _paged_provider("crossref", calls)
+    builder.rag.search_openalex = _paged_provider("openalex", calls)
+    return builder
+
+
+@pytest.mark.asyncio
+async def test_retrieval_session_only_fetches_new_queries_and_pages():
+    titles = ["Assessment", "Tutoring"]
+    calls: list = []
+    builder = _session_builder(calls)
+    session = RetrievalSession(prefetch_limit=48)
+    common = {"topic": "AI in education", "language": "en", "document_id": 1}
+
+    await builder.build(**common, session=session)
+    provisional_calls = len(calls)
+    rebuilt = await builder.build(
+        **common, section_titles=titles, target_size=48, session=session
+    )
+    rebuild_calls = len(calls) - provisional_calls
+    await builder.build(
+        **common,
+        section_titles=titles,
+        target_size=48,
+        retrieval_page=2,
+        raise_on_provider_error=True,
+        session=session,
+    )
+    top_up_calls = calls[provisional_calls + rebuild_calls :]
+
+    # Provisional: bare + 2 anchored queries x 2 providers, page 1 widened.
+    assert provisional_calls == 6
+    assert all(limit == 48 for _, _, limit, _ in calls[:6])
+    # Post-outline: only the two section-title queries are new.
+    assert rebuild_calls == 4
+    # Top-up: every query's page 2, nothing else.
+    assert len(top_up_calls) == 10
+    assert {page for *_, page in top_up_calls} == {2}
+    assert session.stats() == {"fetched": 20, "reused": 6}
+
+    # Reuse never changes the pack.
+    fresh_calls: list = []
+    fresh = await _session_builder(fresh_calls).build(
+        **common, section_titles=titles, target_size=48
+    )
+    assert rebuilt.sha256() == fresh.sha256()
+
+
+@pytest.mark.asyncio
+async def test_features_are_memoized_per_session_not_per_process(monkeypatch):
+    from app.services.ai_pipeline import source_pack
+
+    computed: list = []
+    real = source_pack._features_for
+
+    def counting(*key):
+        computed.append(key)
+        return real(*key)
+
+    monkeypatch.setattr(source_pack, "_features_for", counting)
+    builder = _session_builder([])
+    common = {"topic": "AI in education", "language": "en", "document_id": 1}
+    session = RetrievalSession()
+
+    await builder.build(**common, session=session)
+    first = len(computed)
+    await builder.build(**common, session=session)
+
+    assert first == len(session.features) > 0
+    assert len(computed) == first  # the rebuild scored only memoized records
+    await builder.build(**common)
+    await builder.build(**common)
+    assert len(computed) == 3 * first  # no session: nothing is kept
+
+
+def _reparsing_provider(records):
+    """Every call decodes fresh JSON, like a provider response or cache hit:
+    both providers return the same papers for a query as new objects."""
+
+    async def search(query, limit=10, **_):
+        start = zlib.crc32(query.encode()) % len(records)
+        return [
+            SourceDoc(**json.loads(records[(start + k) % len(records)]))
+            for k in range(50)
+        ]
+
+    return search
+
+
+async def _retained_pack_bytes(records, *, text_store_entries=None):
+    builder = SourcePackBuilder()
+    builder.rag.search_crossref = _reparsing_provider(records)
+    builder.rag.search_openalex = _reparsing_provider(records)
+    session = RetrievalSession(text_store_entries=text_store_entries)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        pack = await builder.build(
+            topic="Digital education in schools",
+            language="it",
+            document_id=1,
+            target_size=60,
+            alt_topic="Digital education in schools",
+            session=session,
+        )
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return retained, pack
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_candidate_memory_benchmark(monkeypatch):
+    """Bilingual build over a 500-paper corpus: records re-parsed per
+    provider share their strings (abstracts and venues through the session
+    text store), and slotted records carry no dict."""
+    from app.services.ai_pipeline import rag_retriever
+
+    rng = random.Random(7)
+    words = "learning education teaching students school pedagogy".split()
+    records = [
+        json.dumps(
+            {
+                "title": f"Digital education study {i} "
+                + " ".join(rng.choices(words, k=5)),
+                "authors": [f"Rossi {i % 40}", "Bianchi"],
+                "year": 2015 + i % 10,
+                "abstract": "Education in schools. "
+                + " ".join(rng.choices(words, k=150)),
+                "venue": "Computers & Education",
+                "doi": f"10.1000/{i}",
+                "provider": "openalex",
+            }
+        )
+        for i in range(500)
+    ]
+
+    compact, pack = await _retained_pack_bytes(records)
+    no_store, no_store_pack = await _retained_pack_bytes(records, text_store_entries=0)
+    monkeypatch.setattr(rag_retriever, "_shared", lambda value: value)
+    unshared, _ = await _retained_pack_bytes(records, text_store_entries=0)
+
+    assert pack.sha256() == no_store_pack.sha256()
+    assert not hasattr(pack.sources[0], "__dict__")
+    assert not hasattr(pack.sources[0].source, "__dict__")
+    # Measured on CPython 3.11: ~1.32 MB retained with the text store,
+    # ~1.74 MB without it, ~1.84 MB with identifier interning off as well.
+    # Abstracts dominate, so the store alone must save at least 15%.
+    assert compact < no_store * 0.85, (compact, no_store)
+    assert no_store < unshared, (no_store, unshared)
+
+
+def test_source_doc_interns_identifiers_but_not_free_text():
+    record = {
+        "title": "Digital education",
+        "year": 2020,
+        "abstract": "".join(["Education in schools."] * 2),
+        "doi": "".join(["10.1000/", "42"]),
+        "provider": "".join(["open", "alex"]),
+    }
+    authors = ["".join(["Rossi", " M."])]
+    first = SourceDoc(authors=authors, **record)
+    second = SourceDoc(
+        authors=["".join(["Rossi", " M."])], **json.loads(json.dumps(record))
+    )
+
+    assert first.authors is not authors
+    assert first.authors[0] is second.authors[0]
+    assert first.doi is second.doi
+    assert first.provider is second.provider
+    assert first.abstract == second.abstract
+    assert first.abstract is not second.abstract
+
+
+def test_shared_text_store_is_bounded_and_value_keyed():
+    store = SharedText(2)
+    first = store.share("".join(["Computers & ", "Education"]))
+
+    assert store.share("".join(["Computers", " & Education"])) is first
+    store.share("Nature")
+    store.share("Science")  # evicts the least recently shared value
+    assert len(store) == 2
+    assert store.share("".join(["Computers & ", "Education"])) is not first
+    assert store.share(None) is None
+
+    disabled = SharedText(0)
+    disabled.share("Nature")
+    assert len(disabled) == 0
@@ -207,8 +207,8 @@ def rebuild_harness(stack: ExitStack, db_session, redis_checkpoint: str | None):
 
     # Pack seams (module globals, per the thin-wrapper convention).
     build_pack = AsyncMock(
-        side_effect=lambda db, doc, section_titles=None, ai_service=None: fake_pack(
-            int(doc.id)
+        side_effect=lambda db, doc, section_titles=None, ai_service=None, **_: (
+            fake_pack(int(doc.id))
         )
     )
     stack.enter_context(
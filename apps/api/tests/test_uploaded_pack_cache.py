@@ -0,0 +1,234 @@
+"""
+Unit tests for the memo of built uploaded-source packs (uploaded_pack_cache.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from app.api.v1.endpoints import documents as documents_endpoint
+from app.models.auth import User
+from app.models.document import Document, DocumentSourceFile, SourceFilePage
+from app.services import uploaded_pack_cache as uploaded_pack_cache_module
+from app.services import uploaded_sources
+from app.services.uploaded_pack_cache import (
+    UploadedPackCache,
+    UploadedPackEntry,
+    decode_entry,
+    encode_entry,
+)
+from app.services.uploaded_sources import (
+    SourcePassage,
+    build_uploaded_source_pack,
+    passage_set_for,
+)
+
+PAGES = [
+    "L'intelligenza artificiale nelle PMI italiane aumenta la produttivita "
+    "del lavoro e riduce i costi operativi. " * 6,
+    "La formazione del personale resta la barriera principale all'adozione "
+    "delle tecnologie digitali nelle imprese. " * 6,
+]
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for UploadedPackCache."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+async def _seed(db_session, email: str) -> tuple[User, Document]:
+    user = User(email=email, full_name="Pack Cache", is_active=True)
+    db_session.add(user)
+    await db_session.flush()
+    document = Document(
+        user_id=user.id,
+        title="Tesi con fonti",
+        topic="AI nelle PMI italiane",
+        status="draft",
+        citation_style="apa",
+    )
+    db_session.add(document)
+    await db_session.flush()
+    for number, name in enumerate(["Rossi", "Bianchi"]):
+        source_file = DocumentSourceFile(
+            document_id=int(document.id),
+            filename=f"{name}_2021.pdf",
+            citation_key=f"{name}2021",
+            title=f"Studio {name}",
+            authors=f"Mario {name}",
+            year=2021,
+            storage_path=f"s3://bucket/{name}.pdf",
+            sha256=uploaded_sources.sha256_hex(name.encode()),
+            page_count=len(PAGES),
+            status="parsed",
+            metadata_incomplete=False,
+        )
+        db_session.add(source_file)
+        await db_session.flush()
+        for page_number, text in enumerate(PAGES, start=1):
+            db_session.add(
+                SourceFilePage(
+                    source_file_id=int(source_file.id),
+                    page_number=page_number,
+                    text=text,
+                )
+            )
+        if number == 0:  # one file with a stored passage set, one without
+            db_session.add(
+                passage_set_for(
+                    int(source_file.id),
+                    str(source_file.sha256),
+                    list(enumerate(PAGES, start=1)),
+                )
+            )
+    await db_session.commit()
+    await db_session.refresh(user)
+    await db_session.refresh(document)
+    return user, document
+
+
+def _no_rebuild():
+    return patch.object(
+        uploaded_sources, "_load_passages", side_effect=AssertionError("rebuilt")
+    )
+
+
+@pytest.mark.asyncio
+async def test_unchanged_sources_reuse_the_memoized_pack(db_session):
+    _, document = await _seed(db_session, "pack-memo@example.com")
+    cache = UploadedPackCache(use_redis=False, ttl_seconds=60)
+    topic = str(document.topic)
+
+    built = await build_uploaded_source_pack(
+        db_session, int(document.id), topic, pack_cache=cache
+    )
+    with _no_rebuild():
+        reused = await build_uploaded_source_pack(
+            db_session, int(document.id), topic, pack_cache=cache
+        )
+
+    assert reused.sha256() == built.sha256()
+    assert reused.keys() == ["Rossi2021", "Bianchi2021"]
+    assert reused.passages is built.passages
+    assert reused.sources[0].source is not built.sources[0].source
+    assert reused.sources[0].source.provider == "uploaded"
+    assert cache.stats()["memory_hits"] == 1
+
+    # Another topic is another pack.
+    other = await build_uploaded_source_pack(
+        db_session, int(document.id), "Altro tema", pack_cache=cache
+    )
+    assert other.topic == "Altro tema"
+    assert cache.stats()["writes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_source_changes_rebuild_and_invalidate(db_session):
+    user, document = await _seed(db_session, "pack-memo-edit@example.com")
+    cache = UploadedPackCache(use_redis=False, ttl_seconds=60)
+    topic = str(document.topic)
+    await build_uploaded_source_pack(
+        db_session, int(document.id), topic, pack_cache=cache
+    )
+
+    patch_handler = getattr(
+        documents_endpoint.update_source_metadata,
+        "__wrapped__",
+        documents_endpoint.update_source_metadata,
+    )
+    file_id = (
+        await db_session.execute(
+            select(DocumentSourceFile.id).where(
+                DocumentSourceFile.citation_key == "Rossi2021"
+            )
+        )
+    ).scalar_one()
+    with patch.object(
+        uploaded_pack_cache_module, "get_uploaded_pack_cache", return_value=cache
+    ):
+        await patch_handler(
+            document_id=int(document.id),
+            file_id=int(file_id),
+            payload={"authors": "Mario Rossi; Anna Verdi"},
+            current_user=user,
+            db=db_session,
+        )
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["memory_entries"] == 0
+
+    # The rebuild carries the edit. A change of usable files alone (here a
+    # status) is a different key too, so a surviving entry is never served.
+    rebuilt = await build_uploaded_source_pack(
+        db_session, int(document.id), topic, pack_cache=cache
+    )
+    assert rebuilt.sources[0].source.authors == ["Mario Rossi", "Anna Verdi"]
+    source_file = await db_session.get(DocumentSourceFile, int(file_id))
+    source_file.status = "no_text_layer"
+    await db_session.commit()
+    with _no_rebuild():
+        with pytest.raises(AssertionError, match="rebuilt"):
+            await build_uploaded_source_pack(
+                db_session, int(document.id), topic, pack_cache=cache
+            )
+
+
+@pytest.mark.asyncio
+async def test_redis_copy_serves_other_workers(db_session):
+    _, document = await _seed(db_session, "pack-memo-redis@example.com")
+    redis = FakeRedis()
+    topic = str(document.topic)
+    first = UploadedPackCache(redis, ttl_seconds=60)
+    built = await build_uploaded_source_pack(
+        db_session, int(document.id), topic, pack_cache=first
+    )
+
+    second = UploadedPackCache(redis, ttl_seconds=60)
+    with _no_rebuild():
+        reused = await build_uploaded_source_pack(
+            db_session, int(document.id), topic, pack_cache=second
+        )
+
+    assert second.stats()["redis_hits"] == 1
+    assert reused.sha256() == built.sha256()
+    assert reused.passages == built.passages
+    assert [p.terms for p in reused.passages] == [p.terms for p in built.passages]
+    assert reused.passages[0].terms and reused.passages[-1].terms is None
+
+    await second.invalidate(int(document.id))
+    assert redis.values == {}
+    redis.values[UploadedPackCache._key(int(document.id))] = "not base64 zlib"
+    broken = UploadedPackCache(redis, ttl_seconds=60)
+    assert await broken.get(int(document.id), "key") is None
+    assert broken.stats()["errors"] == 1
+
+
+def test_entry_round_trip():
+    entry = UploadedPackEntry(
+        key="k",
+        sources=(({"title": "T", "authors": ["A"], "year": 2020}, "A2020"),),
+        passages=[
+            SourcePassage(1, "A2020", "a.pdf", 1, "testo uno", terms={"testo": 1}),
+            SourcePassage(1, "A2020", "a.pdf", 2, "testo due"),
+        ],
+    )
+
+    decoded = decode_entry(encode_entry(entry))
+
+    assert decoded == entry
+    assert [p.terms for p in decoded.passages] == [{"testo": 1}, None]
+    with pytest.raises(ValueError):
+        decode_entry(b"garbage")
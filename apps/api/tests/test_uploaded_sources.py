@@ -1,23 +1,36 @@
 """Uploaded scientific PDFs: parsing, metadata, passages, endpoint flow."""
 
+import asyncio
 import io
+import random
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from fastapi import HTTPException, UploadFile
+from fastapi import BackgroundTasks, HTTPException, UploadFile
 from sqlalchemy import select
 from starlette.requests import Request
 
 from app.api.v1.endpoints import documents as documents_endpoint
 from app.models.auth import User
-from app.models.document import Document, DocumentSourceFile, SourceFilePage
+from app.models.document import (
+    Document,
+    DocumentSourceFile,
+    SourceFilePage,
+    SourceFilePassageSet,
+)
 from app.services import uploaded_sources as uploaded_sources_module
+from app.services.ai_pipeline.rag_retriever import SourceDoc
+from app.services.ai_pipeline.source_pack import PackedSource, SourcePack
 from app.services.generation_contract import generation_contract_sha256
 from app.services.uploaded_sources import (
+    PassageIndex,
     SourcePassage,
     build_uploaded_source_pack,
     derive_source_metadata,
     extract_pdf_pages,
+    load_document_passages,
+    score_passage,
     select_passages,
     split_passages,
     uploaded_sources_digest,
@@ -114,6 +127,96 @@ def test_passages_are_page_bounded_and_ranked():
     assert len([p for p in capped if p.source_file_id == 1]) <= 2
 
 
+_VOCAB = (
+    "produttività formazione personale impresa digitale processi tecnologie "
+    "governance algoritmica vigilanza revisione indipendente didattica scuola "
+    "studenti valutazione apprendimento della the and per"
+).split()
+
+
+def _random_passages(rng: random.Random, files: int, per_file: int):
+    passages = []
+    for file_id in range(1, files + 1):
+        pages = [
+            (page, " ".join(rng.choices(_VOCAB, k=rng.randint(0, 400))))
+            for page in range(1, per_file + 1)
+        ]
+        pages.append((per_file + 1, "p. 12 -- 7"))  # no indexable terms
+        passages += split_passages(
+            source_file_id=file_id,
+            citation_key=f"Autore{file_id % 3}",  # shared keys: ranking ties
+            filename=f"f{file_id}.pdf",
+            pages=pages,
+        )
+    return passages
+
+
+def test_passage_index_matches_linear_ranking():
+    rng = random.Random(11)
+    passages = _random_passages(rng, files=5, per_file=5)
+    passages += passages[:5]  # duplicated windows tie on every field
+    index = PassageIndex(passages)
+
+    queries = [" ".join(rng.choices(_VOCAB, k=rng.randint(1, 6))) for _ in range(30)]
+    queries += ["", "della the", "zzz sconosciuto", "PRODUTTIVITA Formazione"]
+    for query in queries:
+        scores = index.scores(query)
+        for position, passage in enumerate(passages):
+            assert scores.get(position, 0.0) == score_passage(query, passage.text)
+        for limit in (1, 6, 40):
+            assert index.select(query, limit=limit) == select_passages(
+                passages, query, limit=limit
+            )
+
+
+def test_prompt_block_reuses_the_pack_passage_index():
+    passages = split_passages(
+        source_file_id=1,
+        citation_key="Rossi2021",
+        filename="rossi.pdf",
+        pages=[(1, PAGE1), (2, PAGE2)],
+    )
+    source = SourceDoc(title="AI nelle PMI", authors=["Mario Rossi"], year=2021)
+    pack = SourcePack(
+        document_id=1,
+        topic="t",
+        sources=[PackedSource(source, "Rossi2021", 1.0)],
+        passages=passages,
+    )
+
+    index = pack.passage_index()
+    assert "[Rossi2021 | p. 2]" in pack.prompt_block(query="produttivita formazione")
+    assert "[Rossi2021 | p. 1]" in pack.prompt_block(query="intelligenza artificiale")
+    assert pack.passage_index() is index
+
+    pack.passages = passages[:1]
+    assert pack.passage_index() is not index
+    assert len(pack.passage_index()) == 1
+
+
+@pytest.mark.slow
+def test_passage_index_benchmark():
+    """Ten long uploads, one query per section: the index tokenizes each
+    passage once instead of once per section prompt."""
+    rng = random.Random(3)
+    passages = _random_passages(rng, files=10, per_file=60)
+    queries = [" ".join(rng.choices(_VOCAB, k=5)) for _ in range(12)]
+
+    started = time.perf_counter()
+    linear = [select_passages(passages, q) for q in queries]
+    linear_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = PassageIndex(passages)
+    indexed = [index.select(q) for q in queries]
+    indexed_seconds = time.perf_counter() - started
+
+    assert indexed == linear
+    # Measured ~2.9s vs ~0.2s (build included) for ~1,750 passages on
+    # CPython 3.11, with a 20-word vocabulary where most postings match.
+    assert indexed_seconds < linear_seconds / 3, (indexed_seconds, linear_seconds)
+
+
 def test_contract_includes_sources_only_when_present():
     class Doc:
         id = 1
@@ -146,6 +249,33 @@ def _http_request() -> Request:
     return Request({"type": "http", "method": "POST", "path": "/"})
 
 
+async def _upload(db_session, user, document, filename, data, storage_path):
+    """Upload through the endpoint, run the queued ingestion and return the
+    file's final status, as a client polling the status endpoint sees it."""
+    tasks = BackgroundTasks()
+    with patch.object(
+        documents_endpoint.StorageService,
+        "upload_path",
+        new=AsyncMock(return_value=storage_path),
+    ):
+        accepted = await _upload_handler()(
+            request=_http_request(),
+            document_id=int(document.id),
+            background_tasks=tasks,
+            file=UploadFile(filename=filename, file=io.BytesIO(data)),
+            current_user=user,
+            db=db_session,
+        )
+    assert accepted["status"] == "pending" and accepted["ingesting"] is True
+    await tasks()
+    return await documents_endpoint.get_source_file_status(
+        document_id=int(document.id),
+        file_id=accepted["id"],
+        current_user=user,
+        db=db_session,
+    )
+
+
 async def _seed_document(db_session, email: str) -> tuple[User, Document]:
     user = User(email=email, full_name="Sources Test", is_active=True)
     db_session.add(user)
@@ -169,18 +299,14 @@ async def test_upload_flow_persists_pages_and_digest(db_session):
     user, document = await _seed_document(db_session, "sources-upload@example.com")
     data = _make_pdf([PAGE1, PAGE2])
 
-    with patch.object(
-        documents_endpoint.StorageService,
-        "upload_file",
-        new=AsyncMock(return_value="s3://bucket/documents/x/sources/abc.pdf"),
-    ):
-        response = await _upload_handler()(
-            request=_http_request(),
-            document_id=int(document.id),
-            file=UploadFile(filename="Rossi_2021_AI_PMI.pdf", file=io.BytesIO(data)),
-            current_user=user,
-            db=db_session,
-        )
+    response = await _upload(
+        db_session,
+        user,
+        document,
+        "Rossi_2021_AI_PMI.pdf",
+        data,
+        "s3://bucket/documents/x/sources/abc.pdf",
+    )
 
     assert response["citation_key"] == "Rossi2021"
     assert response["page_count"] == 2
@@ -204,13 +330,14 @@ async def test_upload_flow_persists_pages_and_digest(db_session):
     # Same bytes again -> 409, not a second row.
     with patch.object(
         documents_endpoint.StorageService,
-        "upload_file",
+        "upload_path",
         new=AsyncMock(return_value="s3://bucket/dup.pdf"),
     ):
         with pytest.raises(HTTPException) as exc_info:
             await _upload_handler()(
                 request=_http_request(),
                 document_id=int(document.id),
+                background_tasks=BackgroundTasks(),
                 file=UploadFile(
                     filename="Rossi_2021_AI_PMI.pdf", file=io.BytesIO(data)
                 ),
@@ -220,6 +347,56 @@ async def test_upload_flow_persists_pages_and_digest(db_session):
     assert exc_info.value.status_code == 409
 
 
+@pytest.mark.asyncio
+async def test_upload_persists_passages_reused_by_pack_builds(db_session):
+    user, document = await _seed_document(db_session, "sources-split@example.com")
+    long_page = " ".join([PAGE2] * 12)
+    data = _make_pdf([PAGE1, long_page])
+
+    response = await _upload(
+        db_session,
+        user,
+        document,
+        "Rossi_2021_AI_PMI.pdf",
+        data,
+        "s3://bucket/documents/x/sources/split.pdf",
+    )
+    stored = (await db_session.execute(select(SourceFilePassageSet))).scalar_one()
+    source_file = await db_session.get(DocumentSourceFile, response["id"])
+    assert stored.source_file_id == response["id"]
+    assert stored.sha256 == source_file.sha256
+    assert stored.passage_version == uploaded_sources_module.PASSAGE_PARAMS_VERSION
+
+    pages = (await db_session.execute(select(SourceFilePage))).scalars().all()
+    fresh = split_passages(
+        source_file_id=response["id"],
+        citation_key="Rossi2021",
+        filename="Rossi_2021_AI_PMI.pdf",
+        pages=[(int(p.page_number), str(p.text)) for p in pages],
+    )
+    assert stored.passage_count == len(fresh) > 2
+
+    # Job starts load the stored set: no re-split, term counts attached.
+    with patch.object(
+        uploaded_sources_module,
+        "split_passages",
+        side_effect=AssertionError("re-split"),
+    ):
+        loaded = await load_document_passages(db_session, int(document.id))
+    assert loaded == fresh
+    assert all(p.terms for p in loaded)
+    query = "produttivita formazione personale"
+    assert PassageIndex(loaded).select(query) == select_passages(fresh, query)
+
+    # A stale passage version or a corrupt blob falls back to the pages.
+    with patch.object(uploaded_sources_module, "PASSAGE_PARAMS_VERSION", 2):
+        stale = await load_document_passages(db_session, int(document.id))
+    assert stale == fresh and all(p.terms is None for p in stale)
+    stored.payload = b"not zlib"
+    await db_session.commit()
+    assert await load_document_passages(db_session, int(document.id)) == fresh
+
+
 @pytest.mark.asyncio
 async def test_upload_rejects_non_pdf_and_marks_scans(db_session):
     user, document = await _seed_document(db_session, "sources-scan@example.com")
@@ -228,6 +405,7 @@ async def test_upload_rejects_non_pdf_and_marks_scans(db_session):
         await _upload_handler()(
             request=_http_request(),
             document_id=int(document.id),
+            background_tasks=BackgroundTasks(),
             file=UploadFile(filename="notes.txt", file=io.BytesIO(b"hello")),
             current_user=user,
             db=db_session,
@@ -236,18 +414,9 @@ async def test_upload_rejects_non_pdf_and_marks_scans(db_session):
 
     # A text-free PDF (scan) is stored but flagged and yields no pages.
     scan = _make_pdf(["", ""])
-    with patch.object(
-        documents_endpoint.StorageService,
-        "upload_file",
-        new=AsyncMock(return_value="s3://bucket/scan.pdf"),
-    ):
-        response = await _upload_handler()(
-            request=_http_request(),
-            document_id=int(document.id),
-            file=UploadFile(filename="scan_1999.pdf", file=io.BytesIO(scan)),
-            current_user=user,
-            db=db_session,
-        )
+    response = await _upload(
+        db_session, user, document, "scan_1999.pdf", scan, "s3://bucket/scan.pdf"
+    )
     assert response["status"] == "no_text_layer"
     assert response["warning"] is not None
     page_rows = (await db_session.execute(select(SourceFilePage))).scalars().all()
@@ -258,18 +427,9 @@ async def test_upload_rejects_non_pdf_and_marks_scans(db_session):
 async def test_delete_source_is_fail_closed(db_session):
     user, document = await _seed_document(db_session, "sources-delete@example.com")
     data = _make_pdf([PAGE1])
-    with patch.object(
-        documents_endpoint.StorageService,
-        "upload_file",
-        new=AsyncMock(return_value="s3://bucket/del.pdf"),
-    ):
-        uploaded = await _upload_handler()(
-            request=_http_request(),
-            document_id=int(document.id),
-            file=UploadFile(filename="Bianchi_2020.pdf", file=io.BytesIO(data)),
-            current_user=user,
-            db=db_session,
-        )
+    uploaded = await _upload(
+        db_session, user, document, "Bianchi_2020.pdf", data, "s3://bucket/del.pdf"
+    )
 
     delete_handler = getattr(
         documents_endpoint.delete_source_file,
@@ -407,6 +567,70 @@ async def test_build_uploaded_pack_mandate_scores(db_session):
     assert await build_uploaded_source_pack(db_session, int(empty_doc.id), "x") is None
 
 
+@pytest.mark.asyncio
+async def test_pack_build_query_count_does_not_grow_with_files(db_session):
+    from sqlalchemy import event
+
+    _, document = await _seed_document(db_session, "pack-bulk@example.com")
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async def build():
+        statements.clear()
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", count)
+        try:
+            pack = await build_uploaded_source_pack(db_session, int(document.id), "x")
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", count)
+        return pack, len(statements)
+
+    files = []
+    for number in range(6):
+        files.append(
+            await _seed_parsed_file(
+                db_session,
+                int(document.id),
+                key=f"Rossi202{number}",
+                filename=f"Rossi_202{number}.pdf",
+                pages=[PAGE1, PAGE2, f"Pagina finale {number}"],
+                authors="Mario Rossi",
+                year=2020 + number,
+            )
+        )
+        if number == 0:
+            _, one_file_queries = await build()
+    # Half of the files carry a stored passage set, half are re-split.
+    for source_file in files[::2]:
+        db_session.add(
+            uploaded_sources_module.passage_set_for(
+                int(source_file.id),
+                str(source_file.sha256),
+                [(1, PAGE1), (2, PAGE2), (3, "Pagina finale")],
+            )
+        )
+    await db_session.commit()
+
+    pack, six_file_queries = await build()
+
+    assert six_file_queries == one_file_queries
+    assert pack.keys() == [f"Rossi202{n}" for n in range(6)]
+    by_file = {}
+    for passage in pack.passages:
+        by_file.setdefault(passage.citation_key, []).append(passage.page_number)
+    assert all(pages == sorted(pages) for pages in by_file.values())
+    assert by_file["Rossi2021"][-1] == 3
+    buffered = await uploaded_sources_module._load_passages(
+        db_session, files, yield_per=None
+    )
+    streamed = await uploaded_sources_module._load_passages(
+        db_session, files, yield_per=2
+    )
+    assert buffered == streamed
+    assert [p for f in files for p in streamed[int(f.id)]] == pack.passages
+
+
 @pytest.mark.asyncio
 async def test_prompt_block_appends_page_anchored_excerpts(db_session):
     user, document = await _seed_document(db_session, "pack-prompt@example.com")
@@ -625,18 +849,9 @@ async def test_blockers_name_scans_and_incomplete_metadata(db_session):
 async def test_metadata_patch_unblocks_generation(db_session):
     user, document = await _seed_document(db_session, "patch-meta@example.com")
     data = _make_pdf([PAGE1, PAGE2])
-    with patch.object(
-        documents_endpoint.StorageService,
-        "upload_file",
-        new=AsyncMock(return_value="s3://bucket/meta.pdf"),
-    ):
-        uploaded = await _upload_handler()(
-            request=_http_request(),
-            document_id=int(document.id),
-            file=UploadFile(filename="Rossi_2021_AI.pdf", file=io.BytesIO(data)),
-            current_user=user,
-            db=db_session,
-        )
+    uploaded = await _upload(
+        db_session, user, document, "Rossi_2021_AI.pdf", data, "s3://bucket/meta.pdf"
+    )
     assert uploaded["metadata_incomplete"] is True
 
     from app.services.uploaded_sources import uploaded_sources_blockers
@@ -673,6 +888,246 @@ async def test_metadata_patch_unblocks_generation(db_session):
     assert exc_info.value.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_upload_is_accepted_before_ingestion(db_session):
+    from app.services import source_ingestion
+    from app.services.uploaded_sources import uploaded_sources_blockers
+
+    user, document = await _seed_document(db_session, "async-upload@example.com")
+    tasks = BackgroundTasks()
+    with patch.object(
+        documents_endpoint.StorageService,
+        "upload_path",
+        new=AsyncMock(return_value="s3://bucket/async.pdf"),
+    ):
+        accepted = await _upload_handler()(
+            request=_http_request(),
+            document_id=int(document.id),
+            background_tasks=tasks,
+            file=UploadFile(
+                filename="Rossi_2021_AI.pdf",
+                file=io.BytesIO(_make_pdf([PAGE1, PAGE2])),
+            ),
+            current_user=user,
+            db=db_session,
+        )
+    assert accepted["status"] == "pending"
+    assert accepted["citation_key"].startswith("pending-")
+    assert len(tasks.tasks) == 1
+
+    # Still ingesting: generation waits, the manager may already fix metadata.
+    blockers, _ = await uploaded_sources_blockers(db_session, int(document.id))
+    assert len(blockers) == 1 and "[processing]" in blockers[0]
+    patch_handler = getattr(
+        documents_endpoint.update_source_metadata,
+        "__wrapped__",
+        documents_endpoint.update_source_metadata,
+    )
+    await patch_handler(
+        document_id=int(document.id),
+        file_id=int(accepted["id"]),
+        payload={"authors": "Mario Rossi", "year": 2019},
+        current_user=user,
+        db=db_session,
+    )
+
+    send = AsyncMock()
+    with patch.object(source_ingestion.manager, "send_progress", new=send):
+        await tasks()
+    final = await documents_endpoint.get_source_file_status(
+        document_id=int(document.id),
+        file_id=int(accepted["id"]),
+        current_user=user,
+        db=db_session,
+    )
+    assert final["status"] == "parsed" and final["page_count"] == 2
+    assert final["citation_key"] == "Rossi2021"
+    assert (final["authors"], final["year"]) == ("Mario Rossi", 2019)
+    assert final["metadata_incomplete"] is False
+    events = [call.args[1] for call in send.await_args_list]
+    assert [event["status"] for event in events] == ["processing", "parsed"]
+    assert all(event["type"] == "source_ingestion" for event in events)
+    assert await uploaded_sources_blockers(db_session, int(document.id)) == ([], [])
+
+    # A second run (e.g. a restart resuming it) leaves a finished file alone.
+    assert await source_ingestion.ingest_source_file(int(accepted["id"])) is None
+
+
+@pytest.mark.asyncio
+async def test_upload_is_staged_in_chunks_and_streamed_to_storage(db_session):
+    import os
+
+    from app.core.exceptions import ValidationError
+    from app.services import source_ingestion
+
+    data = _make_pdf([PAGE1, PAGE2])
+    upload = UploadFile(filename="Rossi_2021_AI.pdf", file=io.BytesIO(data))
+    with patch.object(source_ingestion, "UPLOAD_CHUNK_BYTES", 512):
+        read = AsyncMock(wraps=upload.read)
+        with patch.object(upload, "read", new=read):
+            staged = await source_ingestion.stage_upload(upload)
+    try:
+        assert staged.sha256 == uploaded_sources_module.sha256_hex(data)
+        assert staged.size == len(data)
+        with open(staged.path, "rb") as copy:
+            assert copy.read() == data
+        assert all(call.args == (512,) for call in read.await_args_list)
+        assert read.await_count > len(data) // 512
+    finally:
+        source_ingestion.discard_staged(staged.path)
+
+    # Bad magic bytes and oversized files stop at the chunk that shows it,
+    # and their partial copy is removed.
+    rejected = [
+        (b"MZ\x90\x00" + b"0" * 4096, ValidationError),
+        (data, ValueError),
+    ]
+    temp_paths: list[str] = []
+    make_temp = source_ingestion._temp_path
+
+    def tracked_temp_path():
+        temp_paths.append(make_temp())
+        return temp_paths[-1]
+
+    with (
+        patch.object(source_ingestion, "UPLOAD_CHUNK_BYTES", 512),
+        patch.object(uploaded_sources_module, "MAX_SOURCE_FILE_BYTES", 1024),
+        patch.object(source_ingestion, "_temp_path", new=tracked_temp_path),
+    ):
+        for content, error in rejected:
+            upload = UploadFile(filename="x.pdf", file=io.BytesIO(content))
+            with pytest.raises(error):
+                await source_ingestion.stage_upload(upload)
+            assert upload.file.tell() <= 1536
+            assert not os.path.exists(temp_paths[-1])
+
+    # Uploaded: the handler streams the staged path, ingestion removes it.
+    user, document = await _seed_document(db_session, "staged-upload@example.com")
+    stored: list[str] = []
+
+    async def upload_path(self, object_name, path, content_type):
+        with open(path, "rb") as copy:
+            assert copy.read() == data
+        stored.append(path)
+        return "s3://bucket/staged.pdf"
+
+    tasks = BackgroundTasks()
+    with patch.object(
+        documents_endpoint.StorageService, "upload_path", new=upload_path
+    ):
+        await _upload_handler()(
+            request=_http_request(),
+            document_id=int(document.id),
+            background_tasks=tasks,
+            file=UploadFile(filename="Rossi_2021_AI.pdf", file=io.BytesIO(data)),
+            current_user=user,
+            db=db_session,
+        )
+    assert os.path.exists(stored[0])
+    await tasks()
+    assert not os.path.exists(stored[0])
+
+    # A resumed ingestion (no staged copy) parses a downloaded temp file.
+    pending = DocumentSourceFile(
+        document_id=int(document.id),
+        filename="Bianchi_2020.pdf",
+        citation_key="pending-resumed",
+        storage_path="s3://bucket/resumed.pdf",
+        sha256="d" * 64,
+        status="pending",
+        metadata_incomplete=True,
+    )
+    db_session.add(pending)
+    await db_session.commit()
+    downloads: list[str] = []
+
+    async def download_to_path(self, file_path, path):
+        with open(path, "wb") as copy:
+            copy.write(data)
+        downloads.append(path)
+
+    with patch.object(
+        source_ingestion.StorageService, "download_to_path", new=download_to_path
+    ):
+        assert await source_ingestion.ingest_source_file(int(pending.id)) == "parsed"
+    assert not os.path.exists(downloads[0])
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_files_leased_by_a_live_process(db_session):
+    from datetime import UTC, datetime, timedelta
+
+    from app.services import source_ingestion
+
+    _, document = await _seed_document(db_session, "ingest-lease@example.com")
+    now = datetime.now(UTC)
+    rows = {
+        "pending": ("pending", None),
+        "live": ("processing", now + timedelta(minutes=10)),
+        "expired": ("processing", now - timedelta(minutes=1)),
+        "done": ("parsed", None),
+    }
+    ids = {}
+    for name, (status, expires_at) in rows.items():
+        row = DocumentSourceFile(
+            document_id=int(document.id),
+            filename=f"{name}.pdf",
+            citation_key=f"pending-{name}",
+            storage_path=f"s3://bucket/{name}.pdf",
+            sha256=name[0] * 64,
+            status=status,
+            ingestion_lease_token="other" if expires_at else None,
+            ingestion_lease_expires_at=expires_at,
+        )
+        db_session.add(row)
+        await db_session.flush()
+        ids[int(row.id)] = name
+    await db_session.commit()
+
+    started: list[str] = []
+
+    async def ingest(file_id, staged_path=None):
+        started.append(ids[file_id])
+
+    with patch.object(source_ingestion, "ingest_source_file", new=ingest):
+        assert await source_ingestion.resume_source_ingestion() == 2
+        await asyncio.gather(*source_ingestion._resumed_tasks)
+    assert sorted(started) == ["expired", "pending"]
+
+    # The claim itself is atomic: one winner, the live lease never moves.
+    by_name = {name: file_id for file_id, name in ids.items()}
+    claimed = await source_ingestion._claim(by_name["pending"])
+    assert claimed is not None and claimed[0]["status"] == "processing"
+    assert await source_ingestion._claim(by_name["pending"]) is None
+    assert await source_ingestion._claim(by_name["live"]) is None
+    # A reclaimed file's previous holder can no longer record its result.
+    assert await source_ingestion._claim(by_name["expired"]) is not None
+    outcome = {"status": "failed", "error": "late"}
+    assert await source_ingestion._record(by_name["expired"], "other", outcome) is None
+
+
+@pytest.mark.asyncio
+async def test_unreadable_pdf_is_marked_failed(db_session):
+    user, document = await _seed_document(db_session, "broken-upload@example.com")
+
+    broken = await _upload(
+        db_session,
+        user,
+        document,
+        "Bianchi_2020.pdf",
+        b"%PDF-1.4 truncated",
+        "s3://bucket/broken.pdf",
+    )
+
+    assert broken["status"] == "failed"
+    assert broken["ingestion_error"] and broken["warning"]
+    assert (await db_session.execute(select(SourceFilePage))).scalars().all() == []
+    from app.services.uploaded_sources import uploaded_sources_blockers
+
+    _, warnings = await uploaded_sources_blockers(db_session, int(document.id))
+    assert len(warnings) == 1 and "could not be read" in warnings[0]
+
+
 @pytest.mark.asyncio
 async def test_release_gate_contract_matches_uploaded_run(db_session):
     """GPT review 2026-07-11: the release gate recomputed the contract